@@ -1,3 +1,5 @@
+import hmac
+
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlalchemy.orm import Session
@@ -8,18 +10,14 @@ from ..core.config import settings
 from ..core.security import create_access_token, verify_token
 from ..db.session import get_db
 from ..schemas.user import UserLogin, Token, User
-from ..services.auth import authenticate_user, get_user_by_username
+from ..services.auth import authenticate_user_async, get_user_by_username, user_cache
 
 router = APIRouter()
 security = HTTPBearer()
 
 
-def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
-    """Get current authenticated user."""
-    token = credentials.credentials
+def user_from_token(db: Session, token: str) -> User:
+    """Resolve a bearer token to its user, raising 401 if it is not valid."""
     username = verify_token(token)
     if username is None:
         raise HTTPException(
@@ -27,20 +25,49 @@ def get_current_user(
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    user = get_user_by_username(db, username=username)
-    if user is None:
+    user = user_cache.get(username)
+    if user is not None:
+        return user
+    db_user = get_user_by_username(db, username=username)
+    if db_user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
             headers={"WWW-Authenticate": "Bearer"},
         )
+    user = User.model_validate(db_user)
+    user_cache.set(user)
     return user
 
 
+def get_current_user(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> User:
+    """Get current authenticated user."""
+    return user_from_token(db, credentials.credentials)
+
+
+def require_metrics_access(
+    credentials: HTTPAuthorizationCredentials = Depends(security),
+    db: Session = Depends(get_db)
+) -> None:
+    """Allow the METRICS_TOKEN bearer token or an admin user's token."""
+    if settings.METRICS_TOKEN and hmac.compare_digest(
+        credentials.credentials.encode(), settings.METRICS_TOKEN.encode()
+    ):
+        return
+    if user_from_token(db, credentials.credentials).role != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not enough permissions"
+        )
+
+
 @router.post("/login", response_model=Token)
-def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
+async def login(user_credentials: UserLogin, db: Session = Depends(get_db)):
     """Authenticate user and return access token."""
-    user = authenticate_user(db, user_credentials.username, user_credentials.password)
+    user = await authenticate_user_async(db, user_credentials.username, user_credentials.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
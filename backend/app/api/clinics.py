@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 
+from ..core.pagination import id_cursor, parse_id_cursor, next_page
 from ..db.session import get_db
 from ..schemas.clinic import Clinic, ClinicCreate, ClinicUpdate
 from ..schemas.user import User
@@ -13,14 +14,17 @@ router = APIRouter()
 
 @router.get("/", response_model=List[Clinic])
 def read_clinics(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get list of clinics."""
-    clinics = clinic_service.get_clinics(db, skip=skip, limit=limit)
-    return clinics
+    """Get list of clinics. Pass ``X-Next-Cursor`` back as ``cursor`` for the next page."""
+    after_id = parse_id_cursor(cursor) if cursor else None
+    clinics = clinic_service.get_clinics(db, skip=skip, limit=limit + 1, after_id=after_id)
+    return next_page(clinics, limit, response, id_cursor)
 
 
 @router.get("/{clinic_id}", response_model=Clinic)
@@ -1,24 +1,59 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from sqlalchemy import and_, func, or_, select, union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.sql import Select
+from typing import Any, List, Optional, Union
+from datetime import datetime, timedelta, timezone
 
-from ..db.session import get_db
-from ..schemas.patient import Patient, PatientCreate, PatientUpdate
+from ..core.conditional import make_etag, not_modified, set_validators
+from ..core.pagination import id_cursor, parse_id_cursor, next_page
+from ..core.serialization import parse_fields, projection, rows_response
+from ..db.session import get_db, get_read_db, rows_all, run_sync, scalars_all, scalar_one_or_none
+from ..db.versions import versions_query
+from ..schemas.patient import Patient, PatientCreate, PatientUpdate, PatientTrends, PatientOverview
+from ..schemas.transmission import Transmission
 from ..schemas.user import User
 from ..models.patient import Patient as PatientModel
+from ..models.transmission import Transmission as TransmissionModel
+from ..models.transmission import TransmissionArchive as TransmissionArchiveModel
+from ..services import stats as stats_service
+from ..services.patient_search import FTS5PatientSearch, patient_search
+from ..services.vitals_store import vitals_store
 from .auth import get_current_user
 
 router = APIRouter()
 
+# Overview transmissions leave out raw_data, which can be large
+OVERVIEW_TRANSMISSION_FIELDS = [name for name in Transmission.model_fields if name != "raw_data"]
+
 
 def get_patient(db: Session, patient_id: int) -> Optional[PatientModel]:
     """Get patient by ID."""
     return db.query(PatientModel).filter(PatientModel.id == patient_id).first()
 
 
-def get_patients(db: Session, skip: int = 0, limit: int = 100) -> List[PatientModel]:
+def patients_query(
+    skip: int = 0, limit: int = 100, after_id: Optional[int] = None, columns: Optional[List[Any]] = None
+) -> Select:
+    """Build the patient listing query, resuming after ``after_id`` when given.
+
+    ``columns`` selects plain rows of those columns instead of ORM objects.
+    """
+    query = select(*columns) if columns else select(PatientModel)
+    query = query.order_by(PatientModel.id)
+    if after_id is not None:
+        query = query.where(PatientModel.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit)
+
+
+def get_patients(
+    db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> List[PatientModel]:
     """Get list of patients."""
-    return db.query(PatientModel).offset(skip).limit(limit).all()
+    return db.scalars(patients_query(skip=skip, limit=limit, after_id=after_id)).all()
 
 
 def create_patient(db: Session, patient: PatientCreate) -> PatientModel:
@@ -27,9 +62,58 @@ def create_patient(db: Session, patient: PatientCreate) -> PatientModel:
     db.add(db_patient)
     db.commit()
     db.refresh(db_patient)
+    _index_names(db_patient)
     return db_patient
 
 
+def _index_names(patient: PatientModel) -> None:
+    """Let typo matching find new names before the search vocabulary reloads."""
+    if isinstance(patient_search, FTS5PatientSearch):
+        patient_search.vocabulary.add((patient.first_name, patient.last_name))
+
+
+def overview_transmissions_query(patient_id: int, limit: int) -> Select:
+    """The patient's ``limit`` newest transmissions plus the newest one per device.
+
+    Both sets come from one pass with window functions; rows are returned
+    newest first.
+    """
+    newest = (TransmissionModel.created_at.desc(), TransmissionModel.id.desc())
+    ranked = select(
+        *projection(TransmissionModel, OVERVIEW_TRANSMISSION_FIELDS),
+        func.row_number().over(order_by=newest).label("recent_rank"),
+        func.row_number().over(partition_by=TransmissionModel.device_serial, order_by=newest).label("device_rank"),
+    ).where(TransmissionModel.patient_id == patient_id).subquery()
+    return select(ranked).where(or_(
+        ranked.c.recent_rank <= limit,
+        and_(ranked.c.device_rank == 1, ranked.c.device_serial.is_not(None)),
+    )).order_by(ranked.c.recent_rank)
+
+
+def get_patient_overview(db: Session, patient_id: int, limit: int = 10) -> Optional[dict]:
+    """Patient, clinic, recent transmissions and latest vitals per device.
+
+    Runs two queries however many transmissions and devices the patient has:
+    the patient joined to its clinic, then overview_transmissions_query.
+    """
+    patient = db.scalars(
+        select(PatientModel).options(joinedload(PatientModel.clinic)).where(PatientModel.id == patient_id)
+    ).one_or_none()
+    if patient is None:
+        return None
+    rows = db.execute(overview_transmissions_query(patient_id, limit)).all()
+    devices = [
+        {**row._mapping, "last_transmission_at": row.created_at}
+        for row in rows if row.device_rank == 1 and row.device_serial is not None
+    ]
+    return {
+        "patient": patient,
+        "clinic": patient.clinic,
+        "recent_transmissions": [row._mapping for row in rows if row.recent_rank <= limit],
+        "devices": sorted(devices, key=lambda device: device["device_serial"]),
+    }
+
+
 def update_patient(db: Session, patient_id: int, patient_update: PatientUpdate) -> Optional[PatientModel]:
     """Update patient."""
     db_patient = get_patient(db, patient_id)
@@ -37,39 +121,144 @@ def update_patient(db: Session, patient_id: int, patient_update: PatientUpdate)
         return None
     
     update_data = patient_update.model_dump(exclude_unset=True)
+    if "clinic_id" in update_data and update_data["clinic_id"] != db_patient.clinic_id:
+        stats_service.move_patient(db, db_patient.id, db_patient.clinic_id, update_data["clinic_id"])
     for key, value in update_data.items():
         setattr(db_patient, key, value)
     
     db.commit()
     db.refresh(db_patient)
+    _index_names(db_patient)
     return db_patient
 
 
 @router.get("/", response_model=List[Patient])
-def read_patients(
+async def read_patients(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get list of patients."""
-    patients = get_patients(db, skip=skip, limit=limit)
-    return patients
+    """Get list of patients. Pass ``X-Next-Cursor`` back as ``cursor`` for the next page.
+
+    Answers ``If-None-Match`` with 304 while the patients table is unchanged.
+    ``fields`` limits the selected columns and returns partial objects
+    (``id`` is always included).
+    """
+    selected = parse_fields(fields, Patient, Patient.model_fields)
+    etag = make_etag("patients", request.url.query, await scalars_all(db, versions_query("patients")))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_validators(response, etag)
+    after_id = parse_id_cursor(cursor) if cursor else None
+    rows = await rows_all(db, patients_query(
+        skip=skip, limit=limit + 1, after_id=after_id,
+        columns=projection(PatientModel, selected, required=("id",))
+    ))
+    return rows_response(next_page(rows, limit, response, id_cursor), response, selected)
+
+
+@router.get("/search", response_model=List[Patient])
+async def search_patients(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=100),
+    clinic_id: Optional[int] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Search active patients by MRN, name, phone or email.
+
+    Terms match as prefixes, and longer name terms also match with a typo or
+    two; results are ranked best first and optionally limited to a clinic.
+    """
+    selected = parse_fields(fields, Patient, Patient.model_fields)
+    ids = await run_sync(db, lambda session: patient_search.search(session, q, clinic_id, limit))
+    if not ids:
+        return rows_response([], response, selected)
+    rows = await rows_all(db, select(*projection(PatientModel, selected)).where(PatientModel.id.in_(ids)))
+    rank = {id_: position for position, id_ in enumerate(ids)}
+    return rows_response(sorted(rows, key=lambda row: rank[row.id]), response, selected)
 
 
 @router.get("/{patient_id}", response_model=Patient)
-def read_patient(
+async def read_patient(
     patient_id: int,
-    db: Session = Depends(get_db),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Get patient by ID."""
-    patient = get_patient(db, patient_id=patient_id)
+    patient = await scalar_one_or_none(db, select(PatientModel).where(PatientModel.id == patient_id))
     if patient is None:
         raise HTTPException(status_code=404, detail="Patient not found")
     return patient
 
 
+@router.get(
+    "/{patient_id}/overview",
+    response_model=PatientOverview,
+    response_model_exclude={"recent_transmissions": {"__all__": {"raw_data"}}},
+)
+async def read_patient_overview(
+    patient_id: int,
+    limit: int = Query(10, ge=1, le=100, description="Number of recent transmissions"),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a patient with their clinic, recent transmissions and latest vitals per device.
+
+    Everything the patient detail screen needs in one request and a fixed
+    number of queries. Recent transmissions omit ``raw_data``.
+    """
+    overview = await run_sync(db, lambda session: get_patient_overview(session, patient_id, limit))
+    if overview is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+    return overview
+
+
+@router.get("/{patient_id}/trends", response_model=PatientTrends)
+async def read_patient_trends(
+    patient_id: int,
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
+    points: int = Query(200, ge=1, le=5000),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get downsampled vitals trends per device (default: the last 365 days)."""
+    if vitals_store is None:
+        raise HTTPException(status_code=404, detail="Vitals store is disabled")
+    patient = await scalar_one_or_none(db, select(PatientModel.id).where(PatientModel.id == patient_id))
+    if patient is None:
+        raise HTTPException(status_code=404, detail="Patient not found")
+
+    # Naive bounds are taken to be UTC, as in the vitals store
+    end = end.replace(tzinfo=end.tzinfo or timezone.utc) if end else datetime.now(timezone.utc)
+    start = start.replace(tzinfo=start.tzinfo or timezone.utc) if start else end - timedelta(days=365)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    # Devices whose transmissions are all archived still have vitals history
+    device_serials = await scalars_all(db, union(*(
+        select(model.device_serial).where(
+            model.patient_id == patient_id,
+            model.device_serial.is_not(None)
+        )
+        for model in (TransmissionModel, TransmissionArchiveModel)
+    )))
+    devices = [
+        {"device_serial": serial, **vitals_store.downsample(serial, start, end, points)}
+        for serial in sorted(device_serials)
+    ]
+    return {"patient_id": patient_id, "start": start, "end": end, "devices": devices}
+
+
 @router.post("/", response_model=Patient)
 def create_patient_endpoint(
     patient: PatientCreate,
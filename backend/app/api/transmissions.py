@@ -1,91 +1,621 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
+from starlette.concurrency import run_in_threadpool
+from pydantic import ValidationError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from typing import List, Optional
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import func, literal, select, insert, or_, and_, type_coerce, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import Select
+from typing import AsyncIterator, List, Optional, Any, Tuple, Union
 from datetime import datetime
+import json
+import time
 
-from ..db.session import get_db
-from ..schemas.transmission import Transmission, TransmissionCreate, TransmissionUpdate
+from ..core.broadcast import Subscription
+from ..core.conditional import make_etag, not_modified, set_validators
+from ..core.config import settings
+from ..core.pagination import encode_cursor, decode_cursor, next_page
+from ..core.security import token_expires_at
+from ..core.serialization import parse_fields, projection, rows_response, schema_columns
+from ..db.session import SessionLocal, get_db, get_read_db, rows_all, run_sync, scalars_all, scalar_one_or_none
+from ..db.types import StoredDateTime
+from ..db.versions import versions_query
+from ..schemas.transmission import (
+    Transmission, TransmissionCreate, TransmissionUpdate, TransmissionBulkResult
+)
 from ..schemas.user import User
 from ..models.transmission import Transmission as TransmissionModel
-from .auth import get_current_user
+from ..models.transmission import TransmissionArchive as TransmissionArchiveModel
+from ..models.patient import Patient as PatientModel
+from ..services import device_trends
+from ..services import stats as stats_service
+from ..services import export as export_service
+from ..services.archive import merge_newest
+from ..services.idempotency import ingest_dedup
+from ..services.vitals_store import vitals_store, VITALS_COLUMNS
+from ..services.alert_rules import alert_engine, SEVERITY
+from ..services.arrhythmia import arrhythmia_detector
+from ..services.alert_stream import alert_hub, publish_transmissions
+from .auth import get_current_user, user_from_token
 
 router = APIRouter()
 
+# List views leave out raw_data, the largest column, unless asked for via fields=
+LIST_DEFAULT_FIELDS = [name for name in Transmission.model_fields if name != "raw_data"]
+
+# Marks an NDJSON line that could not be parsed, so it is rejected on its own
+_INVALID_JSON = object()
+
+# Columns returned by bulk inserts for the rollups, device trends, the vitals store and
+# the alert stream
+_INGEST_RETURNING = tuple({
+    column.key: column for column in (
+        TransmissionModel.id, TransmissionModel.transmission_id,
+        *stats_service.STATS_COLUMNS, *VITALS_COLUMNS, TransmissionModel.alert_rule
+    )
+}.values())
+
 
 def get_transmission(db: Session, transmission_id: int) -> Optional[TransmissionModel]:
     """Get transmission by ID."""
     return db.query(TransmissionModel).filter(TransmissionModel.id == transmission_id).first()
 
 
-def get_transmissions(
-    db: Session, 
+def transmission_cursor(transmission: TransmissionModel) -> str:
+    """Build the keyset cursor that resumes listing after a transmission."""
+    return encode_cursor({"c": transmission.created_at.isoformat(), "i": transmission.id})
+
+
+def parse_transmission_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a transmission cursor into its (created_at, id) key."""
+    values = decode_cursor(cursor)
+    try:
+        return datetime.fromisoformat(values["c"]), int(values["i"])
+    except (TypeError, KeyError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def resolve_cursor_anchor(
+    db: Union[Session, AsyncSession], after: Tuple[datetime, int], models: Tuple[Any, ...]
+) -> Tuple[Any, int]:
+    """Swap a cursor's created_at for its anchor row's stored value, looked up once in all tiers.
+
+    The cursor's datetime is re-encoded on the way back and need not match
+    the stored text (see StoredDateTime); it is only bound, as a datetime,
+    when the anchor row is gone.
+    """
+    after_created_at, after_id = after
+    stored = await rows_all(db, union_all(*(
+        select(type_coerce(model.created_at, StoredDateTime)).where(model.id == after_id) for model in models
+    )))
+    if not stored:
+        return after
+    return literal(stored[0][0], StoredDateTime), after_id
+
+
+def transmissions_query(
     skip: int = 0, 
     limit: int = 100,
     patient_id: Optional[int] = None,
-    alert_level: Optional[str] = None
-) -> List[TransmissionModel]:
-    """Get list of transmissions with filters."""
-    query = db.query(TransmissionModel)
+    alert_level: Optional[str] = None,
+    after: Optional[Tuple[Any, int]] = None,
+    columns: Optional[List[Any]] = None,
+    model: Any = TransmissionModel
+) -> Select:
+    """Build the transmission listing query with filters.
+
+    When ``after`` is given, listing resumes after that (created_at, id) key
+    instead of skipping rows, so deep pages cost the same as the first one;
+    pass it through resolve_cursor_anchor first.
+    ``columns`` selects plain rows of those columns instead of ORM objects.
+    ``model`` may be TransmissionArchive to list the archive tier.
+    """
+    query = select(*columns) if columns else select(model)
     
     if patient_id:
-        query = query.filter(TransmissionModel.patient_id == patient_id)
+        query = query.where(model.patient_id == patient_id)
     
     if alert_level:
-        query = query.filter(TransmissionModel.alert_level == alert_level)
+        query = query.where(model.alert_level == alert_level)
+    
+    query = query.order_by(model.created_at.desc(), model.id.desc())
     
-    return query.order_by(TransmissionModel.created_at.desc()).offset(skip).limit(limit).all()
+    if after:
+        anchor, after_id = after
+        query = query.where(or_(
+            model.created_at < anchor,
+            and_(model.created_at == anchor, model.id < after_id)
+        ))
+    else:
+        query = query.offset(skip)
+    
+    return query.limit(limit)
+
+
+def get_transmissions(
+    db: Session, 
+    skip: int = 0, 
+    limit: int = 100,
+    patient_id: Optional[int] = None,
+    alert_level: Optional[str] = None,
+    after: Optional[Tuple[datetime, int]] = None
+) -> List[TransmissionModel]:
+    """Get list of transmissions with filters."""
+    return db.scalars(transmissions_query(
+        skip=skip, limit=limit, patient_id=patient_id, alert_level=alert_level, after=after
+    )).all()
+
+
+def classify_transmissions(
+    transmissions: List[TransmissionCreate], clinic_ids: List[Optional[int]]
+) -> List[dict]:
+    """Dump transmissions to insert rows with arrhythmia detection and the server-side alert level applied."""
+    rows = [
+        {**transmission.model_dump(), "alert_rule": None, "arrhythmia_episodes": None}
+        for transmission in transmissions
+    ]
+    if arrhythmia_detector is not None:
+        arrhythmia_detector.apply(rows)
+    if alert_engine is not None:
+        alert_engine.apply(rows, clinic_ids)
+    return rows
+
+
+def _check_replay(original: Transmission, transmission: TransmissionCreate) -> Transmission:
+    if original.transmission_id != transmission.transmission_id:
+        ingest_dedup.count("conflicts")
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Idempotency-Key was already used for a different transmission_id"
+        )
+    return original
+
+
+def recall_original_transmission(
+    transmission: TransmissionCreate, idempotency_key: Optional[str] = None
+) -> Optional[Transmission]:
+    """The cached record of a recent create this one retries, without touching the database.
+
+    Raises 409 when the idempotency key was used for another transmission.
+    """
+    lookups = [("transmission_id", transmission.transmission_id)]
+    if idempotency_key is not None:
+        lookups.insert(0, ("key", idempotency_key))
+    for kind, value in lookups:
+        original = ingest_dedup.recall(kind, value)
+        if original is not None:
+            ingest_dedup.count("cache_replays")
+            return _check_replay(original, transmission)
+    return None
+
+
+def find_original_transmission(
+    db: Session, transmission: TransmissionCreate, idempotency_key: Optional[str] = None
+) -> Optional[Transmission]:
+    """The stored record a create retries, live or archived, or None.
+
+    One UNION ALL query over both tiers by transmission_id or idempotency
+    key; a key match wins. Only run once an insert was refused, so new
+    transmissions never pay for it. Raises 409 when the idempotency key was
+    used for another transmission.
+    """
+    matches = []
+    for model in (TransmissionModel, TransmissionArchiveModel):
+        condition = model.transmission_id == transmission.transmission_id
+        if idempotency_key is not None:
+            condition = or_(condition, model.idempotency_key == idempotency_key)
+        matches.append(
+            select(model.idempotency_key.label("stored_key"), *schema_columns(model, Transmission)).where(condition)
+        )
+    rows = db.execute(union_all(*matches)).all()
+    if not rows:
+        return None
+    row = next((row for row in rows if idempotency_key is not None and row.stored_key == idempotency_key), rows[0])
+    original = Transmission.model_validate(row._mapping)
+    ingest_dedup.count("database_replays")
+    ingest_dedup.remember(original, idempotency_key if row.stored_key == idempotency_key else None)
+    return _check_replay(original, transmission)
+
 
+def create_transmission(
+    db: Session, transmission: TransmissionCreate, idempotency_key: Optional[str] = None
+) -> Optional[TransmissionModel]:
+    """Create new transmission.
 
-def create_transmission(db: Session, transmission: TransmissionCreate) -> TransmissionModel:
-    """Create new transmission."""
-    db_transmission = TransmissionModel(**transmission.model_dump())
-    db.add(db_transmission)
+    A retry of a live transmission fails on the table's unique indexes with
+    IntegrityError. The INSERT itself skips transmission ids and keys found
+    in the archive, returning None, so a new transmission costs no lookup
+    before it is stored.
+    """
+    clinic_id = db.scalar(
+        select(PatientModel.clinic_id).where(PatientModel.id == transmission.patient_id)
+    )
+    [data] = classify_transmissions([transmission], [clinic_id])
+    data["idempotency_key"] = idempotency_key
+    archived = TransmissionArchiveModel.transmission_id == transmission.transmission_id
+    if idempotency_key is not None:
+        archived = or_(archived, TransmissionArchiveModel.idempotency_key == idempotency_key)
+    values = select(*(
+        literal(value, getattr(TransmissionModel, key).type) for key, value in data.items()
+    )).where(~select(TransmissionArchiveModel.id).where(archived).exists())
+    row = db.execute(
+        insert(TransmissionModel).from_select(list(data), values).returning(*_INGEST_RETURNING)
+    ).one_or_none()
+    if row is None:
+        db.rollback()
+        return None
+    stats_service.record_transmissions(db, [row])
+    device_trends.record_transmissions(db, [row])
     db.commit()
-    db.refresh(db_transmission)
+    db_transmission = db.get(TransmissionModel, row.id)
+    ingest_dedup.remember(Transmission.model_validate(db_transmission), idempotency_key)
+    if vitals_store is not None:
+        vitals_store.append_safely([row])
+    publish_transmissions([row], {row.patient_id: clinic_id})
     return db_transmission
 
 
+def _format_validation_error(error: ValidationError) -> str:
+    """Flatten a pydantic validation error into a single message."""
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
+
+
+def _insert_transmission_chunk(db: Session, chunk: List[tuple], results: List[dict]) -> None:
+    """Insert one chunk of validated transmissions in a single transaction."""
+    transmission_ids = [transmission.transmission_id for _, transmission in chunk]
+    # Archived transmissions count too: their ids must not be ingested again
+    existing = dict(db.execute(union_all(*(
+        select(model.transmission_id, model.id).where(model.transmission_id.in_(transmission_ids))
+        for model in (TransmissionModel, TransmissionArchiveModel)
+    ))).all())
+    patient_ids = {transmission.patient_id for _, transmission in chunk}
+    patient_clinics = dict(db.execute(
+        select(PatientModel.id, PatientModel.clinic_id).where(PatientModel.id.in_(patient_ids))
+    ).all())
+
+    rows = []
+    for index, transmission in chunk:
+        if transmission.transmission_id in existing:
+            results[index].update(status="duplicate", id=existing[transmission.transmission_id])
+        elif transmission.patient_id not in patient_clinics:
+            results[index].update(status="rejected", error="Patient not found")
+        else:
+            rows.append((index, transmission))
+    if not rows:
+        return
+
+    values = classify_transmissions(
+        [transmission for _, transmission in rows],
+        [patient_clinics[transmission.patient_id] for _, transmission in rows],
+    )
+    statement = insert(TransmissionModel).returning(*_INGEST_RETURNING)
+    try:
+        inserted = db.execute(statement, values).all()
+        stats_service.record_transmissions(db, inserted)
+        device_trends.record_transmissions(db, inserted)
+        db.commit()
+        ids = {row.transmission_id: row.id for row in inserted}
+        new_ids = {index: ids[transmission.transmission_id] for index, transmission in rows}
+    except IntegrityError:
+        # Another writer got in between the duplicate check and the insert, or
+        # a row breaks another constraint; retry row by row so only the failing
+        # items are held back.
+        db.rollback()
+        inserted = []
+        new_ids = {}
+        for (index, transmission), data in zip(rows, values):
+            try:
+                with db.begin_nested():
+                    row = db.execute(statement, data).one()
+                    stats_service.record_transmissions(db, [row])
+                    device_trends.record_transmissions(db, [row])
+            except IntegrityError as e:
+                original_id = db.scalar(union_all(*(
+                    select(model.id).where(model.transmission_id == transmission.transmission_id)
+                    for model in (TransmissionModel, TransmissionArchiveModel)
+                )))
+                if original_id is not None:
+                    results[index].update(status="duplicate", id=original_id)
+                else:
+                    results[index].update(status="error", error=str(e.orig))
+                continue
+            inserted.append(row)
+            new_ids[index] = row.id
+        db.commit()
+
+    if vitals_store is not None:
+        vitals_store.append_safely(inserted)
+    publish_transmissions(inserted, patient_clinics)
+    for index, new_id in new_ids.items():
+        results[index].update(status="accepted", id=new_id)
+
+
+def create_transmissions_bulk(db: Session, items: List[Any]) -> dict:
+    """Validate and insert a batch of transmissions using chunked multi-row inserts."""
+    results = []
+    valid = []
+    seen = set()
+    for index, item in enumerate(items):
+        result = {"index": index, "status": "rejected"}
+        if isinstance(item, dict) and isinstance(item.get("transmission_id"), str):
+            result["transmission_id"] = item["transmission_id"]
+        results.append(result)
+
+        if item is _INVALID_JSON:
+            result["error"] = "Invalid JSON"
+            continue
+        try:
+            transmission = TransmissionCreate.model_validate(item)
+        except ValidationError as e:
+            result["error"] = _format_validation_error(e)
+            continue
+        if transmission.transmission_id in seen:
+            result["error"] = "Duplicate transmission_id in batch"
+            continue
+        seen.add(transmission.transmission_id)
+        valid.append((index, transmission))
+
+    chunk_size = settings.TRANSMISSION_BULK_CHUNK_SIZE
+    for start in range(0, len(valid), chunk_size):
+        _insert_transmission_chunk(db, valid[start:start + chunk_size], results)
+
+    accepted = sum(1 for result in results if result["status"] == "accepted")
+    duplicates = sum(1 for result in results if result["status"] == "duplicate")
+    return {
+        "accepted": accepted,
+        "duplicates": duplicates,
+        "rejected": len(results) - accepted - duplicates,
+        "results": results,
+    }
+
+
+async def read_bulk_payload(request: Request) -> List[Any]:
+    """Parse a bulk ingest body sent as a JSON array or as NDJSON."""
+    body = await request.body()
+    content_type = request.headers.get("content-type", "")
+    if "ndjson" in content_type or "jsonlines" in content_type:
+        items = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(json.loads(line))
+            except ValueError:
+                items.append(_INVALID_JSON)
+    else:
+        try:
+            items = json.loads(body)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid JSON body")
+        if not isinstance(items, list):
+            raise HTTPException(status_code=400, detail="Expected a JSON array of transmissions")
+
+    if len(items) > settings.TRANSMISSION_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Batch exceeds {settings.TRANSMISSION_BULK_MAX_ITEMS} transmissions"
+        )
+    return items
+
+
 def update_transmission(db: Session, transmission_id: int, transmission_update: TransmissionUpdate) -> Optional[TransmissionModel]:
     """Update transmission."""
     db_transmission = get_transmission(db, transmission_id)
     if not db_transmission:
         return None
     
+    before = stats_service.snapshot(db_transmission)
+    vitals_before = vitals_store.record(db_transmission) if vitals_store is not None else None
     update_data = transmission_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_transmission, key, value)
+    if "alert_level" in update_data:
+        # Staff's call from now on: processing will not re-raise it
+        db_transmission.alert_level_manual = True
+        db_transmission.alert_rule = None
+    if "raw_data" in update_data and arrhythmia_detector is not None:
+        episodes = arrhythmia_detector.analyze(db_transmission.raw_data)
+        db_transmission.arrhythmia_episodes = episodes
+        if episodes is not None:
+            db_transmission.arrhythmia_detected = bool(episodes)
     
+    if stats_service.snapshot(db_transmission) != before:
+        stats_service.record_transmissions(db, [before], delta=-1)
+        stats_service.record_transmissions(db, [db_transmission])
     db.commit()
     db.refresh(db_transmission)
+    if vitals_store is not None:
+        vitals_store.replace_safely(vitals_before, db_transmission)
+    if SEVERITY.get(db_transmission.alert_level, 0) > SEVERITY.get(before.alert_level, 0):
+        clinic_id = db.scalar(
+            select(PatientModel.clinic_id).where(PatientModel.id == db_transmission.patient_id)
+        )
+        publish_transmissions([db_transmission], {db_transmission.patient_id: clinic_id}, "escalated")
     return db_transmission
 
 
 @router.get("/", response_model=List[Transmission])
-def read_transmissions(
+async def read_transmissions(
+    request: Request,
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = Query(None),
     patient_id: Optional[int] = Query(None),
     alert_level: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return; raw_data is omitted by default"),
+    include_archived: bool = Query(False, description="Also list transmissions moved to the archive"),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get list of transmissions with optional filters.
+
+    Pass the ``X-Next-Cursor`` response header back as ``cursor`` to fetch
+    the next page; ``skip`` is ignored when a cursor is given. Answers
+    ``If-None-Match`` with 304 while the transmissions table is unchanged.
+    ``fields`` limits the selected columns and returns partial objects
+    (``id`` is always included). Archived transmissions are only listed
+    with ``include_archived``.
+    """
+    selected = parse_fields(fields, Transmission, LIST_DEFAULT_FIELDS)
+    tables = ("transmissions", "transmissions_archive") if include_archived else ("transmissions",)
+    etag = make_etag("transmissions", request.url.query, await scalars_all(db, versions_query(*tables)))
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_validators(response, etag)
+    models = (TransmissionModel, TransmissionArchiveModel) if include_archived else (TransmissionModel,)
+    after = await resolve_cursor_anchor(db, parse_transmission_cursor(cursor), models) if cursor else None
+    if not include_archived:
+        rows = await rows_all(db, transmissions_query(
+            skip=skip, limit=limit + 1,
+            patient_id=patient_id, alert_level=alert_level, after=after,
+            columns=projection(TransmissionModel, selected, required=("created_at", "id"))
+        ))
+    else:
+        # Take the first skip + limit + 1 rows of each tier and merge them
+        skip = 0 if after else skip
+        tiers = [
+            await rows_all(db, transmissions_query(
+                limit=skip + limit + 1,
+                patient_id=patient_id, alert_level=alert_level, after=after,
+                columns=projection(model, selected, required=("created_at", "id")), model=model
+            ))
+            for model in models
+        ]
+        rows = merge_newest(tiers, skip + limit + 1)[skip:]
+    return rows_response(next_page(rows, limit, response, transmission_cursor), response, selected)
+
+
+@router.get("/export")
+def export_transmissions(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    patient_id: Optional[int] = Query(None),
+    clinic_id: Optional[int] = Query(None),
+    alert_level: Optional[str] = Query(None),
+    start: Optional[datetime] = Query(None),
+    end: Optional[datetime] = Query(None),
     current_user: User = Depends(get_current_user)
 ):
-    """Get list of transmissions with optional filters."""
-    transmissions = get_transmissions(
-        db, skip=skip, limit=limit, 
-        patient_id=patient_id, alert_level=alert_level
+    """Stream transmissions as CSV or NDJSON, filtered by patient, clinic, alert level and date range."""
+    statements = export_service.export_queries(
+        patient_id=patient_id, clinic_id=clinic_id, alert_level=alert_level, start=start, end=end
+    )
+    return StreamingResponse(
+        export_service.stream_export(statements, format),
+        media_type=export_service.MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="transmissions.{format}"'}
+    )
+
+
+def _authenticate_stream(token: str) -> Optional[float]:
+    """Resolve the stream's token with a short-lived session; return when it expires.
+
+    Stream connections stay open indefinitely, so they must not hold a
+    pooled connection the way the ``get_db`` dependency would.
+    """
+    db = SessionLocal()
+    try:
+        user_from_token(db, token)
+    finally:
+        db.close()
+    return token_expires_at(token)
+
+
+async def _stream_events(subscription: Subscription, expires_at: Optional[float] = None) -> AsyncIterator[str]:
+    """Format hub events as server-sent events, with keepalive comments while idle.
+
+    The SSE ``id`` is the hub sequence number, which EventSource sends back
+    as Last-Event-ID when it reconnects. The stream ends with an ``expired``
+    event once the token it was opened with expires.
+    """
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            timeout = settings.ALERT_STREAM_KEEPALIVE_SECONDS
+            if expires_at is not None:
+                remaining = expires_at - time.time()
+                if remaining <= 0:
+                    yield "event: expired\ndata: {}\n\n"
+                    return
+                timeout = min(timeout, remaining)
+            event = await subscription.get(timeout)
+            if event is None:
+                yield ": keepalive\n\n"
+                continue
+            yield f"id: {event['seq']}\nevent: {event['event']}\ndata: {json.dumps(event)}\n\n"
+    finally:
+        subscription.close()
+
+
+@router.get("/stream")
+async def stream_transmissions(
+    clinic_id: Optional[int] = Query(None),
+    alert_level: Optional[List[str]] = Query(None),
+    access_token: Optional[str] = Query(None),
+    last_event_id: Optional[str] = Header(None),
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False)),
+):
+    """Push newly created and escalated transmissions as server-sent events.
+
+    Filter with ``clinic_id`` and one or more ``alert_level`` values. Browsers'
+    EventSource cannot send headers, so the token may be passed as ``access_token``
+    (masked in the access log). A reconnect with ``Last-Event-ID`` first replays
+    the recent events it missed. The stream closes when the token expires.
+    """
+    token = credentials.credentials if credentials else access_token
+    if not token:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    expires_at = await run_in_threadpool(_authenticate_stream, token)
+    after_seq = int(last_event_id) if last_event_id and last_event_id.isdigit() else None
+    subscription = alert_hub.subscribe(clinic_id=clinic_id, alert_levels=alert_level, after_seq=after_seq)
+    if subscription is None:
+        raise HTTPException(status_code=503, detail="Too many stream subscribers")
+    return StreamingResponse(
+        _stream_events(subscription, expires_at),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
-    return transmissions
 
 
 @router.get("/{transmission_id}", response_model=Transmission)
-def read_transmission(
+async def read_transmission(
     transmission_id: int,
-    db: Session = Depends(get_db),
+    request: Request,
+    response: Response,
+    include_archived: bool = Query(False, description="Also look in the archive"),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get transmission by ID."""
-    transmission = get_transmission(db, transmission_id=transmission_id)
+    """Get transmission by ID.
+
+    Validated by ``updated_at``: a matching ``If-None-Match`` or
+    ``If-Modified-Since`` gets a 304 without loading the row. Archived
+    transmissions are only found with ``include_archived``.
+    """
+    models = (TransmissionModel, TransmissionArchiveModel) if include_archived else (TransmissionModel,)
+    for model in models:
+        modified = await scalar_one_or_none(db, select(
+            func.coalesce(model.updated_at, model.created_at)
+        ).where(model.id == transmission_id))
+        if modified is not None:
+            break
+    else:
+        raise HTTPException(status_code=404, detail="Transmission not found")
+    etag = make_etag("transmission", transmission_id, modified.isoformat())
+    cached = not_modified(request, etag, modified)
+    if cached is not None:
+        return cached
+    set_validators(response, etag, modified)
+    transmission = await scalar_one_or_none(db, select(model).where(model.id == transmission_id))
     if transmission is None:
         raise HTTPException(status_code=404, detail="Transmission not found")
     return transmission
@@ -94,11 +624,65 @@ def read_transmission(
 @router.post("/", response_model=Transmission)
 def create_transmission_endpoint(
     transmission: TransmissionCreate,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Create new transmission.
+
+    Safe to retry: resending a stored ``transmission_id``, or repeating an
+    ``Idempotency-Key``, returns the original record with an
+    ``Idempotent-Replayed: true`` header instead of inserting again. Reusing
+    a key for a different ``transmission_id`` is a 409.
+
+    Recent creates are answered from this worker's cache. Otherwise the
+    insert goes ahead, and the original is looked up only if the insert was
+    refused as a duplicate.
+    """
+    original = recall_original_transmission(transmission, idempotency_key)
+    if original is None:
+        try:
+            created = create_transmission(db=db, transmission=transmission, idempotency_key=idempotency_key)
+        except IntegrityError:
+            # A live transmission already holds the transmission_id or key
+            db.rollback()
+            original = find_original_transmission(db, transmission, idempotency_key)
+            if original is None:
+                raise
+        else:
+            if created is not None:
+                return created
+            # Nothing inserted: the transmission_id or key belongs to an archived transmission
+            original = find_original_transmission(db, transmission, idempotency_key)
+            if original is None:
+                raise HTTPException(
+                    status_code=status.HTTP_409_CONFLICT,
+                    detail="Transmission conflicts with an archived transmission"
+                )
+    response.headers["Idempotent-Replayed"] = "true"
+    return original
+
+
+@router.post("/bulk", response_model=TransmissionBulkResult)
+def create_transmissions_bulk_endpoint(
+    items: List[Any] = Depends(read_bulk_payload),
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Create new transmission."""
-    return create_transmission(db=db, transmission=transmission)
+    """Ingest a batch of transmissions sent as a JSON array or NDJSON stream.
+
+    Retrying a batch is already safe: stored transmission ids come back as
+    ``duplicate``. An ``Idempotency-Key`` would name the whole batch, which
+    is not recorded, so the header is rejected with 400 rather than ignored.
+    """
+    if idempotency_key is not None:
+        raise HTTPException(
+            status_code=400,
+            detail="Idempotency-Key is not supported for bulk ingest; transmission_id makes each item idempotent"
+        )
+    return create_transmissions_bulk(db, items)
 
 
 @router.put("/{transmission_id}", response_model=Transmission)
@@ -116,55 +700,21 @@ def update_transmission_endpoint(
 
 
 @router.get("/stats/dashboard")
-def get_dashboard_stats(
-    db: Session = Depends(get_db),
+async def get_dashboard_stats(
+    request: Request,
+    response: Response,
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
     current_user: User = Depends(get_current_user)
 ):
-    """Get dashboard statistics for frontend."""
-    # Get transmission counts by alert level
-    critical_alerts = db.query(TransmissionModel).filter(
-        TransmissionModel.alert_level == "critical"
-    ).count()
-    
-    # Get today's transmissions
-    today = datetime.now().date()
-    transmissions_today = db.query(TransmissionModel).filter(
-        TransmissionModel.created_at >= today
-    ).count()
-    
-    # Get alerts today (warning + critical)
-    alerts_today = db.query(TransmissionModel).filter(
-        TransmissionModel.created_at >= today,
-        TransmissionModel.alert_level.in_(["warning", "critical"])
-    ).count()
-    
-    # Get device type distribution
-    device_stats = db.query(
-        TransmissionModel.device_type,
-        func.count(TransmissionModel.id)
-    ).group_by(TransmissionModel.device_type).all()
-    
-    device_types = {
-        "pacemaker": 0,
-        "icd": 0,
-        "crt": 0,
-        "loop": 0
-    }
-    
-    for device_type, count in device_stats:
-        if device_type in device_types:
-            device_types[device_type] = count
-    
-    # Get total patients and active devices from database
-    from ..models.patient import Patient
-    total_patients = db.query(Patient).filter(Patient.is_active == True).count()
-    active_devices = db.query(TransmissionModel).distinct(TransmissionModel.device_serial).count()
-    
-    return {
-        "totalPatients": total_patients,
-        "activeDevices": active_devices,
-        "alertsToday": alerts_today,
-        "transmissionsToday": transmissions_today,
-        "criticalAlerts": critical_alerts,
-        "deviceTypes": device_types
-    }
\ No newline at end of file
+    """Get dashboard statistics for frontend.
+
+    Answers ``If-None-Match`` with 304 until a transmission, patient or rollup
+    changes, or the day rolls over.
+    """
+    versions = await scalars_all(db, versions_query(*stats_service.STATS_TABLES))
+    etag = make_etag("dashboard", datetime.now().date(), versions)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_validators(response, etag)
+    return await run_sync(db, stats_service.get_dashboard_stats)
@@ -0,0 +1,179 @@
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, Response
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from typing import List, Optional, Tuple, Union
+import orjson
+
+from ..core.conditional import make_etag, not_modified, set_validators
+from ..core.serialization import ORJSON_OPTIONS
+from ..db.session import SessionLocal, get_read_db, scalar_one_or_none, scalars_all
+from ..schemas.user import User
+from ..schemas.waveform import Waveform, WaveformView
+from ..models.transmission import Transmission as TransmissionModel, TransmissionArchive as TransmissionArchiveModel
+from ..models.waveform import Waveform as WaveformModel
+from ..services.waveform_store import INPUT_DTYPES, WaveformTooLarge, waveform_store
+from .auth import get_current_user
+
+router = APIRouter()
+
+CHANNEL_PATTERN = "^[A-Za-z0-9_-]{1,32}$"
+
+
+def transmission_exists(transmission_id: int) -> bool:
+    db = SessionLocal()
+    try:
+        return any(
+            db.scalar(select(model.id).where(model.id == transmission_id)) is not None
+            for model in (TransmissionModel, TransmissionArchiveModel)
+        )
+    finally:
+        db.close()
+
+
+def save_waveform(
+    transmission_id: int, channel: str, storage_key: str,
+    sample_rate: float, sample_count: int, units: Optional[str]
+) -> Tuple[WaveformModel, Optional[str]]:
+    """Point a channel at a newly written store version.
+
+    Returns the channel and the version it pointed to before, which only
+    this upload replaced and so may delete.
+    """
+    db = SessionLocal()
+    try:
+        waveform = db.scalars(select(WaveformModel).where(
+            WaveformModel.transmission_id == transmission_id, WaveformModel.channel == channel
+        ).with_for_update()).one_or_none()
+        previous_key = None
+        if waveform is None:
+            waveform = WaveformModel(transmission_id=transmission_id, channel=channel)
+            db.add(waveform)
+        else:
+            previous_key = waveform.storage_key
+        waveform.storage_key = storage_key
+        waveform.sample_rate = sample_rate
+        waveform.sample_count = sample_count
+        waveform.units = units
+        db.commit()
+        db.refresh(waveform)
+        return waveform, previous_key
+    finally:
+        db.close()
+
+
+@router.put("/{transmission_id}/waveforms/{channel}", response_model=Waveform)
+async def upload_waveform(
+    transmission_id: int,
+    request: Request,
+    channel: str = Path(..., pattern=CHANNEL_PATTERN),
+    sample_rate: float = Query(..., gt=0, description="Samples per second"),
+    dtype: str = Query("int16", pattern=f"^({'|'.join(INPUT_DTYPES)})$", description="Little-endian sample type"),
+    gain: float = Query(1.0, description="Factor converting raw samples to units"),
+    units: Optional[str] = Query("mV"),
+    current_user: User = Depends(get_current_user)
+):
+    """Upload one channel of a transmission's electrogram as raw binary samples.
+
+    The request body is the bare little-endian sample array
+    (``application/octet-stream``); it is streamed to disk, never held in
+    memory whole. Uploading a channel again replaces it.
+    """
+    if not await run_in_threadpool(transmission_exists, transmission_id):
+        raise HTTPException(status_code=404, detail="Transmission not found")
+
+    writer = await run_in_threadpool(
+        waveform_store.writer, transmission_id, channel, INPUT_DTYPES[dtype], gain
+    )
+    try:
+        async for data in request.stream():
+            await run_in_threadpool(writer.feed, data)
+        sample_count = await run_in_threadpool(writer.finish)
+        waveform, previous_key = await run_in_threadpool(
+            save_waveform, transmission_id, channel, writer.storage_key, sample_rate, sample_count, units
+        )
+    except WaveformTooLarge as e:
+        await run_in_threadpool(writer.abort)
+        raise HTTPException(status_code=413, detail=str(e))
+    except ValueError as e:
+        await run_in_threadpool(writer.abort)
+        raise HTTPException(status_code=400, detail=str(e))
+    except IntegrityError:
+        # A concurrent upload created the channel first; its version stands
+        await run_in_threadpool(writer.abort)
+        raise HTTPException(status_code=409, detail="Channel is being uploaded concurrently")
+    except BaseException:
+        await run_in_threadpool(writer.abort)
+        raise
+    if previous_key is not None and previous_key != writer.storage_key:
+        await run_in_threadpool(waveform_store.remove_version, transmission_id, channel, previous_key)
+    return waveform
+
+
+@router.get("/{transmission_id}/waveforms", response_model=List[Waveform])
+async def read_waveforms(
+    transmission_id: int,
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """List the electrogram channels recorded with a transmission."""
+    return await scalars_all(db, select(WaveformModel).where(
+        WaveformModel.transmission_id == transmission_id
+    ).order_by(WaveformModel.channel))
+
+
+@router.get("/{transmission_id}/waveforms/{channel}", response_model=WaveformView)
+async def read_waveform_view(
+    transmission_id: int,
+    request: Request,
+    response: Response,
+    channel: str = Path(..., pattern=CHANNEL_PATTERN),
+    start: float = Query(0.0, ge=0, description="Window start, seconds into the recording"),
+    end: Optional[float] = Query(None, gt=0, description="Window end in seconds (default: the end)"),
+    width: int = Query(1000, ge=1, le=10000, description="Points to return, e.g. the plot width in pixels"),
+    db: Union[Session, AsyncSession] = Depends(get_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get a window of a channel reduced to at most ``width`` min/max points.
+
+    Each point is the envelope of the samples falling into it, so spikes stay
+    visible at any zoom while the response size depends only on ``width``.
+    """
+    waveform = await scalar_one_or_none(db, select(WaveformModel).where(
+        WaveformModel.transmission_id == transmission_id, WaveformModel.channel == channel
+    ))
+    if waveform is None:
+        raise HTTPException(status_code=404, detail="Waveform not found")
+    duration = waveform.sample_count / waveform.sample_rate
+    end = duration if end is None else min(end, duration)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    etag = make_etag("waveform", waveform.id, waveform.storage_key, request.url.query)
+    cached = not_modified(request, etag)
+    if cached is not None:
+        return cached
+    set_validators(response, etag)
+
+    first = min(int(start * waveform.sample_rate), waveform.sample_count)
+    last = min(int(round(end * waveform.sample_rate)), waveform.sample_count)
+    path = waveform_store.version_path(transmission_id, channel, waveform.storage_key)
+    try:
+        minimum, maximum = await run_in_threadpool(waveform_store.view, path, first, last, width)
+    except FileNotFoundError:
+        # A new upload replaced this version after the row was read
+        raise HTTPException(status_code=404, detail="Waveform was replaced, retry the request")
+    content = orjson.dumps({
+        "transmission_id": transmission_id,
+        "channel": channel,
+        "sample_rate": waveform.sample_rate,
+        "units": waveform.units,
+        "start": first / waveform.sample_rate,
+        "end": last / waveform.sample_rate,
+        "samples_per_point": (last - first) / len(minimum) if len(minimum) else 0.0,
+        "min": minimum,
+        "max": maximum,
+    }, option=ORJSON_OPTIONS | orjson.OPT_SERIALIZE_NUMPY)
+    return Response(content=content, media_type="application/json", headers=dict(response.headers))
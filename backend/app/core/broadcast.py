@@ -0,0 +1,213 @@
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class Subscription:
+    """One listener's bounded event queue, bound to the event loop it was created on.
+
+    When a slow client lets the queue fill, the oldest events are dropped
+    rather than letting memory grow without bound.
+    """
+
+    def __init__(
+        self,
+        hub: "BroadcastHub",
+        clinic_id: Optional[int] = None,
+        alert_levels: Optional[Iterable[str]] = None,
+        max_queue: int = 100,
+    ):
+        self.hub = hub
+        self.clinic_id = clinic_id
+        self.alert_levels = frozenset(alert_levels) if alert_levels else None
+        self.loop = asyncio.get_running_loop()
+        self.queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue(maxsize=max_queue)
+        self.dropped = 0
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        if self.clinic_id is not None and event.get("clinic_id") != self.clinic_id:
+            return False
+        return self.alert_levels is None or event.get("alert_level") in self.alert_levels
+
+    def _deliver(self, events: List[Dict[str, Any]]) -> None:
+        # Runs on the subscriber's event loop
+        for event in events:
+            if self.queue.full():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.queue.put_nowait(event)
+
+    async def get(self, timeout: float) -> Optional[Dict[str, Any]]:
+        """Next event, or None if nothing arrives within timeout seconds."""
+        try:
+            return await asyncio.wait_for(self.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def close(self) -> None:
+        self.hub.unsubscribe(self)
+
+
+class BroadcastHub:
+    """In-process fan-out of events to subscribers on this worker.
+
+    ``publish`` is thread-safe and may be called from request threads or
+    background workers; delivery is handed to each subscriber's event loop.
+    Every event gets a ``seq`` that increases across the hub, and the last
+    ``replay_size`` events are kept so a reconnecting subscriber can pick up
+    after the last one it saw.
+    """
+
+    def __init__(self, max_subscribers: int = 10000, max_queue: int = 100, replay_size: int = 1000):
+        self.max_subscribers = max_subscribers
+        self.max_queue = max_queue
+        self._subscribers: Set[Subscription] = set()
+        self._lock = threading.Lock()
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=replay_size)
+        self._sequence = 0
+        self.published = 0
+
+    def subscribe(
+        self,
+        clinic_id: Optional[int] = None,
+        alert_levels: Optional[Iterable[str]] = None,
+        after_seq: Optional[int] = None,
+    ) -> Optional[Subscription]:
+        """Register a listener; returns None when the worker is at capacity.
+
+        With ``after_seq``, recent events past that sequence number are
+        queued first. Call from the subscriber's event loop.
+        """
+        subscription = Subscription(self, clinic_id, alert_levels, self.max_queue)
+        with self._lock:
+            if len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(subscription)
+            if after_seq is not None:
+                # Under the lock, so nothing published meanwhile is missed or repeated
+                subscription._deliver([
+                    event for event in self._recent
+                    if event["seq"] > after_seq and subscription.matches(event)
+                ])
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        with self._lock:
+            first = self._sequence + 1
+            self._sequence += len(events)
+        self._fan_out([{**event, "seq": seq} for seq, event in enumerate(events, first)])
+
+    def _fan_out(self, events: List[Dict[str, Any]]) -> None:
+        if not events:
+            return
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self._recent.extend(events)
+            self.published += len(events)
+        for subscription in subscribers:
+            matched = [event for event in events if subscription.matches(event)]
+            if not matched:
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, matched)
+            except RuntimeError:
+                # The subscriber's loop has shut down
+                self.unsubscribe(subscription)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        return {
+            "subscribers": len(subscribers),
+            "published": self.published,
+            "dropped": sum(subscription.dropped for subscription in subscribers),
+        }
+
+
+# Numbers a batch of events from a shared counter and publishes it in one
+# step, so sequence order is delivery order whichever process publishes
+_PUBLISH_SCRIPT = """
+local last = redis.call('INCRBY', KEYS[1], ARGV[1])
+redis.call('PUBLISH', KEYS[2], last .. ' ' .. ARGV[2])
+return last
+"""
+
+
+class RedisBroadcastHub(BroadcastHub):
+    """Fan-out across workers through Redis pub/sub. Requires the ``redis`` package.
+
+    Events published by any process (API workers or run_worker.py) reach
+    the subscribers of every API worker. Sequence numbers come from a Redis
+    counter, so they are shared by all workers.
+    """
+
+    def __init__(self, url: str, channel: str = "cardiavue:transmissions", **kwargs):
+        import redis
+
+        super().__init__(**kwargs)
+        self.channel = channel
+        self._client = redis.Redis.from_url(url, decode_responses=True)
+        self._publish_script = self._client.register_script(_PUBLISH_SCRIPT)
+        self._listener: Optional[threading.Thread] = None
+
+    def subscribe(self, *args, **kwargs) -> Optional[Subscription]:
+        self._start_listener()
+        return super().subscribe(*args, **kwargs)
+
+    def publish(self, events: List[Dict[str, Any]]) -> None:
+        if events:
+            self._publish_script(keys=[f"{self.channel}:seq", self.channel], args=[len(events), json.dumps(events)])
+
+    def _start_listener(self) -> None:
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="broadcast-listener", daemon=True
+            )
+        self._listener.start()
+
+    def _listen(self) -> None:
+        import redis
+
+        while True:
+            try:
+                pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self.channel)
+                for message in pubsub.listen():
+                    try:
+                        last, _, data = message["data"].partition(" ")
+                        events = json.loads(data)
+                        first = int(last) - len(events) + 1
+                        self._fan_out([{**event, "seq": seq} for seq, event in enumerate(events, first)])
+                    except (TypeError, ValueError):
+                        logger.warning("Ignoring malformed broadcast message")
+            except redis.ConnectionError:
+                logger.warning("Lost broadcast connection to Redis; reconnecting")
+                time.sleep(1)
+
+
+def create_broadcast_hub(
+    backend: str, max_subscribers: int, max_queue: int, redis_url: Optional[str] = None, replay_size: int = 1000
+) -> BroadcastHub:
+    """Build the broadcast hub named in settings."""
+    options = {"max_subscribers": max_subscribers, "max_queue": max_queue, "replay_size": replay_size}
+    if backend == "memory":
+        return BroadcastHub(**options)
+    if backend == "redis":
+        if not redis_url:
+            raise ValueError("A Redis URL is required for the redis broadcast backend")
+        return RedisBroadcastHub(redis_url, **options)
+    raise ValueError(f"Unknown broadcast backend: {backend}")
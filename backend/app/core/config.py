@@ -12,8 +12,125 @@ class Settings(BaseSettings):
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
     ALGORITHM: str = "HS256"
     
+    # Password hashing. Hashes with a different cost are rehashed on login.
+    BCRYPT_ROUNDS: int = 12
+    # Processes used for bcrypt during login; 0 hashes in the request thread
+    PASSWORD_HASH_WORKERS: int = 2
+    
     # Database
     DATABASE_URL: str = "sqlite:///./cardiavue.db"
+    # Serve read-heavy endpoints through an AsyncEngine (needs aiosqlite/asyncpg).
+    # ASYNC_DATABASE_URL defaults to DATABASE_URL with the matching async driver.
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    # Read replicas for read-only endpoints, as a JSON list of URLs. Replicas
+    # failing health checks or lagging more than the limit are skipped, and a
+    # client reads from the primary for a while after each of its writes.
+    DATABASE_REPLICA_URLS: list = []
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_CHECK_INTERVAL: float = 5.0
+    DATABASE_READ_AFTER_WRITE_SECONDS: float = 10.0
+    
+    # Connection pool (ignored for in-memory SQLite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True
+    
+    # Authenticated user cache: "memory" (per worker), "redis" (shared) or "none"
+    USER_CACHE_BACKEND: str = "memory"
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_SIZE: int = 10000
+    USER_CACHE_REDIS_URL: Optional[str] = None
+    
+    # Transmission ingest
+    TRANSMISSION_BULK_MAX_ITEMS: int = 10000
+    TRANSMISSION_BULK_CHUNK_SIZE: int = 500
+    
+    # Ingest deduplication: retried creates return the original record. Each
+    # worker keeps an LRU of recent records, so most retries never reach the
+    # database; the rest are caught by the insert
+    INGEST_DEDUP_CACHE_SIZE: int = 10000
+    INGEST_DEDUP_CACHE_TTL_SECONDS: int = 3600
+    
+    # Server-side alert classification; ALERT_RULES_PATH is an optional JSON
+    # file with custom rules and per-clinic threshold overrides
+    ALERT_RULES_ENABLED: bool = True
+    ALERT_RULES_PATH: Optional[str] = None
+    
+    # Server-side arrhythmia detection over the R-R intervals, electrogram or
+    # heart-rate series in raw_data; runs at ingest, detect_arrhythmias.py
+    # reprocesses a backlog
+    ARRHYTHMIA_DETECTION_ENABLED: bool = True
+    ARRHYTHMIA_TACHYCARDIA_BPM: float = 150.0
+    ARRHYTHMIA_BRADYCARDIA_BPM: float = 40.0
+    ARRHYTHMIA_PAUSE_MS: float = 3000.0
+    
+    # Background processing of unprocessed transmissions; the local worker
+    # runs inside the API process, run_worker.py runs dedicated processes
+    PROCESSING_LOCAL_WORKER: bool = False
+    PROCESSING_BATCH_SIZE: int = 200
+    PROCESSING_LEASE_SECONDS: int = 300
+    PROCESSING_POLL_INTERVAL: float = 2.0
+    
+    # /metrics is for admins, or scrapers sending METRICS_TOKEN as a bearer
+    # token; the backlog figures it reports are cached between queries
+    METRICS_TOKEN: Optional[str] = None
+    METRICS_BACKLOG_CACHE_SECONDS: float = 15.0
+    
+    # Push channel for new and escalated transmissions (/api/transmissions/stream);
+    # the redis backend fans out across workers and run_worker.py processes
+    ALERT_STREAM_BACKEND: str = "memory"
+    ALERT_STREAM_REDIS_URL: Optional[str] = None
+    ALERT_STREAM_MAX_SUBSCRIBERS: int = 10000
+    ALERT_STREAM_QUEUE_SIZE: int = 100
+    ALERT_STREAM_KEEPALIVE_SECONDS: float = 15.0
+    # Recent events kept per worker for clients resuming with Last-Event-ID
+    ALERT_STREAM_REPLAY_SIZE: int = 1000
+    
+    # Patient search: "auto" uses pg_trgm on PostgreSQL and FTS5 on SQLite,
+    # falling back to an in-memory trie ("trigram", "fts5" or "memory")
+    PATIENT_SEARCH_BACKEND: str = "auto"
+    PATIENT_SEARCH_MIN_SIMILARITY: float = 0.4
+    PATIENT_SEARCH_VOCAB_TTL_SECONDS: int = 300
+    
+    # Per-device trends: exponentially weighted statistics of battery level and
+    # lead impedance, updated on ingest. Readings more than the z threshold from
+    # the device's history, or a battery falling faster than the slope limit
+    # (level per day), are flagged in the transmission's trend_anomalies
+    DEVICE_TREND_ALPHA: float = 0.1
+    DEVICE_TREND_MIN_SAMPLES: int = 5
+    DEVICE_TREND_Z_THRESHOLD: float = 4.0
+    DEVICE_TREND_MIN_RELATIVE_STD: float = 0.02
+    DEVICE_TREND_BATTERY_SLOPE_PER_DAY: float = -0.1
+    
+    # Storage of transmission raw_data: "packed" (msgpack with packed numeric
+    # arrays, zstd-compressed) or "json" text; either format is readable
+    RAW_DATA_FORMAT: str = "packed"
+    RAW_DATA_COMPRESSION_LEVEL: int = 3
+    
+    # Retention: archive_transmissions.py moves processed transmissions older
+    # than this out of the hot table (reachable with include_archived=true).
+    # Unprocessed rows stay until a processing worker has handled them, so
+    # archiving needs PROCESSING_LOCAL_WORKER or run_worker.py running
+    TRANSMISSION_RETENTION_DAYS: int = 365
+    TRANSMISSION_ARCHIVE_BATCH_SIZE: int = 1000
+    
+    # Columnar per-device vitals store used for trend charts
+    VITALS_STORE_ENABLED: bool = True
+    VITALS_STORE_PATH: str = "./data/vitals"
+    
+    # Electrogram waveforms: float32 chunk files of WAVEFORM_CHUNK_SAMPLES samples,
+    # with a min/max summary per WAVEFORM_SUMMARY_BLOCK samples for wide views
+    WAVEFORM_STORE_PATH: str = "./data/waveforms"
+    WAVEFORM_CHUNK_SAMPLES: int = 1048576
+    WAVEFORM_SUMMARY_BLOCK: int = 256
+    WAVEFORM_MAX_SAMPLES: int = 50000000
+    
+    # Rows fetched per server-side cursor batch when streaming exports
+    EXPORT_BATCH_SIZE: int = 2000
     
     # CORS
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://localhost:8080"]
@@ -0,0 +1,46 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Dict, List, Optional
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """Encode keyset values into an opaque, URL-safe cursor."""
+    payload = json.dumps(values, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Dict[str, Any]]:
+    """Decode a cursor produced by encode_cursor, or None if it is malformed."""
+    try:
+        payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(payload)
+    except (binascii.Error, ValueError):
+        return None
+    return values if isinstance(values, dict) else None
+
+
+def id_cursor(item: Any) -> str:
+    """Build the cursor that resumes an id-ordered listing after ``item``."""
+    return encode_cursor({"i": item.id})
+
+
+def parse_id_cursor(cursor: str) -> int:
+    """Decode a cursor built by id_cursor."""
+    values = decode_cursor(cursor)
+    try:
+        return int(values["i"])
+    except (TypeError, KeyError, ValueError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def next_page(items: List[Any], limit: int, response: Response, cursor_for: Callable[[Any], str]) -> List[Any]:
+    """Trim a limit + 1 fetch to one page and advertise the next cursor, if any."""
+    if len(items) > limit:
+        items = items[:limit]
+        response.headers[NEXT_CURSOR_HEADER] = cursor_for(items[-1])
+    return items
@@ -1,10 +1,25 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional, Union, Any
+from typing import Optional, Union, Any, Tuple
+from starlette.concurrency import run_in_threadpool
+import asyncio
+import logging
+import multiprocessing
+import re
 from .config import settings
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__rounds=settings.BCRYPT_ROUNDS,
+    # Flag hashes made with any other cost so they are upgraded on login
+    bcrypt__min_desired_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_desired_rounds=settings.BCRYPT_ROUNDS,
+)
+
+_hash_pool: Optional[ProcessPoolExecutor] = None
 
 
 def create_access_token(subject: Union[str, Any], expires_delta: Optional[timedelta] = None) -> str:
@@ -29,6 +44,46 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """Verify a password and return a replacement hash if the stored one is outdated."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_hash_pool() -> ProcessPoolExecutor:
+    """Process pool for bcrypt work, created on first use in each worker."""
+    global _hash_pool
+    if _hash_pool is None:
+        # Spawn rather than fork: forking a running server copies its threads' locks
+        _hash_pool = ProcessPoolExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _hash_pool
+
+
+def shutdown_hash_pool() -> None:
+    """Stop the bcrypt process pool, if it was started."""
+    global _hash_pool
+    if _hash_pool is not None:
+        _hash_pool.shutdown(wait=False, cancel_futures=True)
+        _hash_pool = None
+
+
+async def verify_and_update_password_async(plain_password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """verify_and_update_password off the event loop.
+
+    Runs in the bcrypt process pool so concurrent logins use all cores
+    instead of holding request threads, or in the threadpool when
+    PASSWORD_HASH_WORKERS is 0.
+    """
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return await run_in_threadpool(verify_and_update_password, plain_password, hashed_password)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        get_hash_pool(), verify_and_update_password, plain_password, hashed_password
+    )
+
+
 def verify_token(token: str) -> Optional[str]:
     """Verify JWT token and return subject."""
     try:
@@ -36,4 +91,29 @@ def verify_token(token: str) -> Optional[str]:
         token_data = payload.get("sub")
         return token_data
     except JWTError:
-        return None
\ No newline at end of file
+        return None
+
+def token_expires_at(token: str) -> Optional[float]:
+    """Epoch seconds at which a valid JWT token expires, or None if it is not valid."""
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    except JWTError:
+        return None
+    expires_at = payload.get("exp")
+    return float(expires_at) if expires_at is not None else None
+
+
+_TOKEN_PARAMETER = re.compile(r"(access_token=)[^&\s]+")
+
+
+class RedactTokenFilter(logging.Filter):
+    """Mask ``access_token`` query parameters in log records, e.g. uvicorn's access log."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if isinstance(record.args, tuple):
+            record.args = tuple(
+                _TOKEN_PARAMETER.sub(r"\1***", arg) if isinstance(arg, str) else arg for arg in record.args
+            )
+        if isinstance(record.msg, str):
+            record.msg = _TOKEN_PARAMETER.sub(r"\1***", record.msg)
+        return True
@@ -0,0 +1,54 @@
+from typing import Any, Iterable, List, Optional, Sequence, Type
+
+import orjson
+from fastapi import HTTPException, Response
+from pydantic import BaseModel
+from sqlalchemy.engine import Row
+
+# Matches Pydantic's JSON output: aware UTC datetimes end in "Z", naive
+# datetimes carry no offset, NaN/inf become null.
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+
+
+def schema_columns(model: Any, schema: Type[BaseModel]) -> List[Any]:
+    """The model columns backing a response schema, in schema field order."""
+    return [getattr(model, name) for name in schema.model_fields]
+
+
+def parse_fields(fields: Optional[str], schema: Type[BaseModel], default: Iterable[str]) -> List[str]:
+    """Resolve a comma-separated ``fields`` parameter to schema field names.
+
+    ``id`` is always included so partial objects stay identifiable; fields
+    come back in schema order. Unknown names are a 400.
+    """
+    if not fields:
+        requested = set(default)
+    else:
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - schema.model_fields.keys())
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)}")
+    return [name for name in schema.model_fields if name in requested or name == "id"]
+
+
+def projection(model: Any, fields: Sequence[str], required: Sequence[str] = ()) -> List[Any]:
+    """Columns to select for ``fields``, followed by any ``required`` ones missing from it.
+
+    Required columns (e.g. cursor keys) come last so rows_response can drop
+    them by passing ``fields`` as the output keys.
+    """
+    names = list(fields) + [name for name in required if name not in fields]
+    return [getattr(model, name) for name in names]
+
+
+def rows_response(rows: Sequence[Row], response: Response, fields: Optional[Sequence[str]] = None) -> Response:
+    """Serialize column-projected rows straight to a JSON array.
+
+    Skips per-row Pydantic validation (and its copies of JSON columns); the
+    rows must already have the schema's fields, as from schema_columns or
+    projection. Only ``fields`` are output when given. Headers already set
+    on ``response`` (cursor, ETag) are carried over.
+    """
+    keys = fields if fields is not None else (rows[0]._fields if rows else ())
+    content = orjson.dumps([dict(zip(keys, row)) for row in rows], option=ORJSON_OPTIONS)
+    return Response(content=content, media_type="application/json", headers=dict(response.headers))
@@ -0,0 +1,90 @@
+import bisect
+import threading
+import time
+from typing import Any, Dict, List
+
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Upper bounds, in milliseconds, of the latency histogram buckets
+LATENCY_BUCKETS_MS = [1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+
+
+class Histogram:
+    """Cumulative latency histogram in the Prometheus style."""
+
+    def __init__(self, buckets: List[float] = LATENCY_BUCKETS_MS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        ms = seconds * 1000
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, ms)] += 1
+            self.total_ms += ms
+
+    def as_dict(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + ["+Inf"], self.counts):
+            cumulative += count
+            buckets[f"le_{bound}"] = cumulative
+        return {"count": cumulative, "sum_ms": round(self.total_ms, 3), "buckets": buckets}
+
+
+class PoolMetrics:
+    """Checkout timings for an instrumented connection pool."""
+
+    def __init__(self):
+        self.wait = Histogram()
+        self.checkout = Histogram()
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records time spent waiting for and checking out connections.
+
+    ``wait`` covers getting a connection out of the pool (blocking for a
+    free slot or opening a new one); ``checkout`` is the full connect()
+    call including pre-ping and checkout events.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            self.metrics.wait.observe(time.perf_counter() - start)
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            return super().connect()
+        finally:
+            self.metrics.checkout.observe(time.perf_counter() - start)
+
+    def recreate(self):
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def pool_stats(pool: Pool) -> Dict[str, Any]:
+    """Report saturation and timing figures for a pool."""
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, (QueuePool, AsyncAdaptedQueuePool)):
+        stats.update(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats["wait_ms"] = metrics.wait.as_dict()
+        stats["checkout_ms"] = metrics.checkout.as_dict()
+    return stats
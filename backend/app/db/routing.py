@@ -0,0 +1,201 @@
+import hashlib
+import itertools
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+# Seconds a replica is behind its primary, per dialect. A replica that has
+# replayed everything it received reports 0 even when no writes arrive.
+LAG_QUERIES = {
+    "postgresql": (
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    ),
+}
+
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+
+def measure_lag(connection: Connection) -> float:
+    """Replication lag in seconds; 0 for databases without a lag query."""
+    query = LAG_QUERIES.get(connection.dialect.name)
+    if query is None:
+        connection.execute(text("SELECT 1"))
+        return 0.0
+    return float(connection.execute(text(query)).scalar() or 0.0)
+
+
+class Replica:
+    """A read replica's engines, session factories and last health check."""
+
+    def __init__(self, engine: Engine, async_engine: Optional[AsyncEngine] = None):
+        self.engine = engine
+        self.async_engine = async_engine
+        self.SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+        self.AsyncSessionLocal = (
+            async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+            if async_engine is not None else None
+        )
+        self.healthy = False
+        self.lag_seconds: Optional[float] = None
+        self.error: Optional[str] = None
+        self.checked_at: Optional[float] = None
+
+    @property
+    def name(self) -> str:
+        return self.engine.url.render_as_string(hide_password=True)
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "url": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag_seconds,
+            "error": self.error,
+        }
+
+
+class ReplicaRouter:
+    """Picks a healthy, sufficiently fresh replica for read-only sessions.
+
+    Replicas are checked on a background thread every ``check_interval``
+    seconds; one that fails, or lags more than ``max_lag`` seconds, is
+    skipped until a later check passes. Until the first check, and whenever
+    no replica qualifies, ``choose`` returns None and reads use the primary.
+    """
+
+    def __init__(
+        self,
+        replicas: List[Replica],
+        max_lag: float = 5.0,
+        check_interval: float = 5.0,
+        lag_probe: Callable[[Connection], float] = measure_lag,
+    ):
+        self.replicas = replicas
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag_probe = lag_probe
+        self._next = itertools.count()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.primary_fallbacks = 0
+
+    def check(self) -> None:
+        """Probe every replica once and record its health and lag."""
+        for replica in self.replicas:
+            try:
+                with replica.engine.connect() as connection:
+                    lag = self.lag_probe(connection)
+            except Exception as e:
+                if replica.healthy:
+                    logger.warning("Read replica %s failed its health check: %s", replica.name, e)
+                replica.healthy, replica.lag_seconds, replica.error = False, None, str(e)
+            else:
+                replica.healthy = lag <= self.max_lag
+                replica.lag_seconds = lag
+                replica.error = None if replica.healthy else f"lagging {lag:.1f}s"
+            replica.checked_at = time.time()
+
+    def choose(self) -> Optional[Replica]:
+        """The next healthy replica in round-robin order, or None for the primary."""
+        healthy = [replica for replica in self.replicas if replica.healthy]
+        if not healthy:
+            self.primary_fallbacks += 1
+            return None
+        return healthy[next(self._next) % len(healthy)]
+
+    def mark_down(self, replica: Replica, error: Exception) -> None:
+        """Stop routing to a replica that failed mid-request, until it passes a check."""
+        replica.healthy = False
+        replica.error = str(error)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.check_interval):
+            self.check()
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self.check()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-health", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replicas": [replica.as_dict() for replica in self.replicas],
+            "primary_fallbacks": self.primary_fallbacks,
+        }
+
+
+def client_key(authorization: Optional[str]) -> Optional[str]:
+    """Identify a client by a digest of its credentials."""
+    if not authorization:
+        return None
+    return hashlib.sha256(authorization.encode()).hexdigest()[:32]
+
+
+class RecentWriters:
+    """Clients that wrote recently and must read their writes from the primary.
+
+    Tracked per worker process, which covers clients whose requests reach the
+    same worker; pin longer than the worst replica lag allowed.
+    """
+
+    def __init__(self, ttl: float = 10.0, max_size: int = 100000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._until: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def mark(self, key: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if len(self._until) >= self.max_size:
+                self._until = {k: until for k, until in self._until.items() if until > now}
+            self._until[key] = now + self.ttl
+
+    def is_pinned(self, key: Optional[str]) -> bool:
+        if key is None:
+            return False
+        until = self._until.get(key)
+        return until is not None and until > time.monotonic()
+
+
+class ReadAfterWriteMiddleware:
+    """Pin clients to the primary after a successful write request.
+
+    Plain ASGI middleware, so streaming responses pass through untouched.
+    """
+
+    def __init__(self, app, writers: RecentWriters):
+        self.app = app
+        self.writers = writers
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope["headers"])
+        key = client_key(headers.get(b"authorization", b"").decode("latin-1"))
+
+        async def send_marking_writes(message):
+            if message["type"] == "http.response.start" and key and message["status"] < 400:
+                self.writers.mark(key)
+            await send(message)
+
+        await self.app(scope, receive, send_marking_writes)
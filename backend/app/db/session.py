@@ -1,18 +1,189 @@
-from sqlalchemy import create_engine
+from typing import Any, Callable, List, Optional, Union
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, Row
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.sql import Select
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from ..core.config import settings
+from .metrics import InstrumentedQueuePool
+from .routing import RecentWriters, Replica, ReplicaRouter, client_key
+
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Applied to every new SQLite connection: WAL lets readers proceed during
+# writes, and NORMAL sync is durable under WAL at a fraction of the fsyncs.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-64000",
+)
+
+
+def is_sqlite_memory(url: str) -> bool:
+    """Whether a URL points at an in-memory SQLite database."""
+    return url.startswith("sqlite") and (url.endswith(":memory:") or url.rstrip("/").endswith("sqlite:"))
+
+
+def pool_options(url: str) -> dict:
+    """Connection pool arguments from settings for the given URL."""
+    if is_sqlite_memory(url):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+def configure_sqlite(engine: Engine) -> None:
+    """Apply SQLITE_PRAGMAS to each connection of a file-backed SQLite engine."""
+    if engine.dialect.name != "sqlite" or is_sqlite_memory(str(engine.url)):
+        return
 
-engine = create_engine(settings.DATABASE_URL)
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for pragma in SQLITE_PRAGMAS:
+            cursor.execute(pragma)
+        cursor.close()
+
+
+def create_sync_engine(url: str) -> Engine:
+    """Engine with the pool and SQLite settings used for every database."""
+    sync_engine = create_engine(
+        url,
+        **pool_options(url),
+        **({} if is_sqlite_memory(url) else {"poolclass": InstrumentedQueuePool})
+    )
+    configure_sqlite(sync_engine)
+    return sync_engine
+
+
+engine = create_sync_engine(settings.DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 Base = declarative_base()
 
 
+def async_database_url(url: str) -> str:
+    """Swap a sync database URL's driver for its async counterpart."""
+    scheme, _, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {dialect} databases")
+    return f"{ASYNC_DRIVERS[dialect]}://{rest}"
+
+
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    _async_url = settings.ASYNC_DATABASE_URL or async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **pool_options(_async_url))
+    configure_sqlite(async_engine.sync_engine)
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
+def create_replica(url: str) -> Replica:
+    """Engines for a read replica, async too when DATABASE_ASYNC is enabled."""
+    replica_async_engine = None
+    if settings.DATABASE_ASYNC:
+        async_url = async_database_url(url)
+        replica_async_engine = create_async_engine(async_url, **pool_options(async_url))
+        configure_sqlite(replica_async_engine.sync_engine)
+    return Replica(create_sync_engine(url), replica_async_engine)
+
+
+replica_router = None
+if settings.DATABASE_REPLICA_URLS:
+    replica_router = ReplicaRouter(
+        [create_replica(url) for url in settings.DATABASE_REPLICA_URLS],
+        max_lag=settings.DATABASE_REPLICA_MAX_LAG_SECONDS,
+        check_interval=settings.DATABASE_REPLICA_CHECK_INTERVAL,
+    )
+recent_writers = RecentWriters(ttl=settings.DATABASE_READ_AFTER_WRITE_SECONDS)
+
+
 def get_db():
     """Database dependency for FastAPI."""
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+
+async def get_read_db(request: Request):
+    """Database dependency for read-only endpoints.
+
+    Yields an AsyncSession when DATABASE_ASYNC is enabled, otherwise a
+    regular Session; query it through scalars_all / scalar_one_or_none.
+    Reads go to a healthy read replica when replicas are configured, except
+    for clients that wrote recently, who read from the primary.
+    """
+    replica = None
+    if replica_router is not None and not recent_writers.is_pinned(
+        client_key(request.headers.get("authorization"))
+    ):
+        replica = replica_router.choose()
+    session_factory, async_session_factory = (
+        (replica.SessionLocal, replica.AsyncSessionLocal) if replica is not None
+        else (SessionLocal, AsyncSessionLocal)
+    )
+    try:
+        if async_session_factory is not None:
+            async with async_session_factory() as db:
+                yield db
+        else:
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+    except OperationalError as e:
+        if replica is not None:
+            replica_router.mark_down(replica, e)
+        raise
+
+
+async def scalars_all(db: Union[Session, AsyncSession], statement: Select) -> List[Any]:
+    """Run a select on either session type and return all scalar rows."""
+    if isinstance(db, AsyncSession):
+        return (await db.scalars(statement)).all()
+    return await run_in_threadpool(lambda: db.scalars(statement).all())
+
+
+async def run_sync(db: Union[Session, AsyncSession], fn: Callable[[Session], Any]) -> Any:
+    """Call fn with a sync Session on either session type, off the event loop."""
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn)
+    return await run_in_threadpool(fn, db)
+
+
+async def rows_all(db: Union[Session, AsyncSession], statement: Select) -> List[Row]:
+    """Run a select on either session type and return all rows."""
+    if isinstance(db, AsyncSession):
+        return (await db.execute(statement)).all()
+    return await run_in_threadpool(lambda: db.execute(statement).all())
+
+
+async def scalar_one_or_none(db: Union[Session, AsyncSession], statement: Select) -> Optional[Any]:
+    """Run a select on either session type and return at most one scalar."""
+    if isinstance(db, AsyncSession):
+        return (await db.scalars(statement)).one_or_none()
+    return await run_in_threadpool(lambda: db.scalars(statement).one_or_none())
+
+
+# Registers the table change counters and their session events
+from . import versions  # noqa: E402,F401
@@ -0,0 +1,152 @@
+import threading
+from typing import Any, Optional
+
+import msgpack
+import numpy as np
+import orjson
+import zstandard
+from sqlalchemy.types import DateTime, LargeBinary, TypeDecorator
+
+from ..core.config import settings
+
+# Packed values start with a byte that never begins JSON text (nor is used
+# by msgpack), followed by the format version of the rest of the value.
+PACKED_MARKER = b"\xc1"
+PACKED_VERSION = 1
+
+# msgpack extension holding a homogeneous numeric list as a little-endian
+# buffer: one dtype byte, then the items
+NUMERIC_ARRAY_EXT = 1
+ARRAY_DTYPES = {b"f": np.dtype("<f8"), b"i": np.dtype("<i8")}
+# Shorter lists are cheaper to store as plain msgpack numbers
+MIN_ARRAY_LENGTH = 8
+
+_zstd = threading.local()
+
+
+def _pack_arrays(value: Any) -> Any:
+    """Replace homogeneous int or float lists with packed-buffer extensions."""
+    if isinstance(value, dict):
+        return {key: _pack_arrays(item) for key, item in value.items()}
+    if not isinstance(value, list):
+        return value
+    if len(value) >= MIN_ARRAY_LENGTH:
+        # Exact type checks: bools are ints, and mixing ints with floats would
+        # turn the ints into floats on the way back
+        kind = type(value[0])
+        if kind in (float, int) and all(type(item) is kind for item in value):
+            code = b"f" if kind is float else b"i"
+            try:
+                buffer = np.array(value, dtype=ARRAY_DTYPES[code]).tobytes()
+            except OverflowError:
+                pass
+            else:
+                return msgpack.ExtType(NUMERIC_ARRAY_EXT, code + buffer)
+    return [_pack_arrays(item) for item in value]
+
+
+def _unpack_array(code: int, data: bytes) -> Any:
+    if code != NUMERIC_ARRAY_EXT:
+        return msgpack.ExtType(code, data)
+    return np.frombuffer(data, dtype=ARRAY_DTYPES[data[:1]], offset=1).tolist()
+
+
+def _compressor(level: int) -> "zstandard.ZstdCompressor":
+    # zstandard contexts are not thread-safe; keep one per thread and level
+    compressors = getattr(_zstd, "compressors", None)
+    if compressors is None:
+        compressors = _zstd.compressors = {}
+    if level not in compressors:
+        compressors[level] = zstandard.ZstdCompressor(level=level)
+    return compressors[level]
+
+
+def _decompressor() -> "zstandard.ZstdDecompressor":
+    if not hasattr(_zstd, "decompressor"):
+        _zstd.decompressor = zstandard.ZstdDecompressor()
+    return _zstd.decompressor
+
+
+# Integers msgpack (and orjson, for RAW_DATA_FORMAT=json) can encode
+MIN_INT = -(2 ** 63)
+MAX_INT = 2 ** 64 - 1
+
+
+def check_storable(value: Any) -> Any:
+    """Raise ValueError if a JSON-compatible value holds integers pack_json cannot encode."""
+    if isinstance(value, dict):
+        for item in value.values():
+            check_storable(item)
+    elif isinstance(value, list):
+        for item in value:
+            check_storable(item)
+    elif isinstance(value, int) and not MIN_INT <= value <= MAX_INT:
+        raise ValueError("integers must fit in 64 bits")
+    return value
+
+
+def pack_json(value: Any, level: int = 3) -> bytes:
+    """Encode a JSON-compatible value as msgpack with packed numeric arrays, zstd-compressed."""
+    payload = msgpack.packb(_pack_arrays(value), use_bin_type=True)
+    return PACKED_MARKER + bytes([PACKED_VERSION]) + _compressor(level).compress(payload)
+
+
+def unpack_json(data: Any) -> Any:
+    """Decode a value written by pack_json, or legacy JSON text."""
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    if isinstance(data, bytes) and data[:1] == PACKED_MARKER:
+        if data[1] != PACKED_VERSION:
+            raise ValueError(f"Unknown packed JSON version {data[1]}")
+        return msgpack.unpackb(
+            _decompressor().decompress(data[2:]), ext_hook=_unpack_array, raw=False, strict_map_key=False
+        )
+    return orjson.loads(data)
+
+
+def is_packed(data: Any) -> bool:
+    """Whether a stored value is already in the packed format."""
+    return isinstance(data, (bytes, memoryview)) and bytes(data[:1]) == PACKED_MARKER
+
+
+class PackedJSON(TypeDecorator):
+    """JSON value stored as compact binary; see pack_json.
+
+    Written packed when RAW_DATA_FORMAT is "packed" and as JSON text bytes
+    when it is "json"; both are read back, so rows can be converted in place
+    (pack_raw_data.py) while the application runs. Not queryable in SQL.
+    """
+
+    impl = LargeBinary
+    cache_ok = True
+
+    def process_bind_param(self, value: Any, dialect) -> Optional[bytes]:
+        if value is None:
+            return None
+        if settings.RAW_DATA_FORMAT == "json":
+            return orjson.dumps(value)
+        return pack_json(value, settings.RAW_DATA_COMPRESSION_LEVEL)
+
+    def process_result_value(self, value: Any, dialect) -> Any:
+        if value is None:
+            return None
+        return unpack_json(value)
+
+
+class StoredDateTime(TypeDecorator):
+    """Timestamp read and bound exactly as the database stores it.
+
+    SQLite keeps timestamps as text, and server defaults are written to the
+    second while bound datetimes carry microseconds, so a value read through
+    DateTime and bound again no longer compares equal to its own row. Use it
+    with type_coerce to carry a stored value from one query to the next.
+    """
+
+    impl = DateTime(timezone=True)
+    cache_ok = True
+
+    def bind_processor(self, dialect):
+        return None
+
+    def result_processor(self, dialect, coltype):
+        return None
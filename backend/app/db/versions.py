@@ -0,0 +1,109 @@
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import Column, Integer, String, Table, event, insert, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+
+from .session import Base
+
+# One change counter per table, bumped by every commit that writes to it.
+# List and stats endpoints derive their ETags from these counters.
+table_versions = Table(
+    "table_versions",
+    Base.metadata,
+    Column("table_name", String, primary_key=True),
+    Column("version", Integer, nullable=False, default=0),
+)
+
+_CHANGED_TABLES = "changed_tables"
+
+
+def bump_versions(connection: Connection, names: Iterable[str]) -> None:
+    """Increment the counters of the given tables, creating missing ones."""
+    # Sorted so concurrent transactions lock the counter rows in the same order
+    names = sorted(set(names))
+    if not names:
+        return
+    bump = update(table_versions).where(
+        table_versions.c.table_name.in_(names)
+    ).values(version=table_versions.c.version + 1)
+    if connection.execute(bump).rowcount == len(names):
+        return
+    existing = set(connection.scalars(
+        select(table_versions.c.table_name).where(table_versions.c.table_name.in_(names))
+    ))
+    for name in names:
+        if name in existing:
+            continue
+        try:
+            with connection.begin_nested():
+                connection.execute(insert(table_versions).values(table_name=name, version=1))
+        except IntegrityError:
+            # A concurrent writer created the counter first
+            connection.execute(bump.where(table_versions.c.table_name == name))
+
+
+def versions_query(*names: str) -> Select:
+    """Current counters for the given tables, for building an ETag."""
+    return select(table_versions.c.version).where(
+        table_versions.c.table_name.in_(names)
+    ).order_by(table_versions.c.table_name)
+
+
+def _mark_changed(session: Session, name: str) -> None:
+    if name != table_versions.name:
+        session.info.setdefault(_CHANGED_TABLES, set()).add(name)
+
+
+@event.listens_for(Session, "before_flush")
+def stamp_updated_at(session, flush_context, instances):
+    """Give ORM updates a microsecond-precision updated_at on every database.
+
+    ``onupdate=func.now()`` has one-second resolution on SQLite, which is too
+    coarse for row ETags; an explicit value takes precedence over it.
+    """
+    now = datetime.now(timezone.utc)
+    for instance in session.dirty:
+        if hasattr(instance, "updated_at") and session.is_modified(instance, include_collections=False):
+            instance.updated_at = now
+
+
+@event.listens_for(Session, "after_flush")
+def record_flushed_tables(session, flush_context):
+    for instance in (*session.new, *session.dirty, *session.deleted):
+        table = getattr(instance, "__table__", None)
+        if table is not None:
+            _mark_changed(session, table.name)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def record_statement_tables(orm_execute_state):
+    if not (orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete):
+        return None
+    result = orm_execute_state.invoke_statement()
+    # An UPDATE or DELETE that matched nothing leaves the table as it was;
+    # rowcount is -1 where the driver cannot tell, which counts as a change
+    if orm_execute_state.is_insert or getattr(result, "rowcount", -1) != 0:
+        _mark_changed(orm_execute_state.session, orm_execute_state.statement.table.name)
+    return result
+
+
+@event.listens_for(Session, "before_commit")
+def bump_changed_tables(session):
+    # Bump once, when the outermost transaction commits, so the hot counter
+    # rows are locked only briefly
+    if session.in_nested_transaction():
+        return
+    session.flush()
+    names = session.info.pop(_CHANGED_TABLES, None)
+    if names:
+        bump_versions(session.connection(), names)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def discard_changed_tables(session, transaction):
+    if transaction.parent is None:
+        session.info.pop(_CHANGED_TABLES, None)
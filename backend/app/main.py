@@ -1,11 +1,34 @@
-from fastapi import FastAPI
+import logging
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.exc import SQLAlchemyError
 from .core.config import settings
+from .core.security import RedactTokenFilter, shutdown_hash_pool
+from .core.pagination import NEXT_CURSOR_HEADER
+from .db import session as db_session
+from .db.metrics import pool_stats
+from .db.routing import ReadAfterWriteMiddleware
 from .db.session import engine, Base
-from .api import auth, clinics, patients, transmissions
+from .api import auth, clinics, patients, transmissions, waveforms
+from .services.alert_stream import alert_hub
+from .services.auth import user_cache
+from .services.idempotency import ingest_dedup
+from .services.patient_search import create_search_index, patient_search, search_backend_name
+from .services.processing import LocalWorker, backlog_monitor, processing_metrics
+
+logger = logging.getLogger(__name__)
+
+# EventSource clients send their token in the stream URL; keep it out of the access log
+logging.getLogger("uvicorn.access").addFilter(RedactTokenFilter())
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
+try:
+    with engine.begin() as connection:
+        create_search_index(connection, search_backend_name)
+except SQLAlchemyError as e:
+    logger.warning("Could not create the patient search index: %s", e)
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -20,13 +43,60 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag", "Last-Modified"],
 )
+if db_session.replica_router is not None:
+    app.add_middleware(ReadAfterWriteMiddleware, writers=db_session.recent_writers)
+
+local_worker = LocalWorker() if settings.PROCESSING_LOCAL_WORKER else None
+
+
+@app.on_event("startup")
+def warm_patient_search():
+    """Load patient search state before the first query needs it."""
+    patient_search.warm(engine)
+
+
+@app.on_event("startup")
+def start_replica_health_checks():
+    """Begin routing reads to replicas once they pass a health check."""
+    if db_session.replica_router is not None:
+        db_session.replica_router.start()
+
+
+@app.on_event("startup")
+def start_local_worker():
+    """Process transmissions in-process when enabled."""
+    if local_worker is not None:
+        local_worker.start()
+
+
+@app.on_event("shutdown")
+def stop_password_hash_pool():
+    """Stop bcrypt worker processes."""
+    shutdown_hash_pool()
+
+
+@app.on_event("shutdown")
+def stop_local_worker():
+    """Stop the in-process transmission worker."""
+    if local_worker is not None:
+        local_worker.stop()
+
+
+@app.on_event("shutdown")
+def stop_replica_health_checks():
+    """Stop checking read replicas."""
+    if db_session.replica_router is not None:
+        db_session.replica_router.stop()
+
 
 # Include API routers
 app.include_router(auth.router, prefix=f"{settings.API_V1_STR}/auth", tags=["authentication"])
 app.include_router(clinics.router, prefix=f"{settings.API_V1_STR}/clinics", tags=["clinics"])
 app.include_router(patients.router, prefix=f"{settings.API_V1_STR}/patients", tags=["patients"])
 app.include_router(transmissions.router, prefix=f"{settings.API_V1_STR}/transmissions", tags=["transmissions"])
+app.include_router(waveforms.router, prefix=f"{settings.API_V1_STR}/transmissions", tags=["waveforms"])
 
 
 @app.get("/")
@@ -45,6 +115,23 @@ def health_check():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", dependencies=[Depends(auth.require_metrics_access)])
+def metrics():
+    """Runtime metrics for monitoring; the backlog is up to METRICS_BACKLOG_CACHE_SECONDS old."""
+    stats = {
+        "user_cache": user_cache.stats.as_dict(),
+        "db_pool": pool_stats(engine.pool),
+        "alert_stream": alert_hub.stats(),
+        "ingest_dedup": ingest_dedup.stats(),
+    }
+    if db_session.async_engine is not None:
+        stats["async_db_pool"] = pool_stats(db_session.async_engine.pool)
+    if db_session.replica_router is not None:
+        stats["db_replicas"] = db_session.replica_router.stats()
+    stats["processing"] = {**processing_metrics.as_dict(), **backlog_monitor.get()}
+    return stats
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
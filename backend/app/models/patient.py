@@ -19,8 +19,8 @@ class Patient(Base):
     emergency_contact = Column(String)
     emergency_phone = Column(String)
     medical_notes = Column(Text)
-    clinic_id = Column(Integer, ForeignKey("clinics.id"))
-    is_active = Column(Boolean, default=True)
+    clinic_id = Column(Integer, ForeignKey("clinics.id"), index=True)
+    is_active = Column(Boolean, default=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
@@ -0,0 +1,53 @@
+from sqlalchemy import Column, Integer, String, Date, DateTime, Float, UniqueConstraint
+from ..db.session import Base
+
+
+class TransmissionDailyStat(Base):
+    """Daily transmission counters per clinic, alert level and device type."""
+    __tablename__ = "transmission_daily_stats"
+
+    id = Column(Integer, primary_key=True, index=True)
+    day = Column(Date, nullable=False, index=True)
+    clinic_id = Column(Integer, nullable=False, default=0)  # 0 when the patient has no clinic
+    alert_level = Column(String, nullable=False, default="")
+    device_type = Column(String, nullable=False)
+    transmission_count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint("day", "clinic_id", "alert_level", "device_type", name="uq_transmission_daily_stats_bucket"),
+    )
+
+
+class ActiveDevice(Base):
+    """Devices that have sent at least one transmission."""
+    __tablename__ = "active_devices"
+
+    device_serial = Column(String, primary_key=True)
+    transmission_count = Column(Integer, nullable=False, default=0)
+
+
+class DeviceStats(Base):
+    """Running per-device statistics of battery level and lead impedance.
+
+    Each field keeps exponentially weighted sums (weight, sum, sum of
+    squares), so ingest updates them in O(1) and mean and variance follow
+    directly; battery also keeps the sums of a weighted regression on days
+    since ``first_seen_at`` for its slope.
+    """
+    __tablename__ = "device_stats"
+
+    device_serial = Column(String, primary_key=True)
+    first_seen_at = Column(DateTime(timezone=True))
+    last_seen_at = Column(DateTime(timezone=True))
+    transmission_count = Column(Integer, nullable=False, default=0)
+    battery_count = Column(Integer, nullable=False, default=0)
+    battery_weight = Column(Float, nullable=False, default=0.0)
+    battery_sum = Column(Float, nullable=False, default=0.0)
+    battery_sum_sq = Column(Float, nullable=False, default=0.0)
+    battery_day_sum = Column(Float, nullable=False, default=0.0)
+    battery_day_sum_sq = Column(Float, nullable=False, default=0.0)
+    battery_day_product_sum = Column(Float, nullable=False, default=0.0)
+    impedance_count = Column(Integer, nullable=False, default=0)
+    impedance_weight = Column(Float, nullable=False, default=0.0)
+    impedance_sum = Column(Float, nullable=False, default=0.0)
+    impedance_sum_sq = Column(Float, nullable=False, default=0.0)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, JSON
+from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, ForeignKey, Float, Index, JSON
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from ..db.session import Base
+from ..db.types import PackedJSON
 
 
 class Transmission(Base):
@@ -9,6 +10,7 @@ class Transmission(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     transmission_id = Column(String, unique=True, index=True, nullable=False)
+    idempotency_key = Column(String, unique=True, index=True)  # Idempotency-Key of the creating request
     patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
     device_type = Column(String, nullable=False)  # pacemaker, icd, crt, loop
     device_serial = Column(String)
@@ -19,12 +21,69 @@ class Transmission(Base):
     battery_level = Column(Float)
     impedance = Column(Float)
     arrhythmia_detected = Column(Boolean, default=False)
+    arrhythmia_episodes = Column(JSON)  # episodes found by server-side detection
+    trend_anomalies = Column(JSON)  # readings far from the device's running statistics
     alert_level = Column(String, default="normal")  # normal, warning, critical
-    raw_data = Column(JSON)  # Store detailed transmission data
+    alert_rule = Column(String)  # name of the server-side rule that set alert_level
+    alert_level_manual = Column(Boolean, default=False)  # set by staff; rules leave it alone
+    raw_data = Column(PackedJSON)  # Store detailed transmission data
     notes = Column(Text)
     processed = Column(Boolean, default=False)
+    lease_owner = Column(String)  # worker currently processing this row
+    lease_expires_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
     # Relationships
-    patient = relationship("Patient", back_populates="transmissions")
\ No newline at end of file
+    patient = relationship("Patient", back_populates="transmissions")
+
+    # Indexes for listing (newest first, keyset on created_at + id), the
+    # per-patient and per-alert-level filters, device lookups and the
+    # processing queue (oldest unprocessed first).
+    __table_args__ = (
+        Index("ix_transmissions_created_at_id", "created_at", "id"),
+        Index("ix_transmissions_patient_created_at", "patient_id", "created_at", "id"),
+        Index("ix_transmissions_alert_level_created_at", "alert_level", "created_at", "id"),
+        Index("ix_transmissions_device_serial", "device_serial"),
+        Index("ix_transmissions_processed_created_at", "processed", "created_at", "id"),
+    )
+
+class TransmissionArchive(Base):
+    """Transmissions moved out of the hot table by the retention job.
+
+    Mirrors the ``transmissions`` columns, so listing queries run unchanged
+    against either table, and keeps the original ids. ``raw_data`` uses the
+    same packed type, so rows are copied without re-encoding; lease columns
+    are dropped since only processed rows are archived.
+    """
+    __tablename__ = "transmissions_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    transmission_id = Column(String, unique=True, index=True, nullable=False)
+    idempotency_key = Column(String, index=True)
+    patient_id = Column(Integer, ForeignKey("patients.id"), nullable=False)
+    device_type = Column(String, nullable=False)
+    device_serial = Column(String)
+    transmission_type = Column(String)
+    heart_rate_avg = Column(Float)
+    heart_rate_min = Column(Float)
+    heart_rate_max = Column(Float)
+    battery_level = Column(Float)
+    impedance = Column(Float)
+    arrhythmia_detected = Column(Boolean)
+    arrhythmia_episodes = Column(JSON)
+    trend_anomalies = Column(JSON)
+    alert_level = Column(String)
+    alert_rule = Column(String)
+    alert_level_manual = Column(Boolean)
+    raw_data = Column(PackedJSON)
+    notes = Column(Text)
+    processed = Column(Boolean)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_transmissions_archive_created_at_id", "created_at", "id"),
+        Index("ix_transmissions_archive_patient_created_at", "patient_id", "created_at", "id"),
+    )
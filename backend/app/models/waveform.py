@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, Float, UniqueConstraint
+from sqlalchemy.sql import func
+from ..db.session import Base
+
+
+class Waveform(Base):
+    """An electrogram channel recorded with a transmission.
+
+    Samples live in the waveform store under ``storage_key``; this row holds
+    what is needed to read them back.
+    """
+    __tablename__ = "waveforms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    # Not a foreign key: the transmission may move to transmissions_archive,
+    # which keeps its id
+    transmission_id = Column(Integer, nullable=False, index=True)
+    channel = Column(String, nullable=False)  # e.g. atrial, ventricular, shock
+    sample_rate = Column(Float, nullable=False)  # Hz
+    sample_count = Column(Integer, nullable=False)
+    units = Column(String, default="mV")
+    storage_key = Column(String, nullable=False)  # version directory in the waveform store
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("transmission_id", "channel", name="uq_waveforms_transmission_channel"),
+    )
@@ -1,7 +1,10 @@
 from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime, date
 
+from .clinic import Clinic
+from .transmission import Transmission
+
 
 class PatientBase(BaseModel):
     patient_id: str
@@ -44,4 +47,40 @@ class Patient(PatientBase):
     id: int
     is_active: bool
     created_at: datetime
-    updated_at: Optional[datetime] = None
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+
+class DeviceTrend(BaseModel):
+    device_serial: str
+    timestamps: List[datetime]
+    heart_rate_avg: List[Optional[float]]
+    heart_rate_min: List[Optional[float]]
+    heart_rate_max: List[Optional[float]]
+    battery_level: List[Optional[float]]
+    impedance: List[Optional[float]]
+
+
+class PatientTrends(BaseModel):
+    patient_id: int
+    start: datetime
+    end: datetime
+    devices: List[DeviceTrend]
+
+
+class DeviceVitals(BaseModel):
+    device_serial: str
+    device_type: str
+    last_transmission_at: datetime
+    heart_rate_avg: Optional[float] = None
+    heart_rate_min: Optional[float] = None
+    heart_rate_max: Optional[float] = None
+    battery_level: Optional[float] = None
+    impedance: Optional[float] = None
+    alert_level: str
+
+
+class PatientOverview(BaseModel):
+    patient: Patient
+    clinic: Optional[Clinic] = None
+    recent_transmissions: List[Transmission]
+    devices: List[DeviceVitals]
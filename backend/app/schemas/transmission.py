@@ -1,7 +1,12 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional, Dict, Any
+from pydantic import AfterValidator, BaseModel, ConfigDict
+from typing import Annotated, Optional, Dict, Any, List
 from datetime import datetime
 
+from ..db.types import check_storable
+
+# raw_data as accepted from clients: anything PackedJSON can store
+RawData = Annotated[Dict[str, Any], AfterValidator(check_storable)]
+
 
 class TransmissionBase(BaseModel):
     transmission_id: str
@@ -16,7 +21,7 @@ class TransmissionBase(BaseModel):
     impedance: Optional[float] = None
     arrhythmia_detected: bool = False
     alert_level: str = "normal"
-    raw_data: Optional[Dict[str, Any]] = None
+    raw_data: Optional[RawData] = None
     notes: Optional[str] = None
 
 
@@ -37,7 +42,7 @@ class TransmissionUpdate(BaseModel):
     impedance: Optional[float] = None
     arrhythmia_detected: Optional[bool] = None
     alert_level: Optional[str] = None
-    raw_data: Optional[Dict[str, Any]] = None
+    raw_data: Optional[RawData] = None
     notes: Optional[str] = None
     processed: Optional[bool] = None
 
@@ -46,6 +51,23 @@ class Transmission(TransmissionBase):
     model_config = ConfigDict(from_attributes=True)
     
     id: int
+    alert_rule: Optional[str] = None
+    arrhythmia_episodes: Optional[List[Dict[str, Any]]] = None
+    trend_anomalies: Optional[List[Dict[str, Any]]] = None
     processed: bool
     created_at: datetime
-    updated_at: Optional[datetime] = None
\ No newline at end of file
+    updated_at: Optional[datetime] = None
+
+class TransmissionBulkItemResult(BaseModel):
+    index: int
+    transmission_id: Optional[str] = None
+    status: str  # accepted, duplicate (id is the stored original), rejected, error (insert failed)
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+
+class TransmissionBulkResult(BaseModel):
+    accepted: int
+    duplicates: int = 0
+    rejected: int
+    results: List[TransmissionBulkItemResult]
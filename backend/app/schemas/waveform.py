@@ -0,0 +1,29 @@
+from pydantic import BaseModel, ConfigDict
+from typing import List, Optional
+from datetime import datetime
+
+
+class Waveform(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    transmission_id: int
+    channel: str
+    sample_rate: float
+    sample_count: int
+    units: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+
+class WaveformView(BaseModel):
+    transmission_id: int
+    channel: str
+    sample_rate: float
+    units: Optional[str] = None
+    start: float  # seconds from the start of the recording
+    end: float
+    samples_per_point: float
+    # Envelope per output point; equal when each point is a single sample
+    min: List[Optional[float]]
+    max: List[Optional[float]]
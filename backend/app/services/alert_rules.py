@@ -0,0 +1,172 @@
+import json
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+
+ALERT_LEVELS = ("normal", "warning", "critical")
+SEVERITY = {level: rank for rank, level in enumerate(ALERT_LEVELS)}
+
+_COMPARATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+}
+
+
+@dataclass
+class AlertRule:
+    """A threshold on one transmission value.
+
+    ``field`` is a transmission column or ``raw_data.<key>`` for a numeric
+    value in the device payload. ``device_types`` limits the rule to those
+    device types; None applies it to all.
+    """
+    name: str
+    field: str
+    op: str
+    threshold: float
+    level: str
+    device_types: Optional[Tuple[str, ...]] = None
+
+    def __post_init__(self):
+        if self.op not in _COMPARATORS:
+            raise ValueError(f"Unknown operator {self.op!r} in rule {self.name}")
+        if self.level not in SEVERITY:
+            raise ValueError(f"Unknown alert level {self.level!r} in rule {self.name}")
+        if self.device_types is not None:
+            self.device_types = tuple(self.device_types)
+
+
+LEAD_DEVICES = ("pacemaker", "icd", "crt")
+
+DEFAULT_RULES = [
+    AlertRule("heart_rate_avg_very_high", "heart_rate_avg", ">", 150, "critical"),
+    AlertRule("heart_rate_min_very_low", "heart_rate_min", "<", 30, "critical"),
+    AlertRule("battery_depleted", "battery_level", "<", 10, "critical"),
+    AlertRule("lead_impedance_very_low", "impedance", "<", 200, "critical", LEAD_DEVICES),
+    AlertRule("lead_impedance_very_high", "impedance", ">", 2000, "critical", LEAD_DEVICES),
+    AlertRule("heart_rate_avg_high", "heart_rate_avg", ">", 120, "warning"),
+    AlertRule("heart_rate_min_low", "heart_rate_min", "<", 40, "warning"),
+    AlertRule("heart_rate_max_high", "heart_rate_max", ">", 180, "warning"),
+    AlertRule("battery_low", "battery_level", "<", 25, "warning"),
+    AlertRule("lead_impedance_low", "impedance", "<", 300, "warning", LEAD_DEVICES),
+    AlertRule("lead_impedance_high", "impedance", ">", 1500, "warning", LEAD_DEVICES),
+    AlertRule("battery_voltage_low", "raw_data.battery_voltage", "<", 2.6, "warning"),
+]
+
+
+def _values(rows: Sequence[Mapping[str, Any]], name: str) -> List[Any]:
+    if name.startswith("raw_data."):
+        key = name[len("raw_data."):]
+        return [
+            raw_data.get(key) if isinstance(raw_data, dict) else None
+            for raw_data in (row.get("raw_data") for row in rows)
+        ]
+    return [row.get(name) for row in rows]
+
+
+def _column(rows: Sequence[Mapping[str, Any]], name: str) -> np.ndarray:
+    """One field of every row as float64, with NaN where missing or non-numeric."""
+    values = _values(rows, name)
+    try:
+        # None converts to NaN; anything else non-numeric takes the slow path
+        return np.array(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return np.array([
+            value if isinstance(value, (int, float)) else np.nan for value in values
+        ], dtype=np.float64)
+
+
+@dataclass
+class AlertRuleEngine:
+    """Evaluates alert rules over whole batches of transmissions with NumPy.
+
+    ``clinic_overrides`` maps clinic id to {rule name: threshold} for clinics
+    that tune thresholds for their population.
+    """
+    rules: List[AlertRule]
+    clinic_overrides: Dict[int, Dict[str, float]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # Most severe first, so the first rule to fire at a level is reported
+        self.rules = sorted(self.rules, key=lambda rule: -SEVERITY[rule.level])
+
+    def evaluate(
+        self, rows: Sequence[Mapping[str, Any]], clinic_ids: Sequence[Optional[int]]
+    ) -> Tuple[np.ndarray, List[Optional[str]]]:
+        """Return each row's computed severity rank and the rule that set it."""
+        n = len(rows)
+        severity = np.zeros(n, dtype=np.int8)
+        fired_rule = np.full(n, -1, dtype=np.int32)
+        if not n:
+            return severity, []
+
+        columns = {name: _column(rows, name) for name in {rule.field for rule in self.rules}}
+        # Device types as small integer codes so rule masks are integer compares
+        codes: Dict[Any, int] = {}
+        device_types = np.array(
+            [codes.setdefault(row.get("device_type"), len(codes)) for row in rows], dtype=np.int32
+        )
+        # Group rows by clinic: each clinic in the batch resolves its thresholds
+        # once per rule, and rows pick theirs up by group index
+        clinics, clinic_group = np.unique(
+            np.array([clinic_id or 0 for clinic_id in clinic_ids], dtype=np.int64), return_inverse=True
+        )
+        overrides = [self.clinic_overrides.get(int(clinic_id), {}) for clinic_id in clinics]
+
+        for index, rule in enumerate(self.rules):
+            thresholds: Any = float(rule.threshold)
+            if any(rule.name in tuned for tuned in overrides):
+                thresholds = np.array(
+                    [tuned.get(rule.name, thresholds) for tuned in overrides], dtype=np.float64
+                )[clinic_group]
+            fired = _COMPARATORS[rule.op](columns[rule.field], thresholds)
+            if rule.device_types is not None:
+                fired &= np.isin(device_types, [codes[t] for t in rule.device_types if t in codes])
+            better = fired & (SEVERITY[rule.level] > severity)
+            severity[better] = SEVERITY[rule.level]
+            fired_rule[better] = index
+
+        names = [self.rules[index].name if index >= 0 else None for index in fired_rule]
+        return severity, names
+
+    def apply(self, rows: List[Dict[str, Any]], clinic_ids: Sequence[Optional[int]]) -> None:
+        """Set alert_level and alert_rule on transmission dicts in place.
+
+        The server never downgrades the level a gateway reported, and leaves
+        levels staff set by hand (alert_level_manual) as they are; alert_rule
+        names the rule responsible when the server's level is used.
+        """
+        severity, names = self.evaluate(rows, clinic_ids)
+        reported = np.array([SEVERITY.get(row.get("alert_level"), 0) for row in rows], dtype=np.int8)
+        manual = np.array([bool(row.get("alert_level_manual")) for row in rows], dtype=bool)
+        for i in np.flatnonzero((severity > 0) & (severity >= reported) & ~manual):
+            rows[i]["alert_level"] = ALERT_LEVELS[severity[i]]
+            rows[i]["alert_rule"] = names[i]
+
+
+def load_engine(path: Optional[str]) -> AlertRuleEngine:
+    """Build the engine from a JSON rules file, or the default rules.
+
+    The file may define ``rules`` (replacing the defaults) and
+    ``clinic_overrides`` ({"<clinic id>": {"<rule name>": threshold}}).
+    """
+    if not path:
+        return AlertRuleEngine(list(DEFAULT_RULES))
+    with open(path) as f:
+        config = json.load(f)
+    rules = [AlertRule(**rule) for rule in config["rules"]] if "rules" in config else list(DEFAULT_RULES)
+    overrides = {
+        int(clinic_id): {name: float(value) for name, value in thresholds.items()}
+        for clinic_id, thresholds in config.get("clinic_overrides", {}).items()
+    }
+    return AlertRuleEngine(rules, overrides)
+
+
+alert_engine: Optional[AlertRuleEngine] = (
+    load_engine(settings.ALERT_RULES_PATH) if settings.ALERT_RULES_ENABLED else None
+)
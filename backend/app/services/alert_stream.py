@@ -0,0 +1,42 @@
+from typing import Any, Dict, Iterable, List, Mapping, Optional
+
+from ..core.broadcast import create_broadcast_hub
+from ..core.config import settings
+
+alert_hub = create_broadcast_hub(
+    settings.ALERT_STREAM_BACKEND,
+    max_subscribers=settings.ALERT_STREAM_MAX_SUBSCRIBERS,
+    max_queue=settings.ALERT_STREAM_QUEUE_SIZE,
+    redis_url=settings.ALERT_STREAM_REDIS_URL,
+    replay_size=settings.ALERT_STREAM_REPLAY_SIZE,
+)
+
+
+def transmission_event(transmission: Any, clinic_id: Optional[int], event: str) -> Dict[str, Any]:
+    """The JSON payload pushed to stream subscribers for a transmission."""
+    created_at = transmission.created_at
+    return {
+        "event": event,
+        "id": transmission.id,
+        "transmission_id": transmission.transmission_id,
+        "patient_id": transmission.patient_id,
+        "clinic_id": clinic_id,
+        "device_type": transmission.device_type,
+        "device_serial": transmission.device_serial,
+        "alert_level": transmission.alert_level,
+        "alert_rule": transmission.alert_rule,
+        "created_at": created_at.isoformat() if created_at else None,
+    }
+
+
+def publish_transmissions(
+    transmissions: Iterable[Any], clinic_ids: Mapping[int, Optional[int]], event: str = "created"
+) -> None:
+    """Push new or escalated transmissions to stream subscribers.
+
+    ``clinic_ids`` maps patient id to clinic id, for subscriber filtering.
+    """
+    events: List[Dict[str, Any]] = [
+        transmission_event(t, clinic_ids.get(t.patient_id), event) for t in transmissions
+    ]
+    alert_hub.publish(events)
@@ -0,0 +1,97 @@
+import heapq
+import logging
+from datetime import datetime, timedelta, timezone
+from itertools import islice
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.transmission import Transmission, TransmissionArchive
+
+logger = logging.getLogger(__name__)
+
+# Transmission columns copied into the archive
+ARCHIVE_COLUMNS = [
+    column.key for column in TransmissionArchive.__table__.columns if column.key != "archived_at"
+]
+
+
+def archive_transmissions(
+    db: Session, older_than: Optional[timedelta] = None, batch_size: Optional[int] = None
+) -> int:
+    """Move processed transmissions older than ``older_than`` to the archive.
+
+    Each batch is copied with INSERT ... SELECT (both tiers store raw_data
+    in the same format, so it is never decoded) and deleted in its own
+    transaction, so the job can be interrupted and rerun. The dashboard
+    rollups are left alone: archived transmissions still count towards
+    history. Rows whose transmission_id is already archived are skipped, and
+    old rows still waiting for the processing worker are left in place; both
+    are logged. Returns the number moved.
+    """
+    if older_than is None:
+        older_than = timedelta(days=settings.TRANSMISSION_RETENTION_DAYS)
+    batch_size = batch_size or settings.TRANSMISSION_ARCHIVE_BATCH_SIZE
+    cutoff = datetime.now(timezone.utc) - older_than
+    archived = select(TransmissionArchive.id).where(
+        TransmissionArchive.transmission_id == Transmission.transmission_id
+    ).exists()
+    old = (
+        Transmission.created_at < cutoff,
+        # Keep the newest row: SQLite reuses the ids above the current maximum
+        Transmission.id < select(func.max(Transmission.id)).scalar_subquery(),
+    )
+    eligible = (*old, Transmission.processed.is_(True))
+    candidates = (
+        select(Transmission.id)
+        .where(*eligible, ~archived)
+        .order_by(Transmission.created_at, Transmission.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        # Skip rows an API request is editing; the next run picks them up
+        candidates = candidates.with_for_update(skip_locked=True)
+
+    moved = 0
+    while True:
+        ids = list(db.scalars(candidates))
+        if not ids:
+            conflicts = db.scalar(select(func.count()).select_from(Transmission).where(*eligible, archived))
+            if conflicts:
+                logger.warning(
+                    "Left %d transmissions in the live table: their transmission_id is already archived",
+                    conflicts,
+                )
+            unprocessed = db.scalar(
+                select(func.count()).select_from(Transmission).where(*old, Transmission.processed.is_(False))
+            )
+            if unprocessed:
+                logger.warning(
+                    "%d transmissions past retention are unprocessed and stay in the live table "
+                    "until a processing worker handles them",
+                    unprocessed,
+                )
+            db.commit()
+            return moved
+        db.execute(insert(TransmissionArchive).from_select(
+            ARCHIVE_COLUMNS,
+            select(*(getattr(Transmission, key) for key in ARCHIVE_COLUMNS)).where(Transmission.id.in_(ids)),
+        ))
+        db.execute(
+            delete(Transmission).where(Transmission.id.in_(ids)),
+            execution_options={"synchronize_session": False},
+        )
+        db.commit()
+        moved += len(ids)
+
+
+def merge_newest(tiers: Sequence[Sequence[Row]], count: int) -> List[Row]:
+    """Merge newest-first row lists from each tier, keeping the first ``count``.
+
+    Rows must carry ``created_at`` and ``id``, the listing sort key.
+    """
+    merged = heapq.merge(*tiers, key=lambda row: (row.created_at, row.id), reverse=True)
+    return list(islice(merged, count))
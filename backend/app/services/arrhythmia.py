@@ -0,0 +1,217 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.transmission import Transmission
+
+# R-R intervals outside this range (ms) are treated as sensing artefacts
+VALID_RR_MS = (150.0, 10000.0)
+
+_table = Transmission.__table__
+
+
+def rr_from_egm(samples: Any, sample_rate: float, refractory_s: float = 0.25) -> np.ndarray:
+    """R-R intervals (ms) from the R peaks of an electrogram.
+
+    Peaks are local maxima of the rectified signal above half its 99th
+    percentile; candidates closer than the refractory period are merged,
+    keeping the largest.
+    """
+    x = np.asarray(samples, dtype=np.float64)
+    if len(x) < 3 or sample_rate <= 0:
+        return np.empty(0)
+    x = np.abs(x - np.median(x))
+    threshold = 0.5 * np.percentile(x, 99)
+    if threshold <= 0:
+        return np.empty(0)
+    middle = x[1:-1]
+    peaks = np.flatnonzero((middle > threshold) & (middle >= x[:-2]) & (middle > x[2:])) + 1
+    if len(peaks) < 2:
+        return np.empty(0)
+    new_cluster = np.diff(peaks, prepend=-np.inf) > refractory_s * sample_rate
+    clusters = np.cumsum(new_cluster)
+    # Sort by cluster, then amplitude: the last entry of each cluster is its R peak
+    order = np.lexsort((x[peaks], clusters))
+    last_of_cluster = np.flatnonzero(np.diff(clusters[order], append=np.inf) != 0)
+    r_peaks = np.sort(peaks[order[last_of_cluster]])
+    return np.diff(r_peaks) * (1000.0 / sample_rate)
+
+
+def _runs(mask: np.ndarray, min_length: int) -> List[Tuple[int, int]]:
+    """[start, end) index ranges of True runs at least min_length long."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts, ends = np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+    keep = ends - starts >= min_length
+    return list(zip(starts[keep].tolist(), ends[keep].tolist()))
+
+
+@dataclass
+class ArrhythmiaDetector:
+    """R-R interval analysis of the rhythm data carried in ``raw_data``.
+
+    Reads, in order of preference, ``rr_intervals_ms`` (list of ms), ``egm``
+    (``{"sample_rate": Hz, "ventricular" or "samples": [...]}``) or
+    ``heart_rate_series`` (beat-to-beat rates in bpm). Episodes are runs of
+    beats found with NumPy masks over the whole series at once.
+    """
+    bradycardia_bpm: float = 40.0
+    tachycardia_bpm: float = 150.0
+    min_run_beats: int = 8  # consecutive beats for a brady- or tachycardia episode
+    pause_ms: float = 3000.0
+    irregularity_window: int = 32  # beats per window for irregular rhythm (possible AF)
+    irregularity_threshold: float = 0.12  # successive R-R change, relative to the interval
+    irregular_fraction: float = 0.5  # share of irregular beats that flags a window
+    max_episodes: int = 50
+
+    @staticmethod
+    def rr_intervals(raw_data: Any) -> Optional[Tuple[str, np.ndarray]]:
+        """The R-R series in raw_data and where it came from, or None."""
+        if not isinstance(raw_data, dict):
+            return None
+        try:
+            if isinstance(raw_data.get("rr_intervals_ms"), list):
+                rr = np.asarray(raw_data["rr_intervals_ms"], dtype=np.float64)
+                source = "rr_intervals_ms"
+            elif isinstance(raw_data.get("egm"), dict):
+                egm = raw_data["egm"]
+                samples = egm.get("ventricular", egm.get("samples"))
+                if not isinstance(samples, list):
+                    return None
+                rr = rr_from_egm(samples, float(egm.get("sample_rate") or 0))
+                source = "egm"
+            elif isinstance(raw_data.get("heart_rate_series"), list):
+                rates = np.asarray(raw_data["heart_rate_series"], dtype=np.float64)
+                with np.errstate(divide="ignore"):
+                    rr = 60000.0 / rates
+                source = "heart_rate_series"
+            else:
+                return None
+        except (TypeError, ValueError):
+            return None
+        rr = rr[(rr >= VALID_RR_MS[0]) & (rr <= VALID_RR_MS[1])]
+        return (source, rr) if len(rr) >= 2 else None
+
+    def episodes(self, rr: np.ndarray) -> List[Dict[str, Any]]:
+        """Arrhythmia episodes in an R-R series (ms), in time order."""
+        rate = 60000.0 / rr
+        onset = np.concatenate(([0.0], np.cumsum(rr))) / 1000.0
+        found: List[Tuple[str, int, int]] = []
+        found += [("tachycardia", s, e) for s, e in _runs(rate > self.tachycardia_bpm, self.min_run_beats)]
+        found += [("bradycardia", s, e) for s, e in _runs(rate < self.bradycardia_bpm, self.min_run_beats)]
+        found += [("pause", s, e) for s, e in _runs(rr > self.pause_ms, 1)]
+
+        window = self.irregularity_window
+        if len(rr) >= window:
+            # Share of irregular beats in every window at once, via a cumulative sum.
+            # Counting beats rather than averaging differences keeps single rate
+            # changes, such as a pause or tachycardia onset, from flagging a window.
+            irregular_beat = np.abs(np.diff(rr)) > self.irregularity_threshold * rr[1:]
+            counts = np.concatenate(([0], np.cumsum(irregular_beat)))
+            starts = np.arange(len(rr) - window + 1)
+            share = (counts[starts + window - 1] - counts[starts]) / (window - 1)
+            flagged = starts[share > self.irregular_fraction]
+            # Mark every beat covered by a flagged window
+            coverage = np.zeros(len(rr) + 1, dtype=np.int32)
+            np.add.at(coverage, flagged, 1)
+            np.add.at(coverage, flagged + window, -1)
+            irregular = np.cumsum(coverage[:-1]) > 0
+            found += [("irregular_rhythm", s, e) for s, e in _runs(irregular, window)]
+
+        found.sort(key=lambda episode: (episode[1], episode[0]))
+        return [
+            {
+                "type": kind,
+                "start_beat": start,
+                "beats": end - start,
+                "onset_s": round(float(onset[start]), 3),
+                "duration_s": round(float(onset[end] - onset[start]), 3),
+                "mean_rate_bpm": round(float(60000.0 * (end - start) / rr[start:end].sum()), 1),
+            }
+            for kind, start, end in found[:self.max_episodes]
+        ]
+
+    def analyze(self, raw_data: Any) -> Optional[List[Dict[str, Any]]]:
+        """Episodes found in raw_data, or None when it has no rhythm data."""
+        series = self.rr_intervals(raw_data)
+        if series is None:
+            return None
+        source, rr = series
+        return [{**episode, "source": source} for episode in self.episodes(rr)]
+
+    def apply(self, rows: List[Dict[str, Any]]) -> None:
+        """Set arrhythmia_detected and arrhythmia_episodes on transmission dicts in place.
+
+        Rows without rhythm data keep the arrhythmia_detected value the
+        device reported.
+        """
+        for row in rows:
+            episodes = self.analyze(row.get("raw_data"))
+            row["arrhythmia_episodes"] = episodes
+            if episodes is not None:
+                row["arrhythmia_detected"] = bool(episodes)
+
+
+def detect_range(first_id: int, last_id: int, batch_size: Optional[int] = None) -> Tuple[int, int]:
+    """Re-run detection over transmissions with first_id <= id <= last_id.
+
+    Opens its own session, so it can run in a worker process. Returns the
+    number of transmissions analysed and how many had episodes.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    detector = arrhythmia_detector or ArrhythmiaDetector()
+    statement = (
+        update(_table).where(_table.c.id == bindparam("row_id"))
+        .values(arrhythmia_detected=bindparam("detected"), arrhythmia_episodes=bindparam("episodes"))
+    )
+    analyzed = detected = 0
+    db = SessionLocal()
+    try:
+        result = db.execute(
+            select(_table.c.id, _table.c.raw_data)
+            .where(_table.c.id.between(first_id, last_id), _table.c.raw_data.is_not(None))
+            .order_by(_table.c.id)
+            .execution_options(yield_per=batch_size)
+        )
+        updates = []
+        for rows in result.partitions():
+            for row in rows:
+                episodes = detector.analyze(row.raw_data)
+                if episodes is None:
+                    continue
+                updates.append({"row_id": row.id, "detected": bool(episodes), "episodes": episodes})
+                detected += bool(episodes)
+            analyzed += len(rows)
+        result.close()
+        for start in range(0, len(updates), batch_size):
+            db.execute(statement, updates[start:start + batch_size])
+        db.commit()
+        return analyzed, detected
+    finally:
+        db.close()
+
+
+def backlog_ranges(db: Session, since: datetime, range_size: int) -> List[Tuple[int, int]]:
+    """Split the ids of transmissions created since ``since`` into ranges of range_size ids."""
+    first_id = db.scalar(
+        select(_table.c.id).where(_table.c.created_at >= since)
+        .order_by(_table.c.created_at, _table.c.id).limit(1)
+    )
+    if first_id is None:
+        return []
+    last_id = db.scalar(select(func.max(_table.c.id)))
+    return [(start, min(start + range_size - 1, last_id)) for start in range(first_id, last_id + 1, range_size)]
+
+
+arrhythmia_detector: Optional[ArrhythmiaDetector] = (
+    ArrhythmiaDetector(
+        bradycardia_bpm=settings.ARRHYTHMIA_BRADYCARDIA_BPM,
+        tachycardia_bpm=settings.ARRHYTHMIA_TACHYCARDIA_BPM,
+        pause_ms=settings.ARRHYTHMIA_PAUSE_MS,
+    ) if settings.ARRHYTHMIA_DETECTION_ENABLED else None
+)
@@ -1,8 +1,45 @@
 from sqlalchemy.orm import Session
 from typing import Optional
+from starlette.concurrency import run_in_threadpool
 from ..models.user import User
-from ..schemas.user import UserCreate, UserUpdate
-from ..core.security import get_password_hash, verify_password
+from ..schemas.user import UserCreate, UserUpdate, User as UserSchema
+from ..core.cache import CacheBackend, CacheStats, create_cache_backend
+from ..core.config import settings
+from ..core.security import get_password_hash, verify_and_update_password, verify_and_update_password_async
+
+
+class UserCache:
+    """Cache of resolved users keyed by username (the token subject)."""
+
+    def __init__(self, backend: Optional[CacheBackend], ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self.stats = CacheStats()
+
+    def get(self, username: str) -> Optional[UserSchema]:
+        if self.backend is None:
+            return None
+        cached = self.backend.get(username)
+        self.stats.record(hit=cached is not None)
+        return UserSchema.model_validate_json(cached) if cached is not None else None
+
+    def set(self, user: UserSchema) -> None:
+        if self.backend is not None:
+            self.backend.set(user.username, user.model_dump_json(), self.ttl)
+
+    def invalidate(self, username: str) -> None:
+        if self.backend is not None:
+            self.backend.delete(username)
+
+
+user_cache = UserCache(
+    create_cache_backend(
+        settings.USER_CACHE_BACKEND,
+        max_size=settings.USER_CACHE_MAX_SIZE,
+        redis_url=settings.USER_CACHE_REDIS_URL,
+    ),
+    ttl=settings.USER_CACHE_TTL_SECONDS,
+)
 
 
 def get_user(db: Session, user_id: int) -> Optional[User]:
@@ -25,11 +62,34 @@ def authenticate_user(db: Session, username: str, password: str) -> Optional[Use
     user = get_user_by_username(db, username)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    valid, new_hash = verify_and_update_password(password, user.hashed_password)
+    if not valid:
         return None
+    if new_hash:
+        _rehash_user(db, user, new_hash)
     return user
 
 
+async def authenticate_user_async(db: Session, username: str, password: str) -> Optional[User]:
+    """Authenticate user with bcrypt running in the password hashing pool."""
+    user = await run_in_threadpool(get_user_by_username, db, username)
+    if not user:
+        return None
+    valid, new_hash = await verify_and_update_password_async(password, user.hashed_password)
+    if not valid:
+        return None
+    if new_hash:
+        await run_in_threadpool(_rehash_user, db, user, new_hash)
+    return user
+
+
+def _rehash_user(db: Session, user: User, new_hash: str) -> None:
+    """Store a hash produced with the current bcrypt cost."""
+    user.hashed_password = new_hash
+    db.commit()
+    db.refresh(user)
+
+
 def create_user(db: Session, user: UserCreate) -> User:
     """Create new user."""
     hashed_password = get_password_hash(user.password)
@@ -52,12 +112,16 @@ def update_user(db: Session, user_id: int, user_update: UserUpdate) -> Optional[
     if not db_user:
         return None
     
+    previous_username = db_user.username
     update_data = user_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(db_user, key, value)
     
     db.commit()
     db.refresh(db_user)
+    # Drop cached copies so role and is_active changes apply immediately
+    user_cache.invalidate(previous_username)
+    user_cache.invalidate(db_user.username)
     return db_user
 
 
@@ -9,9 +9,16 @@ def get_clinic(db: Session, clinic_id: int) -> Optional[Clinic]:
     return db.query(Clinic).filter(Clinic.id == clinic_id).first()
 
 
-def get_clinics(db: Session, skip: int = 0, limit: int = 100) -> List[Clinic]:
-    """Get list of clinics."""
-    return db.query(Clinic).offset(skip).limit(limit).all()
+def get_clinics(
+    db: Session, skip: int = 0, limit: int = 100, after_id: Optional[int] = None
+) -> List[Clinic]:
+    """Get list of clinics, resuming after ``after_id`` when given."""
+    query = db.query(Clinic).order_by(Clinic.id)
+    if after_id is not None:
+        query = query.filter(Clinic.id > after_id)
+    else:
+        query = query.offset(skip)
+    return query.limit(limit).all()
 
 
 def create_clinic(db: Session, clinic: ClinicCreate) -> Clinic:
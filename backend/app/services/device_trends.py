@@ -0,0 +1,258 @@
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy import bindparam, delete, insert, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..models.stats import DeviceStats
+from ..models.transmission import Transmission, TransmissionArchive
+
+# Tracked fields: stats column prefix -> transmission column
+TREND_FIELDS = {"battery": "battery_level", "impedance": "impedance"}
+
+# Battery slopes are only judged once the regression spans this many days
+MIN_SLOPE_SPREAD_DAYS = 1.0
+
+_SECONDS_PER_DAY = 86400.0
+
+_STATE_COLUMNS = [column.key for column in DeviceStats.__table__.columns]
+
+
+def _epoch(value: datetime) -> float:
+    """UTC epoch seconds; naive datetimes are taken to be UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _decay() -> float:
+    return 1.0 - settings.DEVICE_TREND_ALPHA
+
+
+def mean_std(state: Any, prefix: str) -> Optional[tuple]:
+    """Exponentially weighted mean and standard deviation of a tracked field."""
+    weight = getattr(state, f"{prefix}_weight")
+    if not getattr(state, f"{prefix}_count") or weight <= 0:
+        return None
+    mean = getattr(state, f"{prefix}_sum") / weight
+    variance = getattr(state, f"{prefix}_sum_sq") / weight - mean * mean
+    return mean, math.sqrt(max(variance, 0.0))
+
+
+def battery_slope(state: Any) -> Optional[float]:
+    """Weighted least-squares slope of battery level per day, or None if too few days."""
+    weight = state.battery_weight
+    if state.battery_count < 2 or weight <= 0:
+        return None
+    mean_day = state.battery_day_sum / weight
+    day_variance = state.battery_day_sum_sq / weight - mean_day * mean_day
+    if day_variance < MIN_SLOPE_SPREAD_DAYS ** 2:
+        return None
+    covariance = state.battery_day_product_sum / weight - mean_day * state.battery_sum / weight
+    return covariance / day_variance
+
+
+def observe(state: DeviceStats, created_at: datetime, values: Dict[str, Optional[float]]) -> List[Dict[str, Any]]:
+    """Fold one transmission into a device's statistics; return its anomalies.
+
+    Readings are judged against the statistics before they are added, so a
+    sudden jump stands out instead of pulling the baseline along with it.
+    """
+    decay = _decay()
+    anomalies = []
+    if state.first_seen_at is None:
+        state.first_seen_at = created_at
+    state.last_seen_at = created_at
+    state.transmission_count += 1
+
+    for prefix, field in TREND_FIELDS.items():
+        value = values.get(field)
+        if value is None:
+            continue
+        baseline = mean_std(state, prefix)
+        if baseline is not None and getattr(state, f"{prefix}_count") >= settings.DEVICE_TREND_MIN_SAMPLES:
+            mean, std = baseline
+            std = max(std, settings.DEVICE_TREND_MIN_RELATIVE_STD * abs(mean))
+            z = (value - mean) / std if std > 0 else 0.0
+            # Impedance drifts either way; only a falling battery is a concern
+            if abs(z) >= settings.DEVICE_TREND_Z_THRESHOLD and (prefix == "impedance" or z < 0):
+                anomalies.append({
+                    "type": f"{prefix}_shift", "field": field, "value": value,
+                    "expected": round(mean, 3), "z": round(z, 2),
+                })
+
+        setattr(state, f"{prefix}_count", getattr(state, f"{prefix}_count") + 1)
+        setattr(state, f"{prefix}_weight", decay * getattr(state, f"{prefix}_weight") + 1.0)
+        setattr(state, f"{prefix}_sum", decay * getattr(state, f"{prefix}_sum") + value)
+        setattr(state, f"{prefix}_sum_sq", decay * getattr(state, f"{prefix}_sum_sq") + value * value)
+        if prefix == "battery":
+            day = (_epoch(created_at) - _epoch(state.first_seen_at)) / _SECONDS_PER_DAY
+            state.battery_day_sum = decay * state.battery_day_sum + day
+            state.battery_day_sum_sq = decay * state.battery_day_sum_sq + day * day
+            state.battery_day_product_sum = decay * state.battery_day_product_sum + day * value
+
+    if values.get("battery_level") is not None and state.battery_count >= settings.DEVICE_TREND_MIN_SAMPLES:
+        slope = battery_slope(state)
+        if slope is not None and slope <= settings.DEVICE_TREND_BATTERY_SLOPE_PER_DAY:
+            anomalies.append({
+                "type": "battery_depletion", "field": "battery_level",
+                "value": values["battery_level"], "slope_per_day": round(slope, 4),
+            })
+    return anomalies
+
+
+def record_transmissions(db: Session, transmissions: Iterable[Any]) -> None:
+    """Fold newly inserted transmissions into their devices' statistics.
+
+    Takes rows carrying ``id``, ``device_serial``, ``created_at`` and the
+    tracked fields (e.g. from RETURNING), in ingest order. Anomalies are
+    written to the transmissions' ``trend_anomalies``. Runs inside the
+    caller's transaction; device rows are locked on PostgreSQL so concurrent
+    ingests for one device apply one after the other.
+    """
+    transmissions = sorted((t for t in transmissions if t.device_serial), key=lambda t: t.id)
+    if not transmissions:
+        return
+    serials = sorted({t.device_serial for t in transmissions})
+    known = set(db.scalars(select(DeviceStats.device_serial).where(DeviceStats.device_serial.in_(serials))))
+    for serial in serials:
+        if serial in known:
+            continue
+        try:
+            with db.begin_nested():
+                db.execute(insert(DeviceStats).values(device_serial=serial))
+        except IntegrityError:
+            # A concurrent ingest created the row first
+            pass
+    states = {
+        state.device_serial: state for state in db.scalars(
+            select(DeviceStats).where(DeviceStats.device_serial.in_(serials))
+            .order_by(DeviceStats.device_serial).with_for_update()
+            .execution_options(populate_existing=True)
+        )
+    }
+
+    flagged = []
+    for t in transmissions:
+        values = {field: getattr(t, field) for field in TREND_FIELDS.values()}
+        anomalies = observe(states[t.device_serial], t.created_at, values)
+        if anomalies:
+            flagged.append({"row_id": t.id, "anomalies": anomalies})
+    db.flush()
+    if flagged:
+        table = Transmission.__table__
+        db.execute(
+            update(table).where(table.c.id == bindparam("row_id"))
+            .values(trend_anomalies=bindparam("anomalies")),
+            flagged,
+        )
+
+
+def _fold_chunk(rows: Sequence[Any], carry: Optional[Dict[str, Any]], decay: float) -> List[Dict[str, Any]]:
+    """Per-device states of a chunk of history sorted by device and time.
+
+    The closed form of the ingest recurrences: an observation followed by
+    ``k`` more of the same field carries weight ``decay ** k``, so each sum
+    is a single weighted bincount over the chunk. ``carry`` is the state of
+    the device the previous chunk ended with, merged in if it continues.
+    The last state returned may continue into the next chunk.
+    """
+    serials, created, battery, impedance = zip(*rows)
+    serial_array = np.array(serials, dtype=object)
+    timestamps = np.fromiter((_epoch(value) for value in created), dtype=np.float64, count=len(rows))
+    new_group = np.concatenate(([True], serial_array[1:] != serial_array[:-1]))
+    starts = np.flatnonzero(new_group)
+    ends = np.concatenate((starts[1:], [len(rows)]))
+    groups = np.cumsum(new_group) - 1
+    group_count = len(starts)
+
+    continues = carry is not None and carry["device_serial"] == serials[0]
+    first_seen = timestamps[starts]
+    if continues:
+        first_seen[0] = _epoch(carry["first_seen_at"])
+
+    states = [
+        {
+            **{key: 0.0 for key in _STATE_COLUMNS},
+            "device_serial": serials[start],
+            "first_seen_at": created[start],
+            "last_seen_at": created[end - 1],
+            "transmission_count": int(end - start),
+        }
+        for start, end in zip(starts.tolist(), ends.tolist())
+    ]
+    for prefix, column in (("battery", battery), ("impedance", impedance)):
+        values = np.array(column, dtype=np.float64)
+        present = ~np.isnan(values)
+        g, x = groups[present], values[present]
+        counts = np.bincount(g, minlength=group_count)
+        rank = np.arange(len(g)) - np.searchsorted(g, g)
+        weights = decay ** (counts[g] - 1 - rank)
+        sums = {
+            "count": counts,
+            "weight": np.bincount(g, weights, group_count),
+            "sum": np.bincount(g, weights * x, group_count),
+            "sum_sq": np.bincount(g, weights * x * x, group_count),
+        }
+        if prefix == "battery":
+            days = (timestamps[present] - first_seen[g]) / _SECONDS_PER_DAY
+            sums["day_sum"] = np.bincount(g, weights * days, group_count)
+            sums["day_sum_sq"] = np.bincount(g, weights * days * days, group_count)
+            sums["day_product_sum"] = np.bincount(g, weights * days * x, group_count)
+        for name, totals in sums.items():
+            for state, total in zip(states, totals.tolist()):
+                state[f"{prefix}_{name}"] = total
+        if continues:
+            # Earlier observations decay once per observation in this chunk
+            factor = decay ** int(counts[0])
+            state = states[0]
+            for name in sums:
+                key = f"{prefix}_{name}"
+                state[key] += carry[key] if name == "count" else factor * carry[key]
+
+    if continues:
+        states[0]["first_seen_at"] = carry["first_seen_at"]
+        states[0]["transmission_count"] += carry["transmission_count"]
+    elif carry is not None:
+        states.insert(0, carry)
+    return states
+
+
+def rebuild_device_stats(db: Session, batch_size: Optional[int] = None) -> int:
+    """Recompute every device's statistics from the transmissions table and its archive.
+
+    Streams the history ordered by device and time and folds each chunk with
+    NumPy; the result matches replaying every ingest. Transmissions' existing
+    ``trend_anomalies`` are left as flagged. Returns the number of devices.
+    """
+    batch_size = batch_size or settings.EXPORT_BATCH_SIZE
+    decay = _decay()
+    db.execute(delete(DeviceStats))
+
+    history = union_all(*(
+        select(model.device_serial, model.created_at, model.battery_level, model.impedance, model.id)
+        .where(model.device_serial.is_not(None))
+        for model in (Transmission, TransmissionArchive)
+    )).subquery()
+    result = db.execute(
+        select(history.c.device_serial, history.c.created_at, history.c.battery_level, history.c.impedance)
+        .order_by(history.c.device_serial, history.c.created_at, history.c.id)
+        .execution_options(yield_per=batch_size)
+    )
+    devices = 0
+    carry = None
+    for rows in result.partitions():
+        states = _fold_chunk(rows, carry, decay)
+        carry = states.pop()
+        if states:
+            db.execute(insert(DeviceStats), states)
+            devices += len(states)
+    if carry is not None:
+        db.execute(insert(DeviceStats), [carry])
+        devices += 1
+    db.commit()
+    return devices
@@ -0,0 +1,114 @@
+import csv
+import heapq
+import io
+import json
+from datetime import date, datetime
+from itertools import islice
+from typing import Any, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.sql import Select
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.patient import Patient
+from ..models.transmission import Transmission, TransmissionArchive
+from ..schemas.transmission import Transmission as TransmissionSchema
+
+# The public response fields only; internal columns (leases, idempotency keys) stay out
+EXPORT_FIELDS = list(TransmissionSchema.model_fields)
+_CREATED_AT, _ID = EXPORT_FIELDS.index("created_at"), EXPORT_FIELDS.index("id")
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def export_queries(
+    patient_id: Optional[int] = None,
+    clinic_id: Optional[int] = None,
+    alert_level: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+) -> List[Select]:
+    """Build the column-only export queries, oldest first, for the live table and the archive.
+
+    Each tier is read in its (created_at, id) index order and the two are
+    merged by stream_export, so neither needs a sort over the combined rows.
+    """
+    queries = []
+    for model in (Transmission, TransmissionArchive):
+        query = select(*(getattr(model, name) for name in EXPORT_FIELDS))
+        if patient_id:
+            query = query.where(model.patient_id == patient_id)
+        if clinic_id:
+            query = query.join(Patient, Patient.id == model.patient_id).where(Patient.clinic_id == clinic_id)
+        if alert_level:
+            query = query.where(model.alert_level == alert_level)
+        if start:
+            query = query.where(model.created_at >= start)
+        if end:
+            query = query.where(model.created_at < end)
+        queries.append(query.order_by(model.created_at, model.id))
+    return queries
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _csv_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=_json_default)
+    return value
+
+
+def _batches(rows: Iterator[Any], size: int) -> Iterator[List[Any]]:
+    while True:
+        batch = list(islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+def stream_export(statements: List[Select], export_format: str) -> Iterator[bytes]:
+    """Yield an export as CSV or NDJSON, one encoded batch of rows at a time.
+
+    Each statement is read from a server-side cursor in batches of
+    EXPORT_BATCH_SIZE, and the tiers are merged by (created_at, id). Rows are
+    written out without building ORM objects, so memory stays flat however
+    many rows match. The generator owns its session because it keeps reading
+    after the endpoint has returned.
+    """
+    db = SessionLocal()
+    try:
+        results = [
+            db.execute(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+            for statement in statements
+        ]
+        merged = heapq.merge(*results, key=lambda row: (row[_CREATED_AT], row[_ID]))
+        batches = _batches(merged, settings.EXPORT_BATCH_SIZE)
+        if export_format == "csv":
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(EXPORT_FIELDS)
+            for rows in batches:
+                writer.writerows([_csv_value(value) for value in row] for row in rows)
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+            if buffer.tell():
+                yield buffer.getvalue().encode()
+        else:
+            for rows in batches:
+                yield "".join(
+                    json.dumps(dict(zip(EXPORT_FIELDS, row)), default=_json_default) + "\n"
+                    for row in rows
+                ).encode()
+    finally:
+        db.close()
@@ -0,0 +1,53 @@
+import threading
+from typing import Dict, Optional
+
+from ..core.cache import MemoryCacheBackend
+from ..core.config import settings
+from ..schemas.transmission import Transmission
+
+
+class IngestDeduplicator:
+    """Recently created transmissions, consulted before a create touches the database.
+
+    An LRU of recent records, keyed by transmission id and idempotency key,
+    answers most retries without a query. It is per worker and only a
+    shortcut: everything else goes to the insert, whose unique indexes
+    (and archive check) stay authoritative.
+    """
+
+    def __init__(self, cache_size: int, ttl: int):
+        self.records = MemoryCacheBackend(max_size=cache_size)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self.counters: Dict[str, int] = dict.fromkeys(("cache_replays", "database_replays", "conflicts"), 0)
+
+    @staticmethod
+    def _name(kind: str, value: str) -> str:
+        return f"{kind}:{value}"
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self.counters[counter] += 1
+
+    def recall(self, kind: str, value: str) -> Optional[Transmission]:
+        """The cached record stored under a transmission id or key, if any."""
+        cached = self.records.get(self._name(kind, value))
+        return Transmission.model_validate_json(cached) if cached is not None else None
+
+    def remember(self, record: Transmission, idempotency_key: Optional[str] = None) -> None:
+        data = record.model_dump_json()
+        names = [self._name("transmission_id", record.transmission_id)]
+        if idempotency_key is not None:
+            names.append(self._name("key", idempotency_key))
+        for name in names:
+            self.records.set(name, data, self.ttl)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.counters)
+
+
+ingest_dedup = IngestDeduplicator(
+    cache_size=settings.INGEST_DEDUP_CACHE_SIZE,
+    ttl=settings.INGEST_DEDUP_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,477 @@
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import Float, bindparam, func, literal_column, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.versions import versions_query
+from ..models.patient import Patient
+
+FTS_TABLE = "patient_search"
+# FTS5 column filter for free-text terms, which must not match clinic tokens
+TEXT_COLUMNS = "{mrn first_name last_name phone email}: "
+TRIGRAM_INDEX = "ix_patients_search_trgm"
+
+# Phone numbers are indexed and matched as bare digits
+_PHONE_PUNCTUATION = ("-", " ", "(", ")", "+", ".")
+
+
+def normalize(value: str) -> str:
+    """Lowercase and strip accents, so "José" matches "jose"."""
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def tokenize(value: Optional[str]) -> List[str]:
+    """Split text into search terms the same way FTS5's unicode61 tokenizer does."""
+    return re.findall(r"\w+", normalize(value)) if value else []
+
+
+def phone_digits(value: Optional[str]) -> str:
+    return re.sub(r"\D", "", value) if value else ""
+
+
+def max_edits(term: str) -> int:
+    """Typos tolerated in a term: none for short terms, more for longer ones."""
+    if len(term) < 4:
+        return 0
+    return 1 if len(term) < 8 else 2
+
+
+class TokenTrie:
+    """Prefix tree of search terms, each optionally carrying a set of ids.
+
+    Supports prefix lookup and bounded edit-distance (typo) lookup by walking
+    the tree with a Levenshtein row per node, pruning branches whose best
+    distance already exceeds the budget.
+    """
+
+    __slots__ = ("root",)
+
+    def __init__(self):
+        self.root: dict = {}
+
+    def insert(self, term: str, item: Optional[int] = None) -> None:
+        node = self.root
+        for ch in term:
+            node = node.setdefault(ch, {})
+        items = node.setdefault(None, set())
+        if item is not None:
+            items.add(item)
+
+    def _collect(self, node: dict, prefix: str, out: Dict[str, Set[int]]) -> None:
+        stack = [(node, prefix)]
+        while stack:
+            node, prefix = stack.pop()
+            for ch, child in node.items():
+                if ch is None:
+                    out[prefix] = child
+                else:
+                    stack.append((child, prefix + ch))
+
+    def prefix(self, prefix: str) -> Dict[str, Set[int]]:
+        """Terms starting with prefix, mapped to their ids."""
+        node = self.root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return {}
+        out: Dict[str, Set[int]] = {}
+        self._collect(node, prefix, out)
+        return out
+
+    def fuzzy(self, term: str, edits: int) -> Dict[str, Set[int]]:
+        """Terms within ``edits`` edits of term, mapped to their ids.
+
+        Edits are insertions, deletions, substitutions and transpositions of
+        adjacent characters ("jonh" is one edit from "john").
+        """
+        out: Dict[str, Set[int]] = {}
+        if edits <= 0:
+            node = self.root
+            for ch in term:
+                node = node.get(ch)
+                if node is None:
+                    return out
+            if None in node:
+                out[term] = node[None]
+            return out
+        first_row = list(range(len(term) + 1))
+        stack = [
+            (child, ch, ch, first_row, None) for ch, child in self.root.items() if ch is not None
+        ]
+        while stack:
+            node, ch, word, previous, before_previous = stack.pop()
+            row = [previous[0] + 1]
+            for i in range(1, len(term) + 1):
+                cost = min(
+                    row[i - 1] + 1,
+                    previous[i] + 1,
+                    previous[i - 1] + (term[i - 1] != ch),
+                )
+                if (
+                    before_previous is not None and i > 1
+                    and term[i - 1] == word[-2] and term[i - 2] == ch
+                ):
+                    cost = min(cost, before_previous[i - 2] + 1)
+                row.append(cost)
+            if row[-1] <= edits and None in node:
+                out[word] = node[None]
+            if min(row) <= edits:
+                for next_ch, child in node.items():
+                    if next_ch is not None:
+                        stack.append((child, next_ch, word + next_ch, row, previous))
+        return out
+
+
+class PatientSearch:
+    """Interface for patient search backends."""
+
+    name = "base"
+
+    def search(self, db: Session, q: str, clinic_id: Optional[int], limit: int) -> List[int]:
+        """Ids of active patients matching q, best match first."""
+        raise NotImplementedError
+
+    def warm(self, bind) -> None:
+        """Start loading any in-memory state in the background."""
+
+
+def _search_terms(q: str) -> Tuple[List[str], str]:
+    """The query's terms, and its digits when it looks like a phone number."""
+    digits = phone_digits(q)
+    compact = re.sub(r"[\s\-().+]", "", q)
+    return tokenize(q), digits if compact.isdigit() and len(digits) >= 3 else ""
+
+
+class TrigramPatientSearch(PatientSearch):
+    """PostgreSQL pg_trgm search over a GIN-indexed search document.
+
+    ``word_similarity`` scores how well the query matches some extent of the
+    document, which covers prefixes as well as misspellings.
+    """
+
+    name = "trigram"
+
+    # Must match the expression of the ix_patients_search_trgm index
+    DOCUMENT = (
+        "lower(patients.patient_id || ' ' || patients.first_name || ' ' || patients.last_name"
+        " || ' ' || coalesce(patients.email, '')"
+        " || ' ' || regexp_replace(coalesce(patients.phone, ''), '\\D', '', 'g'))"
+    )
+
+    def search(self, db: Session, q: str, clinic_id: Optional[int], limit: int) -> List[int]:
+        terms, digits = _search_terms(q)
+        query = digits or " ".join(terms)
+        if not query:
+            return []
+        db.execute(
+            text("SELECT set_config('pg_trgm.word_similarity_threshold', :threshold, true)"),
+            {"threshold": str(settings.PATIENT_SEARCH_MIN_SIMILARITY)},
+        )
+        document = literal_column(self.DOCUMENT)
+        term = bindparam("q", query)
+        statement = (
+            select(Patient.id)
+            .where(document.op("%>")(term), Patient.is_active.is_(True))
+            .order_by(func.word_similarity(term, document, type_=Float).desc(), Patient.id)
+            .limit(limit)
+        )
+        if clinic_id is not None:
+            statement = statement.where(Patient.clinic_id == clinic_id)
+        return list(db.scalars(statement))
+
+
+class VocabularyCache:
+    """Name terms for typo expansion, reloaded in the background when stale.
+
+    Background reloads always use the sync engine given to
+    refresh_in_background() at warm-up, never a request session's bind,
+    which is the async engine's sync facade when DATABASE_ASYNC is on.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._trie: Optional[TokenTrie] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._bind = None
+
+    @staticmethod
+    def _load(db: Session) -> TokenTrie:
+        trie = TokenTrie()
+        for column in (Patient.first_name, Patient.last_name):
+            for value in db.scalars(select(column).distinct()):
+                for term in tokenize(value):
+                    trie.insert(term)
+        return trie
+
+    def _refresh(self, bind) -> None:
+        try:
+            with Session(bind) as db:
+                trie = self._load(db)
+            with self._lock:
+                self._trie, self._loaded_at = trie, time.monotonic()
+        finally:
+            self._refreshing = False
+
+    def refresh_in_background(self, bind) -> None:
+        self._bind = bind
+        if not self._refreshing:
+            self._refreshing = True
+            threading.Thread(target=self._refresh, args=(bind,), daemon=True).start()
+
+    def get(self, db: Session) -> TokenTrie:
+        if self._trie is None:
+            with self._lock:
+                if self._trie is None:
+                    self._trie, self._loaded_at = self._load(db), time.monotonic()
+        elif time.monotonic() - self._loaded_at > self.ttl:
+            if self._bind is not None:
+                self.refresh_in_background(self._bind)
+            else:
+                # Never warmed: reload inline on the caller's session
+                trie = self._load(db)
+                with self._lock:
+                    self._trie, self._loaded_at = trie, time.monotonic()
+        return self._trie
+
+    def add(self, values: Iterable[Optional[str]]) -> None:
+        """Make new names searchable by typo before the next reload."""
+        if self._trie is not None:
+            for value in values:
+                for term in tokenize(value):
+                    self._trie.insert(term)
+
+
+class FTS5PatientSearch(PatientSearch):
+    """SQLite FTS5 search with prefix queries and typo expansion.
+
+    Matches are gathered in tiers (all terms exact, then as prefixes, then
+    with name terms expanded to known terms a typo or two away) until the
+    limit is reached. Each tier is read in rowid order, which FTS5 streams,
+    so a broad query stops after ``limit`` rows instead of ranking every
+    match. Clinic scoping is an indexed ``clinic`` token, so it narrows the
+    match inside the full-text index instead of filtering afterwards.
+    """
+
+    name = "fts5"
+
+    def __init__(self):
+        self.vocabulary = VocabularyCache(settings.PATIENT_SEARCH_VOCAB_TTL_SECONDS)
+
+    def warm(self, bind) -> None:
+        self.vocabulary.refresh_in_background(bind)
+
+    @staticmethod
+    def _quote(term: str) -> str:
+        return '"' + term.replace('"', '""') + '"'
+
+    def _term_clause(self, db: Session, term: str, tier: int) -> str:
+        if tier == 0:
+            return TEXT_COLUMNS + self._quote(term)
+        options = [TEXT_COLUMNS + self._quote(term) + "*"]
+        if tier == 2:
+            options += [
+                "{first_name last_name}: " + self._quote(candidate)
+                for candidate in self.vocabulary.get(db).fuzzy(term, max_edits(term))
+                if candidate != term
+            ]
+        return "(" + " OR ".join(options) + ")"
+
+    def match_expression(self, db: Session, q: str, clinic_id: Optional[int], tier: int) -> Optional[str]:
+        """FTS5 query for one tier: 0 exact, 1 prefix, 2 prefix or typo."""
+        terms, digits = _search_terms(q)
+        expression = " AND ".join(self._term_clause(db, term, tier) for term in terms)
+        if digits:
+            phone = "phone: " + self._quote(digits) + "*"
+            expression = f"({expression}) OR {phone}" if expression else phone
+        if not expression:
+            return None
+        if clinic_id is not None:
+            return f"clinic: {self._quote(f'c{clinic_id}')} AND ({expression})"
+        return expression
+
+    def search(self, db: Session, q: str, clinic_id: Optional[int], limit: int) -> List[int]:
+        ids: List[int] = []
+        seen: Set[int] = set()
+        for tier in range(3):
+            expression = self.match_expression(db, q, clinic_id, tier)
+            if expression is None:
+                break
+            rows = db.scalars(text(
+                f"SELECT s.rowid FROM {FTS_TABLE} AS s JOIN patients AS p ON p.id = s.rowid"
+                f" WHERE {FTS_TABLE} MATCH :expression AND p.is_active LIMIT :limit"
+            ), {"expression": expression, "limit": limit + len(ids)})
+            for id_ in rows:
+                if id_ not in seen:
+                    seen.add(id_)
+                    ids.append(id_)
+            if len(ids) >= limit:
+                break
+        return ids[:limit]
+
+
+class MemoryPatientSearch(PatientSearch):
+    """In-process trie index over all patients, for databases without full-text search.
+
+    Rebuilt whenever the patients table's change counter moves, so it stays
+    consistent across workers; intended for small deployments.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version: Optional[list] = None
+        self._terms = TokenTrie()
+        self._phones = TokenTrie()
+        self._clinics: Dict[int, Optional[int]] = {}
+
+    def _rebuild(self, db: Session) -> None:
+        terms, phones, clinics = TokenTrie(), TokenTrie(), {}
+        rows = db.execute(select(
+            Patient.id, Patient.patient_id, Patient.first_name, Patient.last_name,
+            Patient.email, Patient.phone, Patient.clinic_id
+        ).where(Patient.is_active.is_(True)))
+        for id_, mrn, first_name, last_name, email, phone, clinic_id in rows:
+            for value in (mrn, first_name, last_name, email):
+                for term in tokenize(value):
+                    terms.insert(term, id_)
+            if phone:
+                phones.insert(phone_digits(phone), id_)
+            clinics[id_] = clinic_id
+        self._terms, self._phones, self._clinics = terms, phones, clinics
+
+    def search(self, db: Session, q: str, clinic_id: Optional[int], limit: int) -> List[int]:
+        version = list(db.scalars(versions_query(Patient.__tablename__)))
+        with self._lock:
+            if version != self._version:
+                self._rebuild(db)
+                self._version = version
+            terms, phones, clinics = self._terms, self._phones, self._clinics
+
+        query_terms, digits = _search_terms(q)
+        scores: Dict[int, float] = defaultdict(float)
+        matched: Optional[Set[int]] = None
+        for term in query_terms:
+            term_scores: Dict[int, float] = {}
+            for found, ids in terms.fuzzy(term, max_edits(term)).items():
+                for id_ in ids:
+                    term_scores[id_] = max(term_scores.get(id_, 0), 3 if found == term else 1)
+            for found, ids in terms.prefix(term).items():
+                for id_ in ids:
+                    term_scores[id_] = max(term_scores.get(id_, 0), 3 if found == term else 2)
+            matched = set(term_scores) if matched is None else matched & term_scores.keys()
+            for id_, score in term_scores.items():
+                scores[id_] += score
+        results = matched or set()
+        if digits:
+            for ids in phones.prefix(digits).values():
+                results |= ids
+                for id_ in ids:
+                    scores[id_] += 3
+        if clinic_id is not None:
+            results = {id_ for id_ in results if clinics.get(id_) == clinic_id}
+        return sorted(results, key=lambda id_: (-scores[id_], id_))[:limit]
+
+
+def fts5_available() -> bool:
+    """Whether the linked SQLite library was built with FTS5."""
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def resolve_backend(backend: str, database_url: str) -> str:
+    """Pick the search backend; ``auto`` uses the database's own full-text support."""
+    if backend != "auto":
+        return backend
+    if database_url.startswith("postgresql"):
+        return "trigram"
+    if database_url.startswith("sqlite") and fts5_available():
+        return "fts5"
+    return "memory"
+
+
+def _phone_sql(column: str) -> str:
+    for ch in _PHONE_PUNCTUATION:
+        column = f"replace({column}, '{ch}', '')"
+    return column
+
+
+def _fts_values(row: str) -> str:
+    """SQL for the indexed values of a patients row, matching tokenize/phone_digits."""
+    phone = _phone_sql("coalesce(%s.phone, '')" % row)
+    return (
+        f"{row}.id, {row}.patient_id, {row}.first_name, {row}.last_name, {phone},"
+        f" coalesce({row}.email, ''), 'c' || coalesce({row}.clinic_id, 0)"
+    )
+
+
+_FTS_COLUMNS = "rowid, mrn, first_name, last_name, phone, email, clinic"
+
+# Contentless FTS5 index kept in sync with patients by triggers
+SQLITE_DDL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "mrn, first_name, last_name, phone, email, clinic,"
+    " content='', tokenize='unicode61 remove_diacritics 2', prefix='2 3')",
+    f"CREATE TRIGGER IF NOT EXISTS patients_search_insert AFTER INSERT ON patients BEGIN"
+    f" INSERT INTO {FTS_TABLE}({_FTS_COLUMNS}) VALUES ({_fts_values('new')}); END",
+    f"CREATE TRIGGER IF NOT EXISTS patients_search_delete AFTER DELETE ON patients BEGIN"
+    f" INSERT INTO {FTS_TABLE}({FTS_TABLE}, {_FTS_COLUMNS}) VALUES ('delete', {_fts_values('old')}); END",
+    f"CREATE TRIGGER IF NOT EXISTS patients_search_update AFTER UPDATE ON patients BEGIN"
+    f" INSERT INTO {FTS_TABLE}({FTS_TABLE}, {_FTS_COLUMNS}) VALUES ('delete', {_fts_values('old')});"
+    f" INSERT INTO {FTS_TABLE}({_FTS_COLUMNS}) VALUES ({_fts_values('new')}); END",
+)
+SQLITE_BACKFILL = (
+    f"INSERT INTO {FTS_TABLE}({_FTS_COLUMNS}) SELECT {_fts_values('patients')} FROM patients"
+)
+
+POSTGRES_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    f"CREATE INDEX IF NOT EXISTS {TRIGRAM_INDEX} ON patients"
+    f" USING gin (({TrigramPatientSearch.DOCUMENT}) gin_trgm_ops)",
+)
+
+
+def create_search_index(connection: Connection, backend: str) -> None:
+    """Create the database objects a search backend needs, backfilling new indexes."""
+    if backend == "fts5":
+        exists = connection.execute(text(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"
+        ), {"name": FTS_TABLE}).first()
+        for statement in SQLITE_DDL:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text(SQLITE_BACKFILL))
+    elif backend == "trigram":
+        for statement in POSTGRES_DDL:
+            connection.execute(text(statement))
+
+
+def is_search_object(name: str) -> bool:
+    """Whether a table or index belongs to a search backend rather than the models."""
+    return name == TRIGRAM_INDEX or name == FTS_TABLE or name.startswith(FTS_TABLE + "_")
+
+
+SEARCH_BACKENDS = {
+    "trigram": TrigramPatientSearch,
+    "fts5": FTS5PatientSearch,
+    "memory": MemoryPatientSearch,
+}
+
+search_backend_name = resolve_backend(settings.PATIENT_SEARCH_BACKEND, settings.DATABASE_URL)
+if search_backend_name not in SEARCH_BACKENDS:
+    raise ValueError(f"Unknown patient search backend: {search_backend_name}")
+patient_search: PatientSearch = SEARCH_BACKENDS[search_backend_name]()
@@ -0,0 +1,295 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+from sqlalchemy import func, or_, select, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.session import SessionLocal
+from ..models.patient import Patient
+from ..models.transmission import Transmission
+from . import stats as stats_service
+from .alert_rules import alert_engine
+from .alert_stream import alert_hub, transmission_event
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessingMetrics:
+    """Throughput counters for the workers running in this process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.monotonic()
+        self.processed = 0
+        self.escalated = 0
+        self.batches = 0
+        self.errors = 0
+        self.last_batch_size = 0
+        self.last_batch_seconds = 0.0
+
+    def record_batch(self, size: int, escalated: int, seconds: float) -> None:
+        with self._lock:
+            self.processed += size
+            self.escalated += escalated
+            self.batches += 1
+            self.last_batch_size = size
+            self.last_batch_seconds = seconds
+
+    def record_error(self) -> None:
+        with self._lock:
+            self.errors += 1
+
+    def as_dict(self) -> dict:
+        with self._lock:
+            elapsed = time.monotonic() - self.started_at
+            return {
+                "processed": self.processed,
+                "escalated": self.escalated,
+                "batches": self.batches,
+                "errors": self.errors,
+                "last_batch_size": self.last_batch_size,
+                "last_batch_ms": round(self.last_batch_seconds * 1000, 2),
+                "processed_per_second": round(self.processed / elapsed, 2) if elapsed else 0.0,
+            }
+
+
+processing_metrics = ProcessingMetrics()
+
+
+def _claimable():
+    """Unprocessed transmissions with no live lease."""
+    now = datetime.now(timezone.utc)
+    return (
+        Transmission.processed.is_(False),
+        or_(Transmission.lease_expires_at.is_(None), Transmission.lease_expires_at < now),
+    )
+
+
+def claim_batch(db: Session, owner: str, batch_size: int, lease_seconds: int) -> List[int]:
+    """Lease up to batch_size unprocessed transmissions to owner.
+
+    On PostgreSQL candidate rows are locked with ``FOR UPDATE SKIP LOCKED`` so
+    concurrent workers claim disjoint batches without waiting on each other.
+    SQLite serialises writers, so there the UPDATE re-checks that the rows
+    are still claimable and the batch is read back by owner. Neither issues
+    an UPDATE when nothing is waiting. Leases expire, letting another worker pick up rows from a crashed one.
+    """
+    expires_at = datetime.now(timezone.utc) + timedelta(seconds=lease_seconds)
+    candidates = (
+        select(Transmission.id)
+        .where(*_claimable())
+        .order_by(Transmission.created_at, Transmission.id)
+        .limit(batch_size)
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        ids = list(db.scalars(candidates.with_for_update(skip_locked=True)))
+        if ids:
+            db.execute(
+                update(Transmission).where(Transmission.id.in_(ids))
+                .values(lease_owner=owner, lease_expires_at=expires_at)
+            )
+        db.commit()
+        return ids
+
+    ids = list(db.scalars(candidates))
+    if not ids:
+        db.commit()
+        return []
+    db.execute(
+        update(Transmission)
+        .where(Transmission.id.in_(ids), *_claimable())
+        .values(lease_owner=owner, lease_expires_at=expires_at),
+        execution_options={"synchronize_session": False},
+    )
+    db.commit()
+    return list(db.scalars(
+        select(Transmission.id).where(
+            Transmission.lease_owner == owner, Transmission.processed.is_(False)
+        ).order_by(Transmission.id)
+    ))
+
+
+def analyze_transmissions(
+    db: Session, transmissions: List[Transmission], clinic_ids: Dict[int, Optional[int]]
+) -> List[Transmission]:
+    """Run server-side analysis over a claimed batch; return the escalated rows.
+
+    Alert rules are re-evaluated so rows created before a rule change, or
+    edited since ingest, pick up the current thresholds. Levels only go up,
+    and levels staff set by hand are kept.
+    ``clinic_ids`` maps patient id to clinic id.
+    """
+    if alert_engine is None or not transmissions:
+        return []
+    columns = [column.key for column in Transmission.__table__.columns]
+    rows = [{key: getattr(t, key) for key in columns} for t in transmissions]
+    alert_engine.apply(rows, [clinic_ids.get(t.patient_id) for t in transmissions])
+
+    escalated = []
+    for transmission, row in zip(transmissions, rows):
+        if row["alert_level"] == transmission.alert_level:
+            continue
+        before = stats_service.snapshot(transmission)
+        transmission.alert_level = row["alert_level"]
+        transmission.alert_rule = row["alert_rule"]
+        stats_service.record_transmissions(db, [before], delta=-1)
+        stats_service.record_transmissions(db, [transmission])
+        escalated.append(transmission)
+    return escalated
+
+
+def process_batch(db: Session, owner: str, ids: List[int]) -> int:
+    """Analyse leased transmissions and mark them processed."""
+    started = time.perf_counter()
+    transmissions = list(db.scalars(
+        select(Transmission).where(
+            Transmission.id.in_(ids), Transmission.lease_owner == owner
+        ).order_by(Transmission.id)
+    ))
+    clinic_ids = dict(db.execute(
+        select(Patient.id, Patient.clinic_id).where(
+            Patient.id.in_({t.patient_id for t in transmissions})
+        )
+    ).all())
+    escalated = analyze_transmissions(db, transmissions, clinic_ids)
+    events = [
+        transmission_event(t, clinic_ids.get(t.patient_id), "escalated") for t in escalated
+    ]
+    for transmission in transmissions:
+        transmission.processed = True
+        transmission.lease_owner = None
+        transmission.lease_expires_at = None
+    db.commit()
+    alert_hub.publish(events)
+    processing_metrics.record_batch(
+        len(transmissions), len(escalated), time.perf_counter() - started
+    )
+    return len(transmissions)
+
+
+def get_backlog(db: Session) -> dict:
+    """Size and age of the unprocessed backlog."""
+    count, oldest = db.execute(
+        select(func.count(Transmission.id), func.min(Transmission.created_at))
+        .where(Transmission.processed.is_(False))
+    ).one()
+    lag = None
+    if oldest is not None:
+        if oldest.tzinfo is None:
+            oldest = oldest.replace(tzinfo=timezone.utc)
+        lag = max((datetime.now(timezone.utc) - oldest).total_seconds(), 0.0)
+    return {"unprocessed": count, "lag_seconds": lag}
+
+
+class BacklogMonitor:
+    """get_backlog, queried at most once per ``ttl`` seconds however often it is read."""
+
+    def __init__(self, ttl: float, session_factory: Callable[[], Session] = SessionLocal):
+        self.ttl = ttl
+        self.session_factory = session_factory
+        self._lock = threading.Lock()
+        self._backlog: Optional[dict] = None
+        self._checked_at = 0.0
+
+    def get(self) -> dict:
+        with self._lock:
+            if self._backlog is None or time.monotonic() - self._checked_at >= self.ttl:
+                db = self.session_factory()
+                try:
+                    self._backlog = get_backlog(db)
+                finally:
+                    db.close()
+                self._checked_at = time.monotonic()
+            return self._backlog
+
+
+backlog_monitor = BacklogMonitor(settings.METRICS_BACKLOG_CACHE_SECONDS)
+
+
+class TransmissionWorker:
+    """Claims and processes batches of unprocessed transmissions."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        batch_size: Optional[int] = None,
+        lease_seconds: Optional[int] = None,
+        poll_interval: Optional[float] = None,
+    ):
+        self.session_factory = session_factory
+        self.batch_size = batch_size or settings.PROCESSING_BATCH_SIZE
+        self.lease_seconds = lease_seconds or settings.PROCESSING_LEASE_SECONDS
+        self.poll_interval = poll_interval or settings.PROCESSING_POLL_INTERVAL
+        self.owner = f"{os.getpid()}-{uuid.uuid4().hex[:12]}"
+
+    def run_once(self) -> int:
+        """Claim and process one batch; return the number processed."""
+        db = self.session_factory()
+        try:
+            ids = claim_batch(db, self.owner, self.batch_size, self.lease_seconds)
+            return process_batch(db, self.owner, ids) if ids else 0
+        except Exception:
+            db.rollback()
+            processing_metrics.record_error()
+            raise
+        finally:
+            db.close()
+
+    def drain(self) -> int:
+        """Process batches until nothing is left to claim."""
+        total = 0
+        while True:
+            count = self.run_once()
+            if not count:
+                return total
+            total += count
+
+    def run(self, stop: threading.Event) -> None:
+        """Process until stop is set, sleeping while the backlog is empty."""
+        while not stop.is_set():
+            try:
+                count = self.run_once()
+            except Exception:
+                logger.exception("Transmission processing batch failed")
+                count = 0
+            if not count:
+                stop.wait(self.poll_interval)
+
+
+class LocalWorker:
+    """Runs a TransmissionWorker on a background thread in this process.
+
+    Suitable for development, single-process deployments and tests; use
+    ``run_worker.py`` to process with several dedicated processes.
+    """
+
+    def __init__(self, worker: Optional[TransmissionWorker] = None):
+        self.worker = worker or TransmissionWorker()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self.worker.run, args=(self._stop,), name="transmission-worker", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def drain(self) -> int:
+        """Synchronously process everything currently pending."""
+        return self.worker.drain()
@@ -0,0 +1,99 @@
+import json
+import time
+from typing import Any, Dict
+
+import orjson
+from sqlalchemy import LargeBinary, bindparam, func, select, type_coerce, update
+from sqlalchemy.orm import Session
+
+from ..core.config import settings
+from ..db.types import is_packed, pack_json, unpack_json
+from ..models.transmission import Transmission, TransmissionArchive
+
+FORMATS = ("packed", "json")
+
+_table = Transmission.__table__
+
+
+def _stored(table) -> Any:
+    """raw_data exactly as stored, bypassing PackedJSON's decoding."""
+    return type_coerce(table.c.raw_data, LargeBinary).label("raw_data")
+
+
+_stored_raw_data = _stored(_table)
+
+
+def encode_raw_data(value: Any, target_format: str) -> bytes:
+    if target_format == "json":
+        return orjson.dumps(value)
+    return pack_json(value, settings.RAW_DATA_COMPRESSION_LEVEL)
+
+
+def convert_raw_data(db: Session, target_format: str = "packed", batch_size: int = 1000) -> int:
+    """Rewrite every stored raw_data value not yet in target_format, live and archived.
+
+    Walks each table in id order, one transaction per batch, so it can run
+    alongside the API and be interrupted and resumed. Returns the number of
+    rows rewritten.
+    """
+    if target_format not in FORMATS:
+        raise ValueError(f"Unknown raw_data format: {target_format}")
+    converted = 0
+    for table in (_table, TransmissionArchive.__table__):
+        statement = (
+            update(table).where(table.c.id == bindparam("row_id"))
+            .values(raw_data=type_coerce(bindparam("payload"), LargeBinary))
+        )
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(table.c.id, _stored(table))
+                .where(table.c.id > last_id, table.c.raw_data.is_not(None))
+                .order_by(table.c.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            params = [
+                {"row_id": row.id, "payload": encode_raw_data(unpack_json(row.raw_data), target_format)}
+                for row in rows if is_packed(row.raw_data) != (target_format == "packed")
+            ]
+            if params:
+                db.execute(statement, params)
+            db.commit()
+            converted += len(params)
+    return converted
+
+
+def _time_per_row(decode, payloads) -> float:
+    started = time.perf_counter()
+    for payload in payloads:
+        decode(payload)
+    return (time.perf_counter() - started) / len(payloads)
+
+
+def compare_formats(db: Session, sample_size: int = 1000) -> Dict[str, Any]:
+    """Storage size and decode time of the newest raw_data values in each format."""
+    values = [
+        unpack_json(stored) for stored in db.scalars(
+            select(_stored_raw_data).where(_table.c.raw_data.is_not(None))
+            .order_by(_table.c.id.desc()).limit(sample_size)
+        )
+    ]
+    total = db.scalar(select(func.count()).where(_table.c.raw_data.is_not(None)))
+    if not values:
+        return {"rows": total, "sampled": 0}
+    as_json = [orjson.dumps(value) for value in values]
+    as_packed = [pack_json(value, settings.RAW_DATA_COMPRESSION_LEVEL) for value in values]
+    json_bytes = sum(map(len, as_json))
+    packed_bytes = sum(map(len, as_packed))
+    return {
+        "rows": total,
+        "sampled": len(values),
+        "json_bytes_per_row": json_bytes // len(values),
+        "packed_bytes_per_row": packed_bytes // len(values),
+        "size_ratio": round(packed_bytes / json_bytes, 3),
+        # json.loads is what the JSON column type used to decode with
+        "json_decode_us": round(_time_per_row(json.loads, as_json) * 1e6, 1),
+        "packed_decode_us": round(_time_per_row(unpack_json, as_packed) * 1e6, 1),
+    }
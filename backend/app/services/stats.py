@@ -0,0 +1,191 @@
+import logging
+from collections import Counter
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, NamedTuple, Optional
+
+from sqlalchemy import delete, func, insert, select, union_all, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models.patient import Patient
+from ..models.stats import ActiveDevice, TransmissionDailyStat
+from ..models.transmission import Transmission, TransmissionArchive
+
+logger = logging.getLogger(__name__)
+
+DEVICE_TYPES = ("pacemaker", "icd", "crt", "loop")
+
+
+class StatsFields(NamedTuple):
+    """The transmission fields the rollups are keyed on."""
+    patient_id: int
+    created_at: datetime
+    alert_level: Optional[str]
+    device_type: str
+    device_serial: Optional[str]
+
+
+# Transmission columns to fetch (e.g. via RETURNING) for record_transmissions
+STATS_COLUMNS = tuple(getattr(Transmission, field) for field in StatsFields._fields)
+
+# Tables whose changes can alter get_dashboard_stats
+STATS_TABLES = (
+    Transmission.__tablename__, Patient.__tablename__,
+    TransmissionDailyStat.__tablename__, ActiveDevice.__tablename__,
+)
+
+
+def snapshot(transmission: Any) -> StatsFields:
+    """Capture the rollup-relevant fields of a transmission before it changes."""
+    return StatsFields(*(getattr(transmission, field) for field in StatsFields._fields))
+
+
+def _increment(db: Session, model: Any, key: Dict[str, Any], delta: int) -> None:
+    """Add delta to a counter row, creating it on first use."""
+    statement = update(model).where(
+        *(getattr(model, column) == value for column, value in key.items())
+    ).values(transmission_count=model.transmission_count + delta)
+    if db.execute(statement).rowcount:
+        return
+    if delta < 0:
+        # Only reachable when the rollups have drifted from the rows they count
+        logger.warning(
+            "No %s row for %s to remove %d transmissions from; run rebuild_stats.py",
+            model.__tablename__, key, -delta,
+        )
+        return
+    try:
+        with db.begin_nested():
+            db.execute(insert(model).values(**key, transmission_count=delta))
+    except IntegrityError:
+        # A concurrent writer created the row first
+        db.execute(statement)
+
+
+def record_transmissions(db: Session, transmissions: Iterable[Any], delta: int = 1) -> None:
+    """Add transmissions to the rollups, or remove them with delta=-1.
+
+    Runs inside the caller's transaction so counters commit together with
+    the rows they describe.
+    """
+    transmissions = list(transmissions)
+    if not transmissions:
+        return
+    clinic_ids = dict(db.execute(
+        select(Patient.id, Patient.clinic_id).where(
+            Patient.id.in_({t.patient_id for t in transmissions})
+        )
+    ).all())
+
+    buckets = Counter()
+    devices = Counter()
+    for t in transmissions:
+        buckets[(t.created_at.date(), clinic_ids.get(t.patient_id) or 0, t.alert_level or "", t.device_type)] += delta
+        if t.device_serial:
+            devices[t.device_serial] += delta
+
+    for (day, clinic_id, alert_level, device_type), count in buckets.items():
+        _increment(db, TransmissionDailyStat, {
+            "day": day, "clinic_id": clinic_id,
+            "alert_level": alert_level, "device_type": device_type
+        }, count)
+    for device_serial, count in devices.items():
+        _increment(db, ActiveDevice, {"device_serial": device_serial}, count)
+    if delta < 0:
+        db.execute(delete(ActiveDevice).where(ActiveDevice.transmission_count <= 0))
+
+
+def move_patient(db: Session, patient_id: int, from_clinic_id: Optional[int], to_clinic_id: Optional[int]) -> None:
+    """Move a patient's transmissions, live and archived, between clinic rollups.
+
+    Call when the patient changes clinic, inside the transaction that
+    changes it. Rollups are keyed on the clinic, so without this the old
+    clinic keeps counting the patient's history.
+    """
+    history = union_all(*(
+        select(model.created_at, model.alert_level, model.device_type).where(model.patient_id == patient_id)
+        for model in (Transmission, TransmissionArchive)
+    )).subquery()
+    day = func.date(history.c.created_at)
+    alert_level = func.coalesce(history.c.alert_level, "")
+    buckets = db.execute(
+        select(day, alert_level, history.c.device_type, func.count())
+        .group_by(day, alert_level, history.c.device_type)
+    ).all()
+    for day, alert_level, device_type, count in buckets:
+        if not isinstance(day, date):
+            day = date.fromisoformat(day)
+        key = {"day": day, "alert_level": alert_level, "device_type": device_type}
+        _increment(db, TransmissionDailyStat, {**key, "clinic_id": from_clinic_id or 0}, -count)
+        _increment(db, TransmissionDailyStat, {**key, "clinic_id": to_clinic_id or 0}, count)
+
+
+def get_dashboard_stats(db: Session) -> Dict[str, Any]:
+    """Read dashboard statistics from the rollups."""
+    today = datetime.now().date()
+    totals = db.execute(
+        select(
+            TransmissionDailyStat.alert_level,
+            TransmissionDailyStat.device_type,
+            func.sum(TransmissionDailyStat.transmission_count)
+        ).group_by(TransmissionDailyStat.alert_level, TransmissionDailyStat.device_type)
+    ).all()
+    today_totals = db.execute(
+        select(
+            TransmissionDailyStat.alert_level,
+            func.sum(TransmissionDailyStat.transmission_count)
+        ).where(TransmissionDailyStat.day >= today).group_by(TransmissionDailyStat.alert_level)
+    ).all()
+
+    critical_alerts = 0
+    device_types = dict.fromkeys(DEVICE_TYPES, 0)
+    for alert_level, device_type, count in totals:
+        if alert_level == "critical":
+            critical_alerts += count
+        if device_type in device_types:
+            device_types[device_type] += count
+
+    transmissions_today = sum(count for _, count in today_totals)
+    alerts_today = sum(
+        count for alert_level, count in today_totals if alert_level in ("warning", "critical")
+    )
+
+    total_patients = db.query(Patient).filter(Patient.is_active == True).count()
+    active_devices = db.scalar(select(func.count()).select_from(ActiveDevice))
+
+    return {
+        "totalPatients": total_patients,
+        "activeDevices": active_devices,
+        "alertsToday": alerts_today,
+        "transmissionsToday": transmissions_today,
+        "criticalAlerts": critical_alerts,
+        "deviceTypes": device_types
+    }
+
+
+def rebuild_stats(db: Session) -> None:
+    """Recompute all rollups from the transmissions table and its archive."""
+    db.execute(delete(TransmissionDailyStat))
+    db.execute(delete(ActiveDevice))
+
+    history = union_all(*(
+        select(*(getattr(model, field) for field in StatsFields._fields))
+        for model in (Transmission, TransmissionArchive)
+    )).subquery()
+    day = func.date(history.c.created_at)
+    clinic_id = func.coalesce(Patient.clinic_id, 0)
+    alert_level = func.coalesce(history.c.alert_level, "")
+    db.execute(insert(TransmissionDailyStat).from_select(
+        ["day", "clinic_id", "alert_level", "device_type", "transmission_count"],
+        select(day, clinic_id, alert_level, history.c.device_type, func.count())
+        .select_from(history)
+        .outerjoin(Patient, Patient.id == history.c.patient_id)
+        .group_by(day, clinic_id, alert_level, history.c.device_type)
+    ))
+    db.execute(insert(ActiveDevice).from_select(
+        ["device_serial", "transmission_count"],
+        select(history.c.device_serial, func.count())
+        .where(history.c.device_serial.is_not(None))
+        .group_by(history.c.device_serial)
+    ))
+    db.commit()
@@ -0,0 +1,232 @@
+import fcntl
+import logging
+import os
+import tempfile
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from ..core.config import settings
+from ..models.transmission import Transmission
+
+logger = logging.getLogger(__name__)
+
+# One fixed-size record per transmission; timestamps are UTC epoch seconds
+VITALS_DTYPE = np.dtype([
+    ("ts", "<i8"),
+    ("heart_rate_avg", "<f4"),
+    ("heart_rate_min", "<f4"),
+    ("heart_rate_max", "<f4"),
+    ("battery_level", "<f4"),
+    ("impedance", "<f4"),
+])
+VITAL_FIELDS = VITALS_DTYPE.names[1:]
+
+# Transmission columns to fetch (e.g. via RETURNING) for VitalsStore.append
+VITALS_COLUMNS = (Transmission.device_serial, Transmission.created_at) + tuple(
+    getattr(Transmission, field) for field in VITAL_FIELDS
+)
+
+# How each field is reduced when several records fall into one bucket
+_REDUCERS = {"heart_rate_min": np.fmin, "heart_rate_max": np.fmax}
+
+
+def _epoch(value: datetime) -> int:
+    """UTC epoch seconds; naive datetimes are taken to be UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def _month(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m")
+
+
+def _months_between(start: int, end: int) -> List[str]:
+    first = datetime.fromtimestamp(start, tz=timezone.utc)
+    last = datetime.fromtimestamp(end, tz=timezone.utc)
+    months = []
+    year, month = first.year, first.month
+    while (year, month) <= (last.year, last.month):
+        months.append(f"{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
+class VitalsStore:
+    """Append-only columnar store of per-device vitals.
+
+    Records live in one flat binary file of VITALS_DTYPE per device and
+    calendar month (``<root>/<serial>/<YYYY-MM>.vitals``) and are read back
+    through memory maps, so trend queries only touch the months in range and
+    never load transmission rows. Writers to one device take an exclusive
+    ``flock`` on its ``.lock`` file, so API and worker processes sharing the
+    store never interleave; readers need no lock.
+    """
+
+    def __init__(self, root: str):
+        self.root = Path(root)
+        self._lock = threading.Lock()
+
+    def _device_dir(self, device_serial: str) -> Path:
+        # quote() leaves no separators, but "." and ".." would still name
+        # the root or its parent; escape names made only of dots
+        name = quote(device_serial, safe="")
+        if not name.strip("."):
+            name = name.replace(".", "%2E")
+        return self.root / name
+
+    def _chunk_path(self, device_serial: str, month: str) -> Path:
+        return self._device_dir(device_serial) / f"{month}.vitals"
+
+    @contextmanager
+    def _locked(self, device_serial: str):
+        """Hold the device's write lock across threads and processes."""
+        directory = self._device_dir(device_serial)
+        directory.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(directory / ".lock", "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def record(transmission: Any) -> Optional[Tuple[str, tuple]]:
+        """A transmission's device serial and vitals record, or None without a serial."""
+        if not transmission.device_serial or transmission.created_at is None:
+            return None
+        values = tuple(
+            np.nan if getattr(transmission, field) is None else getattr(transmission, field)
+            for field in VITAL_FIELDS
+        )
+        return transmission.device_serial, (_epoch(transmission.created_at),) + values
+
+    def append(self, transmissions: Iterable[Any]) -> None:
+        """Add the vitals of transmissions that have a device serial."""
+        chunks: Dict[tuple, list] = defaultdict(list)
+        for t in transmissions:
+            entry = self.record(t)
+            if entry is None:
+                continue
+            device_serial, record = entry
+            chunks[(device_serial, _month(record[0]))].append(record)
+
+        for (device_serial, month), records in chunks.items():
+            with self._locked(device_serial):
+                with open(self._chunk_path(device_serial, month), "ab") as f:
+                    f.write(np.array(records, dtype=VITALS_DTYPE).tobytes())
+
+    def _remove(self, device_serial: str, record: tuple) -> None:
+        """Drop one matching record from its chunk; callers hold the device lock.
+
+        The chunk is rewritten to a fresh temporary file and swapped in with a
+        rename, so readers that already mapped the old file keep a consistent
+        view.
+        """
+        path = self._chunk_path(device_serial, _month(record[0]))
+        if not path.exists():
+            return
+        records = np.fromfile(path, dtype=VITALS_DTYPE, count=path.stat().st_size // VITALS_DTYPE.itemsize)
+        target = np.array(record, dtype=VITALS_DTYPE)
+        match = records["ts"] == target["ts"]
+        for field in VITAL_FIELDS:
+            match &= (records[field] == target[field]) | (np.isnan(records[field]) & np.isnan(target[field]))
+        found = np.flatnonzero(match)
+        if not len(found):
+            return
+        with tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False) as temporary:
+            np.delete(records, found[0]).tofile(temporary)
+        os.replace(temporary.name, path)
+
+    def replace(self, old: Optional[Tuple[str, tuple]], transmission: Any) -> None:
+        """Swap the record a transmission had before an update (from record()) for its current one."""
+        new = self.record(transmission)
+        if new == old:
+            return
+        if old is not None:
+            with self._locked(old[0]):
+                self._remove(*old)
+        if new is not None:
+            self.append([transmission])
+
+    def read(self, device_serial: str, start: datetime, end: datetime) -> np.ndarray:
+        """Records for one device with start <= ts <= end, sorted by time."""
+        start_ts, end_ts = _epoch(start), _epoch(end)
+        parts = []
+        for month in _months_between(start_ts, end_ts):
+            path = self._chunk_path(device_serial, month)
+            if not path.exists():
+                continue
+            # Ignore a trailing partial record from an append in progress
+            count = path.stat().st_size // VITALS_DTYPE.itemsize
+            if not count:
+                continue
+            records = np.memmap(path, dtype=VITALS_DTYPE, mode="r", shape=(count,))
+            parts.append(records[(records["ts"] >= start_ts) & (records["ts"] <= end_ts)])
+        if not parts:
+            return np.empty(0, dtype=VITALS_DTYPE)
+        records = np.concatenate(parts)
+        return records[np.argsort(records["ts"], kind="stable")]
+
+    def downsample(self, device_serial: str, start: datetime, end: datetime, points: int) -> Dict[str, list]:
+        """Trend series reduced to at most ``points`` time buckets.
+
+        Each bucket holds the mean of the averaged vitals and the extreme of
+        heart_rate_min / heart_rate_max; empty buckets are omitted.
+        """
+        records = self.read(device_serial, start, end)
+        series: Dict[str, list] = {"timestamps": []}
+        series.update((field, []) for field in VITAL_FIELDS)
+        if not len(records):
+            return series
+
+        start_ts, end_ts = _epoch(start), _epoch(end)
+        span = max(end_ts - start_ts, 1)
+        buckets = np.minimum((records["ts"] - start_ts) * points // span, points - 1)
+        occupied = np.flatnonzero(np.bincount(buckets, minlength=points))
+
+        series["timestamps"] = [
+            datetime.fromtimestamp(start_ts + (bucket + 0.5) * span / points, tz=timezone.utc)
+            for bucket in occupied
+        ]
+        for field in VITAL_FIELDS:
+            values = records[field].astype(np.float64)
+            reducer = _REDUCERS.get(field)
+            if reducer is not None:
+                reduced = np.full(points, np.nan)
+                reducer.at(reduced, buckets, values)
+            else:
+                valid = ~np.isnan(values)
+                sums = np.bincount(buckets[valid], weights=values[valid], minlength=points)
+                counts = np.bincount(buckets[valid], minlength=points)
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    reduced = sums / counts
+            series[field] = [None if np.isnan(value) else round(float(value), 3) for value in reduced[occupied]]
+        return series
+
+    def append_safely(self, transmissions: Iterable[Any]) -> None:
+        """append() for ingest paths: the rows are already committed, so a
+        storage failure is logged rather than failing the request."""
+        try:
+            self.append(transmissions)
+        except OSError:
+            logger.exception("Failed to append transmission vitals")
+
+    def replace_safely(self, old: Optional[Tuple[str, tuple]], transmission: Any) -> None:
+        """replace() for update paths, logging storage failures like append_safely()."""
+        try:
+            self.replace(old, transmission)
+        except OSError:
+            logger.exception("Failed to replace transmission vitals")
+
+
+vitals_store: Optional[VitalsStore] = (
+    VitalsStore(settings.VITALS_STORE_PATH) if settings.VITALS_STORE_ENABLED else None
+)
@@ -0,0 +1,193 @@
+import shutil
+import uuid
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+
+from ..core.config import settings
+
+# Samples are stored as little-endian float32, whatever they were uploaded as
+SAMPLE_DTYPE = np.dtype("<f4")
+
+# Accepted upload encodings
+INPUT_DTYPES = {
+    "int16": np.dtype("<i2"),
+    "int32": np.dtype("<i4"),
+    "float32": np.dtype("<f4"),
+    "float64": np.dtype("<f8"),
+}
+
+# Views wider than this many summary blocks per point are built from the
+# per-block min/max summaries instead of the samples
+SUMMARY_MIN_BLOCKS_PER_POINT = 4
+
+
+class WaveformTooLarge(ValueError):
+    pass
+
+
+class WaveformWriter:
+    """Streams one uploaded channel into chunk files of a new store version.
+
+    Feed raw bytes in any split; ``finish`` flushes the chunks, writes the
+    per-block min/max summaries and returns the sample count. Nothing is
+    visible to readers until the caller records the new ``storage_key``.
+    """
+
+    def __init__(self, store: "WaveformStore", transmission_id: int, channel: str,
+                 input_dtype: np.dtype, gain: float = 1.0):
+        self.store = store
+        self.storage_key = uuid.uuid4().hex
+        self.path = store.version_path(transmission_id, channel, self.storage_key)
+        self.path.mkdir(parents=True)
+        self.input_dtype = input_dtype
+        self.gain = gain
+        self.sample_count = 0
+        self._pending = b""
+        self._file = None
+        self._chunk = -1
+
+    def feed(self, data: bytes) -> None:
+        data = self._pending + data
+        usable = len(data) - len(data) % self.input_dtype.itemsize
+        self._pending = data[usable:]
+        if not usable:
+            return
+        samples = np.frombuffer(data, dtype=self.input_dtype, count=usable // self.input_dtype.itemsize)
+        if self.sample_count + len(samples) > self.store.max_samples:
+            raise WaveformTooLarge(f"Waveforms are limited to {self.store.max_samples} samples")
+        samples = samples.astype(SAMPLE_DTYPE)
+        if self.gain != 1.0:
+            samples *= self.gain
+        while len(samples):
+            offset = self.sample_count % self.store.chunk_samples
+            if offset == 0:
+                self._open_chunk(self.sample_count // self.store.chunk_samples)
+            take = min(len(samples), self.store.chunk_samples - offset)
+            self._file.write(samples[:take].tobytes())
+            self.sample_count += take
+            samples = samples[take:]
+
+    def _open_chunk(self, index: int) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self.store.chunk_path(self.path, index), "wb")
+        self._chunk = index
+
+    def finish(self) -> int:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._pending:
+            raise ValueError("Upload ends with a partial sample")
+        for index in range(self._chunk + 1):
+            self.store.write_summary(self.path, index)
+        return self.sample_count
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        shutil.rmtree(self.path, ignore_errors=True)
+        try:
+            # Drop the channel directory if this was its first upload
+            self.path.parent.rmdir()
+        except OSError:
+            pass
+
+
+class WaveformStore:
+    """Chunked, memory-mapped storage of electrogram samples.
+
+    Each upload of a channel is a version directory
+    (``<root>/<transmission id>/<channel>/<storage key>/``) of float32 chunk
+    files holding ``chunk_samples`` samples each, plus a min/max pair per
+    ``summary_block`` samples. Views memory-map only the chunks in the
+    requested window and reduce them to one min/max pair per output point.
+    """
+
+    def __init__(self, root: str, chunk_samples: int, summary_block: int, max_samples: int):
+        if chunk_samples % summary_block:
+            raise ValueError("chunk_samples must be a multiple of summary_block")
+        self.root = Path(root)
+        self.chunk_samples = chunk_samples
+        self.summary_block = summary_block
+        self.max_samples = max_samples
+
+    def version_path(self, transmission_id: int, channel: str, storage_key: str) -> Path:
+        return self.root / str(transmission_id) / channel / storage_key
+
+    @staticmethod
+    def chunk_path(path: Path, index: int) -> Path:
+        return path / f"{index:06d}.f32"
+
+    @staticmethod
+    def summary_path(path: Path, index: int) -> Path:
+        return path / f"{index:06d}.minmax"
+
+    def writer(self, transmission_id: int, channel: str, input_dtype: np.dtype, gain: float = 1.0) -> WaveformWriter:
+        return WaveformWriter(self, transmission_id, channel, input_dtype, gain)
+
+    def write_summary(self, path: Path, index: int) -> None:
+        samples = self._map(self.chunk_path(path, index), SAMPLE_DTYPE)
+        starts = np.arange(0, len(samples), self.summary_block)
+        summary = np.empty((len(starts), 2), dtype=SAMPLE_DTYPE)
+        summary[:, 0] = np.minimum.reduceat(samples, starts)
+        summary[:, 1] = np.maximum.reduceat(samples, starts)
+        with open(self.summary_path(path, index), "wb") as f:
+            f.write(summary.tobytes())
+
+    def remove_version(self, transmission_id: int, channel: str, storage_key: str) -> None:
+        """Delete one stored version of a channel."""
+        shutil.rmtree(self.version_path(transmission_id, channel, storage_key), ignore_errors=True)
+
+    @staticmethod
+    def _map(path: Path, dtype: np.dtype, shape: Tuple[int, ...] = ()) -> np.ndarray:
+        count = path.stat().st_size // (dtype.itemsize * (shape[0] if shape else 1))
+        if not count:
+            return np.empty((0, *shape), dtype=dtype)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(count, *shape))
+
+    def _read(self, path: Path, start: int, end: int, per_chunk: int, chunk_file, shape=()) -> np.ndarray:
+        """Items [start, end) of a sequence split into files of per_chunk items."""
+        parts = []
+        for index in range(start // per_chunk, (end - 1) // per_chunk + 1):
+            items = self._map(chunk_file(path, index), SAMPLE_DTYPE, shape)
+            base = index * per_chunk
+            parts.append(items[max(start - base, 0):end - base])
+        # Always a copy, so callers never hold on to a memory map
+        return np.concatenate(parts) if parts else np.empty((0, *shape), dtype=SAMPLE_DTYPE)
+
+    def view(self, path: Path, start: int, end: int, width: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Min and max of samples [start, end) in ``width`` equal buckets.
+
+        Windows of at most ``width`` samples come back sample for sample.
+        Wide windows are reduced from the block summaries, with bucket edges
+        rounded down to block boundaries: each envelope may take in up to one
+        block from its neighbour, well under a point's width.
+        """
+        count = end - start
+        if count <= width:
+            samples = self._read(path, start, end, self.chunk_samples, self.chunk_path)
+            return samples, samples
+        edges = start + np.arange(width) * count // width
+        if count // width >= SUMMARY_MIN_BLOCKS_PER_POINT * self.summary_block:
+            first = start // self.summary_block
+            last = -(-end // self.summary_block)
+            blocks_per_chunk = self.chunk_samples // self.summary_block
+            summary = self._read(path, first, last, blocks_per_chunk, self.summary_path, (2,))
+            offsets = edges // self.summary_block - first
+            return (np.minimum.reduceat(summary[:, 0], offsets),
+                    np.maximum.reduceat(summary[:, 1], offsets))
+        samples = self._read(path, start, end, self.chunk_samples, self.chunk_path)
+        offsets = edges - start
+        return np.minimum.reduceat(samples, offsets), np.maximum.reduceat(samples, offsets)
+
+
+waveform_store = WaveformStore(
+    settings.WAVEFORM_STORE_PATH,
+    chunk_samples=settings.WAVEFORM_CHUNK_SAMPLES,
+    summary_block=settings.WAVEFORM_SUMMARY_BLOCK,
+    max_samples=settings.WAVEFORM_MAX_SAMPLES,
+)
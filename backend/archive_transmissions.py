@@ -0,0 +1,46 @@
+"""
+Script to move old transmissions from the hot table to the compressed archive.
+Run it periodically (e.g. nightly from cron); archived transmissions stay
+reachable through the API with include_archived=true.
+
+Usage: python archive_transmissions.py [--days N] [--batch-size N]
+"""
+
+import argparse
+from datetime import timedelta
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine, Base
+from app.models import clinic, patient  # noqa: F401 - register related models
+from app.services.archive import archive_transmissions
+
+# Create database tables
+Base.metadata.create_all(bind=engine)
+
+
+def main():
+    """Archive transmissions past the retention age."""
+    parser = argparse.ArgumentParser(description="Archive old transmissions")
+    parser.add_argument(
+        "--days", type=int, default=settings.TRANSMISSION_RETENTION_DAYS,
+        help="Archive processed transmissions older than this many days"
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.TRANSMISSION_ARCHIVE_BATCH_SIZE,
+        help="Transmissions moved per transaction"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        moved = archive_transmissions(db, timedelta(days=args.days), args.batch_size)
+        print(f"Archived {moved} transmissions older than {args.days} days.")
+    except Exception as e:
+        print(f"Error archiving transmissions: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
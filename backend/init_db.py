@@ -12,6 +12,7 @@ from app.models.clinic import Clinic
 from app.models.patient import Patient
 from app.models.transmission import Transmission
 from app.core.security import get_password_hash
+from app.services.stats import rebuild_stats
 
 # Create database tables
 Base.metadata.create_all(bind=engine)
@@ -167,6 +168,7 @@ def init_sample_data():
             db.add(transmission)
         
         db.commit()
+        rebuild_stats(db)
         print("Sample data initialized successfully!")
         print("\nTest Users Created:")
         print("- Username: doctor1, Password: password123 (Doctor)")
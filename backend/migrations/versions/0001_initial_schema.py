@@ -0,0 +1,103 @@
+"""Initial schema
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("full_name", sa.String(), nullable=False),
+        sa.Column("hashed_password", sa.String(), nullable=False),
+        sa.Column("role", sa.String(), nullable=False),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"], unique=True)
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "clinics",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("address", sa.Text()),
+        sa.Column("phone", sa.String()),
+        sa.Column("email", sa.String()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_clinics_id", "clinics", ["id"])
+    op.create_index("ix_clinics_name", "clinics", ["name"])
+
+    op.create_table(
+        "patients",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("patient_id", sa.String(), nullable=False),
+        sa.Column("first_name", sa.String(), nullable=False),
+        sa.Column("last_name", sa.String(), nullable=False),
+        sa.Column("date_of_birth", sa.Date()),
+        sa.Column("gender", sa.String()),
+        sa.Column("phone", sa.String()),
+        sa.Column("email", sa.String()),
+        sa.Column("address", sa.Text()),
+        sa.Column("emergency_contact", sa.String()),
+        sa.Column("emergency_phone", sa.String()),
+        sa.Column("medical_notes", sa.Text()),
+        sa.Column("clinic_id", sa.Integer(), sa.ForeignKey("clinics.id")),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_patients_id", "patients", ["id"])
+    op.create_index("ix_patients_patient_id", "patients", ["patient_id"], unique=True)
+
+    op.create_table(
+        "transmissions",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("transmission_id", sa.String(), nullable=False),
+        sa.Column("patient_id", sa.Integer(), sa.ForeignKey("patients.id"), nullable=False),
+        sa.Column("device_type", sa.String(), nullable=False),
+        sa.Column("device_serial", sa.String()),
+        sa.Column("transmission_type", sa.String()),
+        sa.Column("heart_rate_avg", sa.Float()),
+        sa.Column("heart_rate_min", sa.Float()),
+        sa.Column("heart_rate_max", sa.Float()),
+        sa.Column("battery_level", sa.Float()),
+        sa.Column("impedance", sa.Float()),
+        sa.Column("arrhythmia_detected", sa.Boolean()),
+        sa.Column("alert_level", sa.String()),
+        sa.Column("raw_data", sa.JSON()),
+        sa.Column("notes", sa.Text()),
+        sa.Column("processed", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_transmissions_id", "transmissions", ["id"])
+    op.create_index("ix_transmissions_transmission_id", "transmissions", ["transmission_id"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("transmissions")
+    op.drop_table("patients")
+    op.drop_table("clinics")
+    op.drop_table("users")
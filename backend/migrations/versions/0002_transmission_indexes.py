@@ -0,0 +1,44 @@
+"""Composite indexes for transmission hot paths
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transmissions_created_at_id", "transmissions",
+        ["created_at", "id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_transmissions_patient_created_at", "transmissions",
+        ["patient_id", "created_at", "id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_transmissions_alert_level_created_at", "transmissions",
+        ["alert_level", "created_at", "id"], if_not_exists=True
+    )
+    op.create_index(
+        "ix_transmissions_device_serial", "transmissions",
+        ["device_serial"], if_not_exists=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transmissions_device_serial", table_name="transmissions")
+    op.drop_index("ix_transmissions_alert_level_created_at", table_name="transmissions")
+    op.drop_index("ix_transmissions_patient_created_at", table_name="transmissions")
+    op.drop_index("ix_transmissions_created_at_id", table_name="transmissions")
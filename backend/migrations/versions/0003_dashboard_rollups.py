@@ -0,0 +1,48 @@
+"""Dashboard statistics rollups
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transmission_daily_stats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("clinic_id", sa.Integer(), nullable=False),
+        sa.Column("alert_level", sa.String(), nullable=False),
+        sa.Column("device_type", sa.String(), nullable=False),
+        sa.Column("transmission_count", sa.Integer(), nullable=False),
+        sa.UniqueConstraint(
+            "day", "clinic_id", "alert_level", "device_type",
+            name="uq_transmission_daily_stats_bucket"
+        ),
+    )
+    op.create_index("ix_transmission_daily_stats_id", "transmission_daily_stats", ["id"])
+    op.create_index("ix_transmission_daily_stats_day", "transmission_daily_stats", ["day"])
+
+    op.create_table(
+        "active_devices",
+        sa.Column("device_serial", sa.String(), primary_key=True),
+        sa.Column("transmission_count", sa.Integer(), nullable=False),
+    )
+    # Existing transmissions are folded in with: python rebuild_stats.py
+
+
+def downgrade() -> None:
+    op.drop_table("active_devices")
+    op.drop_table("transmission_daily_stats")
@@ -0,0 +1,26 @@
+"""Record the server-side alert rule on transmissions
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("transmissions", sa.Column("alert_rule", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("transmissions", "alert_rule")
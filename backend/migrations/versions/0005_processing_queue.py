@@ -0,0 +1,37 @@
+"""Transmission processing queue leases
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0005"
+down_revision: Union[str, None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("transmissions", sa.Column("lease_owner", sa.String(), nullable=True))
+    op.add_column(
+        "transmissions", sa.Column("lease_expires_at", sa.DateTime(timezone=True), nullable=True)
+    )
+    op.create_index(
+        "ix_transmissions_processed_created_at",
+        "transmissions",
+        ["processed", "created_at", "id"],
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transmissions_processed_created_at", table_name="transmissions")
+    op.drop_column("transmissions", "lease_expires_at")
+    op.drop_column("transmissions", "lease_owner")
@@ -0,0 +1,38 @@
+"""Patient search index
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.services.patient_search import FTS_TABLE, TRIGRAM_INDEX, create_search_index, fts5_available
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0007"
+down_revision: Union[str, None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        create_search_index(op.get_bind(), "trigram")
+    elif dialect == "sqlite" and fts5_available():
+        create_search_index(op.get_bind(), "fts5")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(f"DROP INDEX IF EXISTS {TRIGRAM_INDEX}")
+    elif dialect == "sqlite":
+        for trigger in ("patients_search_insert", "patients_search_update", "patients_search_delete"):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute(f"DROP TABLE IF EXISTS {FTS_TABLE}")
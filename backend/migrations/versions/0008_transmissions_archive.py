@@ -0,0 +1,61 @@
+"""Archive tier for old transmissions
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 15:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0008"
+down_revision: Union[str, None] = "0007"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "transmissions_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("transmission_id", sa.String(), nullable=False),
+        sa.Column("patient_id", sa.Integer(), nullable=False),
+        sa.Column("device_type", sa.String(), nullable=False),
+        sa.Column("device_serial", sa.String(), nullable=True),
+        sa.Column("transmission_type", sa.String(), nullable=True),
+        sa.Column("heart_rate_avg", sa.Float(), nullable=True),
+        sa.Column("heart_rate_min", sa.Float(), nullable=True),
+        sa.Column("heart_rate_max", sa.Float(), nullable=True),
+        sa.Column("battery_level", sa.Float(), nullable=True),
+        sa.Column("impedance", sa.Float(), nullable=True),
+        sa.Column("arrhythmia_detected", sa.Boolean(), nullable=True),
+        sa.Column("alert_level", sa.String(), nullable=True),
+        sa.Column("alert_rule", sa.String(), nullable=True),
+        sa.Column("raw_data", sa.LargeBinary(), nullable=True),
+        sa.Column("notes", sa.Text(), nullable=True),
+        sa.Column("processed", sa.Boolean(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("archived_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(["patient_id"], ["patients.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "ix_transmissions_archive_transmission_id", "transmissions_archive", ["transmission_id"], unique=True
+    )
+    op.create_index(
+        "ix_transmissions_archive_created_at_id", "transmissions_archive", ["created_at", "id"]
+    )
+    op.create_index(
+        "ix_transmissions_archive_patient_created_at",
+        "transmissions_archive",
+        ["patient_id", "created_at", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("transmissions_archive")
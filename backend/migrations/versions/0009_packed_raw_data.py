@@ -0,0 +1,42 @@
+"""Store transmission raw_data as binary
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 16:00:00
+
+Existing JSON text is kept as UTF-8 bytes, which the application still
+reads; run pack_raw_data.py afterwards to convert it to the packed format.
+Before downgrading, run ``pack_raw_data.py --format json`` so every row is
+JSON text again.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0009"
+down_revision: Union[str, None] = "0008"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("transmissions") as batch_op:
+        batch_op.alter_column(
+            "raw_data",
+            existing_type=sa.JSON(),
+            type_=sa.LargeBinary(),
+            postgresql_using="convert_to(raw_data::text, 'UTF8')",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("transmissions") as batch_op:
+        batch_op.alter_column(
+            "raw_data",
+            existing_type=sa.LargeBinary(),
+            type_=sa.JSON(),
+            postgresql_using="convert_from(raw_data, 'UTF8')::json",
+        )
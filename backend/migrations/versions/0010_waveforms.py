@@ -0,0 +1,41 @@
+"""Electrogram waveform channels
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 17:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0010"
+down_revision: Union[str, None] = "0009"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "waveforms",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("transmission_id", sa.Integer(), nullable=False),
+        sa.Column("channel", sa.String(), nullable=False),
+        sa.Column("sample_rate", sa.Float(), nullable=False),
+        sa.Column("sample_count", sa.Integer(), nullable=False),
+        sa.Column("units", sa.String(), nullable=True),
+        sa.Column("storage_key", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("transmission_id", "channel", name="uq_waveforms_transmission_channel"),
+    )
+    op.create_index("ix_waveforms_id", "waveforms", ["id"])
+    op.create_index("ix_waveforms_transmission_id", "waveforms", ["transmission_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("waveforms")
@@ -0,0 +1,28 @@
+"""Record server-side arrhythmia episodes on transmissions
+
+Revision ID: 0011
+Revises: 0010
+Create Date: 2026-10-18 18:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0011"
+down_revision: Union[str, None] = "0010"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("transmissions", sa.Column("arrhythmia_episodes", sa.JSON(), nullable=True))
+    op.add_column("transmissions_archive", sa.Column("arrhythmia_episodes", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("transmissions_archive", "arrhythmia_episodes")
+    op.drop_column("transmissions", "arrhythmia_episodes")
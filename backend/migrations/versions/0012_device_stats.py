@@ -0,0 +1,48 @@
+"""Per-device running statistics and trend anomalies
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-18 19:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0012"
+down_revision: Union[str, None] = "0011"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "device_stats",
+        sa.Column("device_serial", sa.String(), primary_key=True),
+        sa.Column("first_seen_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("last_seen_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("transmission_count", sa.Integer(), nullable=False),
+        sa.Column("battery_count", sa.Integer(), nullable=False),
+        sa.Column("battery_weight", sa.Float(), nullable=False),
+        sa.Column("battery_sum", sa.Float(), nullable=False),
+        sa.Column("battery_sum_sq", sa.Float(), nullable=False),
+        sa.Column("battery_day_sum", sa.Float(), nullable=False),
+        sa.Column("battery_day_sum_sq", sa.Float(), nullable=False),
+        sa.Column("battery_day_product_sum", sa.Float(), nullable=False),
+        sa.Column("impedance_count", sa.Integer(), nullable=False),
+        sa.Column("impedance_weight", sa.Float(), nullable=False),
+        sa.Column("impedance_sum", sa.Float(), nullable=False),
+        sa.Column("impedance_sum_sq", sa.Float(), nullable=False),
+    )
+    op.add_column("transmissions", sa.Column("trend_anomalies", sa.JSON(), nullable=True))
+    op.add_column("transmissions_archive", sa.Column("trend_anomalies", sa.JSON(), nullable=True))
+    # Existing transmissions are folded in with: python rebuild_device_stats.py
+
+
+def downgrade() -> None:
+    op.drop_column("transmissions_archive", "trend_anomalies")
+    op.drop_column("transmissions", "trend_anomalies")
+    op.drop_table("device_stats")
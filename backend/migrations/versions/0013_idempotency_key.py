@@ -0,0 +1,30 @@
+"""Record the Idempotency-Key that created a transmission
+
+Revision ID: 0013
+Revises: 0012
+Create Date: 2026-10-18 20:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0013"
+down_revision: Union[str, None] = "0012"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("transmissions", sa.Column("idempotency_key", sa.String(), nullable=True))
+    op.create_index("ix_transmissions_idempotency_key", "transmissions", ["idempotency_key"], unique=True)
+    op.add_column("transmissions_archive", sa.Column("idempotency_key", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("transmissions_archive", "idempotency_key")
+    op.drop_index("ix_transmissions_idempotency_key", table_name="transmissions")
+    op.drop_column("transmissions", "idempotency_key")
@@ -0,0 +1,27 @@
+"""Index idempotency keys in the transmissions archive
+
+Revision ID: 0014
+Revises: 0013
+Create Date: 2026-10-18 21:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0014"
+down_revision: Union[str, None] = "0013"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transmissions_archive_idempotency_key", "transmissions_archive", ["idempotency_key"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_transmissions_archive_idempotency_key", table_name="transmissions_archive")
@@ -0,0 +1,27 @@
+"""Index patients by clinic and active flag
+
+Revision ID: 0015
+Revises: 0014
+Create Date: 2026-10-19 09:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0015"
+down_revision: Union[str, None] = "0014"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_patients_clinic_id", "patients", ["clinic_id"])
+    op.create_index("ix_patients_is_active", "patients", ["is_active"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_patients_is_active", table_name="patients")
+    op.drop_index("ix_patients_clinic_id", table_name="patients")
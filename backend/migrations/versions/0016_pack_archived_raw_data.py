@@ -0,0 +1,64 @@
+"""Store archived raw_data in the packed format of the live table
+
+Revision ID: 0016
+Revises: 0015
+Create Date: 2026-10-19 10:00:00
+
+Archived values were zlib-compressed JSON; they are rewritten with
+pack_json so both tiers share the PackedJSON column type.
+"""
+import zlib
+from typing import Sequence, Union
+
+from alembic import op
+import orjson
+import sqlalchemy as sa
+
+from app.db.types import pack_json, unpack_json
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0016"
+down_revision: Union[str, None] = "0015"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 1000
+
+archive = sa.table(
+    "transmissions_archive",
+    sa.column("id", sa.Integer()),
+    sa.column("raw_data", sa.LargeBinary()),
+)
+
+
+def _rewrite(encode) -> None:
+    connection = op.get_bind()
+    statement = (
+        sa.update(archive).where(archive.c.id == sa.bindparam("row_id"))
+        .values(raw_data=sa.bindparam("payload"))
+    )
+    last_id = None
+    while True:
+        query = (
+            sa.select(archive.c.id, archive.c.raw_data)
+            .where(archive.c.raw_data.is_not(None))
+            .order_by(archive.c.id).limit(BATCH_SIZE)
+        )
+        if last_id is not None:
+            query = query.where(archive.c.id > last_id)
+        rows = connection.execute(query).all()
+        if not rows:
+            return
+        last_id = rows[-1].id
+        connection.execute(statement, [
+            {"row_id": row.id, "payload": encode(bytes(row.raw_data))} for row in rows
+        ])
+
+
+def upgrade() -> None:
+    _rewrite(lambda stored: pack_json(orjson.loads(zlib.decompress(stored))))
+
+
+def downgrade() -> None:
+    _rewrite(lambda stored: zlib.compress(orjson.dumps(unpack_json(stored)), 6))
@@ -0,0 +1,28 @@
+"""Mark alert levels set by hand
+
+Revision ID: 0017
+Revises: 0016
+Create Date: 2026-10-19 14:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0017"
+down_revision: Union[str, None] = "0016"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("transmissions", sa.Column("alert_level_manual", sa.Boolean(), nullable=True))
+    op.add_column("transmissions_archive", sa.Column("alert_level_manual", sa.Boolean(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("transmissions_archive", "alert_level_manual")
+    op.drop_column("transmissions", "alert_level_manual")
@@ -0,0 +1,49 @@
+"""
+Script to convert stored transmission raw_data, live and archived, between the packed binary
+format and JSON text. Run it after migrating to revision 0009 to pack
+existing rows (and with --format json before downgrading); the API reads
+both formats while it runs.
+
+Usage: python pack_raw_data.py [--format packed|json] [--batch-size N]
+       python pack_raw_data.py --compare [--sample N]
+"""
+
+import argparse
+
+from app.db.session import SessionLocal, engine, Base
+from app.models import clinic, patient  # noqa: F401 - register related models
+from app.services.raw_data import FORMATS, compare_formats, convert_raw_data
+
+# Create database tables
+Base.metadata.create_all(bind=engine)
+
+
+def main():
+    """Convert raw_data, or report how the formats compare on stored data."""
+    parser = argparse.ArgumentParser(description="Convert transmission raw_data storage")
+    parser.add_argument("--format", choices=FORMATS, default="packed", help="Format to convert to")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per transaction")
+    parser.add_argument(
+        "--compare", action="store_true",
+        help="Only report storage size and decode time of JSON versus packed"
+    )
+    parser.add_argument("--sample", type=int, default=1000, help="Rows sampled by --compare")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.compare:
+            for key, value in compare_formats(db, args.sample).items():
+                print(f"{key}: {value}")
+        else:
+            converted = convert_raw_data(db, args.format, args.batch_size)
+            print(f"Converted raw_data of {converted} transmissions to {args.format}.")
+    except Exception as e:
+        print(f"Error converting raw_data: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""
+Script to rebuild the per-device trend statistics from the transmissions table and its archive.
+Run this after migrating to revision 0012, after bulk-loading data outside the API,
+or after changing DEVICE_TREND_ALPHA.
+
+Usage: python rebuild_device_stats.py [--batch-size N]
+"""
+
+import argparse
+import time
+
+from app.core.config import settings
+from app.db.session import SessionLocal, engine, Base
+from app.models import clinic, patient  # noqa: F401 - register related models
+from app.services.device_trends import rebuild_device_stats
+
+# Create database tables
+Base.metadata.create_all(bind=engine)
+
+
+def main():
+    """Rebuild device statistics."""
+    parser = argparse.ArgumentParser(description="Rebuild per-device trend statistics")
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.EXPORT_BATCH_SIZE,
+        help="Transmissions folded per chunk"
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        devices = rebuild_device_stats(db, args.batch_size)
+        print(f"Device statistics rebuilt for {devices} devices in {time.perf_counter() - started:.1f}s.")
+    except Exception as e:
+        print(f"Error rebuilding device statistics: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
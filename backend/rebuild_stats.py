@@ -0,0 +1,27 @@
+"""
+Script to rebuild the dashboard statistics rollups from the transmissions table and its archive.
+Run this after bulk-loading data outside the API or to backfill an existing database.
+"""
+
+from app.db.session import SessionLocal, engine, Base
+from app.services.stats import rebuild_stats
+
+# Create database tables
+Base.metadata.create_all(bind=engine)
+
+
+def main():
+    """Rebuild transmission rollups."""
+    db = SessionLocal()
+    try:
+        rebuild_stats(db)
+        print("Dashboard statistics rebuilt successfully!")
+    except Exception as e:
+        print(f"Error rebuilding statistics: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Script to rebuild the columnar vitals store from the transmissions table and its archive.
+Run this to backfill trends for transmissions ingested before the store existed.
+
+The new store is written next to the live one and swapped in when complete,
+so the API keeps serving trends meanwhile. Vitals the API appends during the
+rebuild go to the old store and are dropped with it; run the rebuild when
+ingest is quiet, or again afterwards.
+"""
+
+import shutil
+from pathlib import Path
+
+from sqlalchemy import select, union_all
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models import clinic, patient  # noqa: F401 - register related models
+from app.models.transmission import Transmission, TransmissionArchive
+from app.services.vitals_store import VitalsStore, VITALS_COLUMNS
+
+
+def main():
+    """Rebuild the vitals store."""
+    root = Path(settings.VITALS_STORE_PATH)
+    staging = root.with_name(f"{root.name}.rebuild")
+    retired = root.with_name(f"{root.name}.old")
+    for leftover in (staging, retired):
+        shutil.rmtree(leftover, ignore_errors=True)
+    store = VitalsStore(str(staging))
+
+    db = SessionLocal()
+    try:
+        history = union_all(*(
+            select(*(getattr(model, column.key) for column in VITALS_COLUMNS))
+            .where(model.device_serial.is_not(None))
+            for model in (Transmission, TransmissionArchive)
+        )).subquery()
+        statement = select(history).order_by(history.c.device_serial, history.c.created_at)
+        result = db.execute(statement.execution_options(yield_per=settings.EXPORT_BATCH_SIZE))
+        count = 0
+        for rows in result.partitions():
+            store.append(rows)
+            count += len(rows)
+        staging.mkdir(parents=True, exist_ok=True)
+        # Two renames: readers see the old store or the new one, and for an
+        # instant no store, which reads as empty trends
+        if root.exists():
+            root.rename(retired)
+        staging.rename(root)
+        shutil.rmtree(retired, ignore_errors=True)
+        print(f"Vitals store rebuilt from {count} transmissions.")
+    except Exception as e:
+        print(f"Error rebuilding vitals store: {e}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
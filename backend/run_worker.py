@@ -0,0 +1,56 @@
+"""
+Script to process unprocessed transmissions in dedicated worker processes.
+Workers lease disjoint batches, so any number of copies can run against the
+same database, on one machine or several.
+
+Usage: python run_worker.py [--processes N]
+"""
+
+import argparse
+import multiprocessing
+import threading
+
+from app.db.session import engine, Base
+from app.models import clinic, patient  # noqa: F401 - register related models
+from app.services.processing import TransmissionWorker
+
+# Create database tables
+Base.metadata.create_all(bind=engine)
+
+
+def run_process():
+    """Run one worker until interrupted."""
+    stop = threading.Event()
+    try:
+        TransmissionWorker().run(stop)
+    except KeyboardInterrupt:
+        stop.set()
+
+
+def main():
+    """Start transmission workers."""
+    parser = argparse.ArgumentParser(description="Process unprocessed transmissions")
+    parser.add_argument("--processes", type=int, default=1, help="Number of worker processes")
+    args = parser.parse_args()
+
+    # Spawned children open their own connections instead of sharing the parent's pool
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=run_process) for _ in range(args.processes)]
+    for process in processes:
+        process.start()
+    print(f"Started {len(processes)} transmission worker(s); press Ctrl+C to stop.")
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        for process in processes:
+            process.join()
+        print("Transmission workers stopped.")
+    except Exception as e:
+        print(f"Error running workers: {e}")
+        for process in processes:
+            process.terminate()
+
+
+if __name__ == "__main__":
+    main()
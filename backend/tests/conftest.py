@@ -0,0 +1,75 @@
+import os
+import tempfile
+
+# Point the app at a throwaway database and stores before it is imported
+_data_dir = tempfile.mkdtemp(prefix="cardiavue-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_data_dir, 'test.db')}"
+os.environ["VITALS_STORE_PATH"] = os.path.join(_data_dir, "vitals")
+os.environ["WAVEFORM_STORE_PATH"] = os.path.join(_data_dir, "waveforms")
+os.environ["BCRYPT_ROUNDS"] = "4"
+os.environ["PASSWORD_HASH_WORKERS"] = "0"
+# Run the suite again with DATABASE_ASYNC=true to cover the async read path
+os.environ.setdefault("DATABASE_ASYNC", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+
+from app.core.security import get_password_hash
+from app.db import session as db_session
+from app.db.session import SessionLocal
+from app.main import app
+from app.models.clinic import Clinic
+from app.models.patient import Patient
+from app.models.user import User
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def patient_id(client):
+    """A patient in a clinic, created once for the whole session."""
+    db = SessionLocal()
+    try:
+        db.add(User(
+            username="tester", email="tester@example.com", full_name="Test User",
+            role="admin", hashed_password=get_password_hash("secret"),
+        ))
+        clinic = Clinic(name="Test Clinic")
+        db.add(clinic)
+        db.flush()
+        patient = Patient(patient_id="P-TEST", first_name="Jane", last_name="Roe", clinic_id=clinic.id)
+        db.add(patient)
+        db.commit()
+        return patient.id
+    finally:
+        db.close()
+
+
+@pytest.fixture(scope="session")
+def auth_headers(client, patient_id):
+    response = client.post("/api/auth/login", json={"username": "tester", "password": "secret"})
+    assert response.status_code == 200
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+def statements():
+    """(statement, parameters) of every query the test runs, on the sync and async engines."""
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        captured.append((statement, parameters))
+
+    engines = [db_session.engine]
+    if db_session.async_engine is not None:
+        engines.append(db_session.async_engine.sync_engine)
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    yield captured
+    for engine in engines:
+        event.remove(engine, "before_cursor_execute", capture)
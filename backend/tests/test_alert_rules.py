@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from app.db.session import SessionLocal
+from app.models.transmission import Transmission
+from app.services.alert_rules import DEFAULT_RULES, AlertRuleEngine, load_engine
+from app.services.processing import TransmissionWorker
+
+CLINIC_STRICT, CLINIC_LENIENT, CLINIC_PLAIN = 11, 12, 13
+OVERRIDES = {
+    CLINIC_STRICT: {"heart_rate_avg_high": 100.0},
+    CLINIC_LENIENT: {"heart_rate_avg_very_high": 170.0, "heart_rate_avg_high": 140.0},
+}
+
+
+def classify(engine, clinic_id, **fields):
+    row = {"device_type": "icd", "alert_level": "normal", **fields}
+    engine.apply([row], [clinic_id])
+    return row["alert_level"], row.get("alert_rule")
+
+
+@pytest.fixture
+def engine():
+    return AlertRuleEngine(list(DEFAULT_RULES), OVERRIDES)
+
+
+@pytest.mark.parametrize("clinic_id, heart_rate, expected", [
+    # The clinic's override beats the default threshold, in either direction
+    (CLINIC_STRICT, 110, ("warning", "heart_rate_avg_high")),
+    (CLINIC_PLAIN, 110, ("normal", None)),
+    (None, 110, ("normal", None)),
+    (CLINIC_LENIENT, 130, ("normal", None)),
+    (CLINIC_PLAIN, 130, ("warning", "heart_rate_avg_high")),
+    (CLINIC_LENIENT, 160, ("warning", "heart_rate_avg_high")),
+    (CLINIC_PLAIN, 160, ("critical", "heart_rate_avg_very_high")),
+    # Rules a clinic does not override keep the default threshold
+    (CLINIC_STRICT, 160, ("critical", "heart_rate_avg_very_high")),
+])
+def test_clinic_overrides_take_precedence(engine, clinic_id, heart_rate, expected):
+    assert classify(engine, clinic_id, heart_rate_avg=heart_rate) == expected
+
+
+def test_batch_matches_row_by_row(engine):
+    clinic_ids = [CLINIC_STRICT, CLINIC_LENIENT, CLINIC_PLAIN, None] * 25
+    rows = [
+        {"device_type": "icd" if index % 3 else "loop", "alert_level": "normal",
+         "heart_rate_avg": 90 + index, "impedance": 150 + 20 * index, "battery_level": 100 - index}
+        for index in range(len(clinic_ids))
+    ]
+    one_by_one = [
+        classify(engine, clinic_id, **{key: value for key, value in row.items() if key != "alert_level"})
+        for row, clinic_id in zip(rows, clinic_ids)
+    ]
+    engine.apply(rows, clinic_ids)
+    assert [(row["alert_level"], row.get("alert_rule")) for row in rows] == one_by_one
+
+
+def test_reported_and_manual_levels_are_kept(engine):
+    assert classify(engine, None, heart_rate_avg=130, alert_level="critical") == ("critical", None)
+    assert classify(engine, None, heart_rate_avg=160, alert_level="normal", alert_level_manual=True) == (
+        "normal", None
+    )
+
+
+def test_load_engine_reads_overrides(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps({"clinic_overrides": {str(CLINIC_STRICT): {"heart_rate_avg_high": 100}}}))
+    engine = load_engine(str(path))
+    assert classify(engine, CLINIC_STRICT, heart_rate_avg=110) == ("warning", "heart_rate_avg_high")
+    assert classify(engine, CLINIC_PLAIN, heart_rate_avg=110) == ("normal", None)
+
+
+def test_processing_keeps_a_level_staff_lowered(client, auth_headers, patient_id):
+    worker = TransmissionWorker()
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": "RULE-manual", "patient_id": patient_id, "device_type": "icd", "heart_rate_avg": 160,
+    })
+    assert response.json()["alert_level"] == "critical"
+    url = f"/api/transmissions/{response.json()['id']}"
+    lowered = client.put(url, headers=auth_headers, json={"alert_level": "normal", "processed": False})
+    assert lowered.json()["alert_level"] == "normal"
+    assert lowered.json()["alert_rule"] is None
+
+    worker.drain()
+    processed = client.get(url, headers=auth_headers).json()
+    assert processed["processed"] is True
+    assert processed["alert_level"] == "normal"
+
+
+def test_processing_escalates_edited_readings(client, auth_headers, patient_id):
+    worker = TransmissionWorker()
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": "RULE-edited", "patient_id": patient_id, "device_type": "icd", "heart_rate_avg": 80,
+    })
+    url = f"/api/transmissions/{response.json()['id']}"
+    # Readings changed after ingest, without going through the rules
+    db = SessionLocal()
+    try:
+        db.get(Transmission, response.json()["id"]).heart_rate_avg = 130
+        db.commit()
+    finally:
+        db.close()
+
+    worker.drain()
+    processed = client.get(url, headers=auth_headers).json()
+    assert processed["alert_level"] == "warning"
+    assert processed["alert_rule"] == "heart_rate_avg_high"
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from app.api.transmissions import _stream_events
+from app.core.broadcast import BroadcastHub
+from app.core.config import settings
+from app.core.security import RedactTokenFilter, create_access_token
+
+
+def event(transmission_id, kind="created", clinic_id=1):
+    return {"event": kind, "id": transmission_id, "clinic_id": clinic_id, "alert_level": "critical"}
+
+
+async def collect(stream, count):
+    return [await stream.__anext__() for _ in range(count)]
+
+
+def test_event_ids_are_a_hub_sequence():
+    async def scenario():
+        hub = BroadcastHub()
+        subscription = hub.subscribe()
+        stream = _stream_events(subscription)
+        # The same transmission created and then escalated: two distinct ids
+        hub.publish([event(7), event(8)])
+        hub.publish([event(7, "escalated")])
+        messages = await collect(stream, 4)
+        await stream.aclose()
+        return messages
+
+    retry, *messages = asyncio.run(scenario())
+    assert retry.startswith("retry:")
+    assert [message.split("\n")[0] for message in messages] == ["id: 1", "id: 2", "id: 3"]
+    assert messages[2].split("\n")[1] == "event: escalated"
+
+
+def test_reconnect_replays_missed_events():
+    async def scenario():
+        hub = BroadcastHub(replay_size=3)
+        hub.publish([event(index, clinic_id=index % 2) for index in range(1, 6)])
+        resumed = hub.subscribe(clinic_id=1, after_seq=3)
+        hub.publish([event(6, clinic_id=1)])
+        replayed = [await resumed.get(1) for _ in range(2)]
+        fresh = hub.subscribe()
+        return replayed, fresh.queue.qsize()
+
+    replayed, queued = asyncio.run(scenario())
+    # Only events past the last one seen, matching the filter, from the replay buffer
+    assert [(item["seq"], item["id"]) for item in replayed] == [(5, 5), (6, 6)]
+    assert queued == 0
+
+
+def test_stream_ends_when_the_token_expires(monkeypatch):
+    monkeypatch.setattr(settings, "ALERT_STREAM_KEEPALIVE_SECONDS", 10.0)
+
+    async def scenario():
+        stream = _stream_events(BroadcastHub().subscribe(), expires_at=time.time() + 0.05)
+        started = time.monotonic()
+        messages = [message async for message in stream]
+        return messages, time.monotonic() - started
+
+    messages, elapsed = asyncio.run(scenario())
+    assert messages[-1].startswith("event: expired")
+    # Woken by the expiry, not the keepalive interval
+    assert elapsed < 1
+
+
+def test_expired_token_cannot_open_a_stream(client, patient_id):
+    token = create_access_token("tester", expires_delta=timedelta(seconds=-1))
+    assert client.get(f"/api/transmissions/stream?access_token={token}").status_code == 401
+
+
+def test_access_log_masks_tokens():
+    record = logging.LogRecord(
+        "uvicorn.access", logging.INFO, __file__, 1, '%s - "%s %s HTTP/%s" %d',
+        ("127.0.0.1:5000", "GET", "/api/transmissions/stream?clinic_id=1&access_token=eyJ.abc.def&x=1", "1.1", 200),
+        None,
+    )
+    assert RedactTokenFilter().filter(record)
+    assert record.getMessage() == (
+        '127.0.0.1:5000 - "GET /api/transmissions/stream?clinic_id=1&access_token=***&x=1 HTTP/1.1" 200'
+    )
@@ -0,0 +1,66 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import select, update
+
+from app.db.session import SessionLocal
+from app.models.transmission import Transmission, TransmissionArchive
+from app.services.archive import archive_transmissions
+
+
+def ingest(client, auth_headers, patient_id, transmission_id, **fields):
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": transmission_id, "patient_id": patient_id, "device_type": "icd", **fields,
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+def backdate(ids, processed):
+    db = SessionLocal()
+    try:
+        db.execute(update(Transmission).where(Transmission.id.in_(ids)).values(
+            created_at=datetime.now(timezone.utc) - timedelta(days=800), processed=processed,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def test_archive_keeps_raw_data_readable(client, auth_headers, patient_id):
+    raw_data = {"egm": {"sample_rate": 128, "samples": list(range(64))}, "note": "ü"}
+    old = ingest(client, auth_headers, patient_id, "ARC-old", raw_data=raw_data)
+    ingest(client, auth_headers, patient_id, "ARC-new")
+    backdate([old], processed=True)
+
+    db = SessionLocal()
+    try:
+        assert archive_transmissions(db) >= 1
+        archived = db.scalars(select(TransmissionArchive).where(TransmissionArchive.id == old)).one()
+        assert archived.raw_data == raw_data
+        assert db.get(Transmission, old) is None
+    finally:
+        db.close()
+
+    response = client.get(
+        f"/api/transmissions/?patient_id={patient_id}&include_archived=true&fields=transmission_id,raw_data",
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    by_id = {row["transmission_id"]: row for row in response.json()}
+    assert by_id["ARC-old"]["raw_data"] == raw_data
+
+
+def test_archive_logs_old_unprocessed_rows(client, auth_headers, patient_id, caplog):
+    waiting = ingest(client, auth_headers, patient_id, "ARC-waiting")
+    ingest(client, auth_headers, patient_id, "ARC-latest")
+    backdate([waiting], processed=False)
+
+    db = SessionLocal()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.services.archive"):
+            archive_transmissions(db)
+        assert db.get(Transmission, waiting) is not None
+    finally:
+        db.close()
+    assert any("unprocessed" in record.getMessage() for record in caplog.records)
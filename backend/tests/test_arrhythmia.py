@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+from sqlalchemy import update
+
+from app.db.session import SessionLocal
+from app.models.transmission import Transmission
+from app.services.arrhythmia import ArrhythmiaDetector, detect_range, rr_from_egm
+
+SINUS_MS = 800.0  # 75 bpm
+
+
+def rhythm():
+    """Sinus rhythm around a tachycardia run, a pause and a bradycardia run."""
+    return (
+        [SINUS_MS] * 20 + [300.0] * 12 + [SINUS_MS] * 20 + [3500.0]
+        + [SINUS_MS] * 20 + [1700.0] * 10 + [SINUS_MS] * 5
+    )
+
+
+def egm(rr_ms, sample_rate=250):
+    """Electrogram with a narrow R wave after each interval over a low-amplitude baseline."""
+    beats = np.cumsum([500.0] + list(rr_ms)) / 1000.0
+    samples = 0.05 * np.sin(np.arange(int((beats[-1] + 0.5) * sample_rate)) * 0.3)
+    for beat in beats:
+        peak = int(round(beat * sample_rate))
+        samples[peak - 2:peak + 3] += [0.3, 0.7, 1.0, 0.6, 0.2]
+    return samples.tolist()
+
+
+def test_episodes_in_a_known_rhythm():
+    episodes = ArrhythmiaDetector().episodes(np.array(rhythm()))
+    found = [(episode["type"], episode["start_beat"], episode["beats"]) for episode in episodes]
+    assert found == [("tachycardia", 20, 12), ("pause", 52, 1), ("bradycardia", 73, 10)]
+    tachycardia = episodes[0]
+    assert tachycardia["mean_rate_bpm"] == 200.0
+    assert tachycardia["onset_s"] == 16.0
+    assert tachycardia["duration_s"] == 3.6
+
+
+def test_sinus_rhythm_has_no_episodes():
+    assert ArrhythmiaDetector().episodes(np.full(200, SINUS_MS)) == []
+
+
+def test_irregular_rhythm_is_flagged():
+    rr = np.random.default_rng(7).uniform(400, 1200, size=120)
+    kinds = {episode["type"] for episode in ArrhythmiaDetector().episodes(rr)}
+    assert "irregular_rhythm" in kinds
+
+
+def test_rr_intervals_from_an_electrogram():
+    rr = rr_from_egm(egm([SINUS_MS] * 10 + [400.0] * 5), 250)
+    assert rr == pytest.approx([SINUS_MS] * 10 + [400.0] * 5, abs=4)
+
+
+@pytest.mark.parametrize("raw_data", [
+    {"rr_intervals_ms": rhythm()},
+    {"heart_rate_series": [60000.0 / rr for rr in rhythm()]},
+    {"egm": {"sample_rate": 250, "ventricular": egm(rhythm())}},
+])
+def test_each_source_finds_the_same_episodes(raw_data):
+    episodes = ArrhythmiaDetector().analyze(raw_data)
+    assert [episode["type"] for episode in episodes] == ["tachycardia", "pause", "bradycardia"]
+    assert {episode["source"] for episode in episodes} == set(raw_data)
+
+
+def ingest(client, auth_headers, patient_id, transmission_id, **fields):
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": transmission_id, "patient_id": patient_id, "device_type": "icd", **fields,
+    })
+    assert response.status_code == 200
+    return response.json()
+
+
+def test_ingest_sets_the_detected_flag(client, auth_headers, patient_id):
+    flagged = ingest(client, auth_headers, patient_id, "ARR-flagged", raw_data={"rr_intervals_ms": rhythm()})
+    assert flagged["arrhythmia_detected"] is True
+    assert [episode["type"] for episode in flagged["arrhythmia_episodes"]] == ["tachycardia", "pause", "bradycardia"]
+
+    # A clean rhythm overrides the device's flag; no rhythm data keeps it
+    clean = ingest(
+        client, auth_headers, patient_id, "ARR-clean",
+        arrhythmia_detected=True, raw_data={"rr_intervals_ms": [SINUS_MS] * 40},
+    )
+    assert clean["arrhythmia_detected"] is False
+    assert clean["arrhythmia_episodes"] == []
+    reported = ingest(client, auth_headers, patient_id, "ARR-reported", arrhythmia_detected=True)
+    assert reported["arrhythmia_detected"] is True
+    assert reported["arrhythmia_episodes"] is None
+
+
+def test_detect_range_reprocesses_stored_rows(client, auth_headers, patient_id):
+    row_id = ingest(client, auth_headers, patient_id, "ARR-backlog", raw_data={"rr_intervals_ms": rhythm()})["id"]
+    db = SessionLocal()
+    try:
+        db.execute(update(Transmission).where(Transmission.id == row_id).values(
+            arrhythmia_detected=False, arrhythmia_episodes=None
+        ))
+        db.commit()
+        assert detect_range(row_id, row_id) == (1, 1)
+        db.expire_all()
+        stored = db.get(Transmission, row_id)
+        assert stored.arrhythmia_detected is True
+        assert len(stored.arrhythmia_episodes) == 3
+    finally:
+        db.close()
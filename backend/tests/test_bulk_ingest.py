@@ -0,0 +1,67 @@
+import pytest
+from sqlalchemy import event, insert, text
+
+from app.db.session import SessionLocal, engine
+from app.models.transmission import Transmission
+
+
+def item(patient_id, transmission_id):
+    return {"transmission_id": transmission_id, "patient_id": patient_id, "device_type": "icd"}
+
+
+@pytest.fixture
+def refuse_bad_rows():
+    """A trigger that fails inserts of BULK-bad the way a constraint would."""
+    with engine.begin() as conn:
+        conn.execute(text(
+            "CREATE TRIGGER refuse_bulk_bad BEFORE INSERT ON transmissions "
+            "WHEN NEW.transmission_id = 'BULK-bad' BEGIN SELECT RAISE(ABORT, 'refused by test'); END"
+        ))
+    yield
+    with engine.begin() as conn:
+        conn.execute(text("DROP TRIGGER refuse_bulk_bad"))
+
+
+def test_bulk_reports_stored_and_rejected_items(client, auth_headers, patient_id):
+    stored = client.post("/api/transmissions/", headers=auth_headers, json=item(patient_id, "BULK-stored"))
+    response = client.post("/api/transmissions/bulk", headers=auth_headers, json=[
+        item(patient_id, "BULK-new"), item(patient_id, "BULK-stored"), {"transmission_id": "BULK-invalid"},
+        item(patient_id, "BULK-new"),
+    ])
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["accepted"], body["duplicates"], body["rejected"]) == (1, 1, 2)
+    statuses = [(result["status"], result.get("id")) for result in body["results"]]
+    assert statuses[1] == ("duplicate", stored.json()["id"])
+    assert [status for status, _ in statuses] == ["accepted", "duplicate", "rejected", "rejected"]
+
+
+def test_constraint_failures_are_errors_not_duplicates(client, auth_headers, patient_id, refuse_bad_rows):
+    # A concurrent writer stores BULK-race after the duplicate check, before the insert
+    raced = []
+
+    def race(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO transmissions ") and not raced:
+            raced.append(True)
+            db = SessionLocal()
+            try:
+                db.execute(insert(Transmission).values(item(patient_id, "BULK-race")))
+                db.commit()
+            finally:
+                db.close()
+
+    event.listen(engine, "before_cursor_execute", race)
+    try:
+        response = client.post("/api/transmissions/bulk", headers=auth_headers, json=[
+            item(patient_id, "BULK-ok"), item(patient_id, "BULK-bad"), item(patient_id, "BULK-race"),
+        ])
+    finally:
+        event.remove(engine, "before_cursor_execute", race)
+    assert response.status_code == 200
+    ok, bad, late = response.json()["results"]
+    assert ok["status"] == "accepted"
+    assert bad["status"] == "error"
+    assert bad["id"] is None
+    assert "refused by test" in bad["error"]
+    assert late["status"] == "duplicate"
+    assert late["id"] is not None
@@ -0,0 +1,58 @@
+import pytest
+
+
+def revalidate(client, auth_headers, url, etag):
+    return client.get(url, headers={**auth_headers, "If-None-Match": etag})
+
+
+def ingest(client, auth_headers, patient_id, transmission_id):
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": transmission_id, "patient_id": patient_id, "device_type": "icd",
+    })
+    assert response.status_code == 200
+    return response.json()["id"]
+
+
+@pytest.mark.parametrize("url", ["/api/transmissions/?limit=20", "/api/transmissions/stats/dashboard"])
+def test_transmission_reads_revalidate_until_a_write(client, auth_headers, patient_id, url):
+    ingest(client, auth_headers, patient_id, f"COND-before-{url}")
+    first = client.get(url, headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    cached = revalidate(client, auth_headers, url, etag)
+    assert cached.status_code == 304
+    assert cached.headers["ETag"] == etag
+    assert cached.content == b""
+
+    ingest(client, auth_headers, patient_id, f"COND-after-{url}")
+    changed = revalidate(client, auth_headers, url, etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_patient_list_revalidates_until_a_write(client, auth_headers, patient_id):
+    url = "/api/patients/?limit=20"
+    etag = client.get(url, headers=auth_headers).headers["ETag"]
+    assert revalidate(client, auth_headers, url, etag).status_code == 304
+
+    response = client.post("/api/patients/", headers=auth_headers, json={
+        "patient_id": "P-COND", "first_name": "Cond", "last_name": "Itional",
+    })
+    assert response.status_code == 200
+    changed = revalidate(client, auth_headers, url, etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+
+def test_transmission_detail_revalidates_until_updated(client, auth_headers, patient_id):
+    transmission_id = ingest(client, auth_headers, patient_id, "COND-detail")
+    url = f"/api/transmissions/{transmission_id}"
+    first = client.get(url, headers=auth_headers)
+    etag, last_modified = first.headers["ETag"], first.headers["Last-Modified"]
+    assert revalidate(client, auth_headers, url, etag).status_code == 304
+    assert client.get(url, headers={**auth_headers, "If-Modified-Since": last_modified}).status_code == 304
+
+    response = client.put(url, headers=auth_headers, json={"alert_level": "warning"})
+    assert response.status_code == 200
+    assert revalidate(client, auth_headers, url, etag).status_code == 200
@@ -0,0 +1,105 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.stats import DeviceStats
+from app.services.device_trends import _STATE_COLUMNS, _decay, _fold_chunk, observe, rebuild_device_stats
+
+START = datetime(2026, 1, 1)
+NUMERIC_COLUMNS = [
+    column for column in _STATE_COLUMNS
+    if column not in ("device_serial", "first_seen_at", "last_seen_at")
+]
+
+
+def history(serials=("DT-A", "DT-B", "DT-C"), per_device=40, seed=3):
+    """(serial, created_at, battery, impedance) rows sorted by device and time, with gaps."""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for serial in serials:
+        for index in range(per_device):
+            battery = None if index % 7 == 3 else float(95 - index * 0.2 + rng.normal(0, 0.5))
+            impedance = None if index % 5 == 1 else float(rng.normal(500, 20))
+            rows.append((serial, START + timedelta(hours=12 * index), battery, impedance))
+    return rows
+
+
+def replay(rows):
+    """Device states from folding rows one at a time, as ingest does."""
+    states = {}
+    for serial, created_at, battery, impedance in rows:
+        state = states.get(serial)
+        if state is None:
+            state = states[serial] = DeviceStats(
+                device_serial=serial, **{column: 0 for column in NUMERIC_COLUMNS}
+            )
+        observe(state, created_at, {"battery_level": battery, "impedance": impedance})
+    return states
+
+
+def assert_same_state(batch, running):
+    assert batch["first_seen_at"] == running.first_seen_at
+    assert batch["last_seen_at"] == running.last_seen_at
+    for column in NUMERIC_COLUMNS:
+        assert batch[column] == pytest.approx(getattr(running, column), rel=1e-9, abs=1e-9), column
+
+
+@pytest.mark.parametrize("chunk_size", [1000, 17, 1])
+def test_batch_fold_matches_replay(chunk_size):
+    rows = history()
+    running = replay(rows)
+    batch = []
+    carry = None
+    for start in range(0, len(rows), chunk_size):
+        states = _fold_chunk(rows[start:start + chunk_size], carry, _decay())
+        carry = states.pop()
+        batch += states
+    batch.append(carry)
+
+    assert [state["device_serial"] for state in batch] == sorted(running)
+    for state in batch:
+        assert_same_state(state, running[state["device_serial"]])
+
+
+def test_sudden_battery_drop_is_flagged():
+    state = DeviceStats(device_serial="DT-drop", **{column: 0 for column in NUMERIC_COLUMNS})
+    for index in range(10):
+        assert observe(state, START + timedelta(days=index), {"battery_level": 90.0 - index * 0.01}) == []
+    anomalies = observe(state, START + timedelta(days=10), {"battery_level": 60.0})
+    # The drop also steepens the battery slope enough to count as depletion
+    assert [anomaly["type"] for anomaly in anomalies] == ["battery_shift", "battery_depletion"]
+
+
+def test_rebuild_matches_ingest(client, auth_headers):
+    # A patient of its own, so these devices stay out of other tests' overviews
+    patient = client.post("/api/patients/", headers=auth_headers, json={
+        "patient_id": "P-TRENDS", "first_name": "Trend", "last_name": "Line",
+    })
+    assert patient.status_code == 200
+    patient_id = patient.json()["id"]
+    serials = ("DT-ingest-1", "DT-ingest-2")
+    for index, (serial, _, battery, impedance) in enumerate(history(serials, per_device=25, seed=11)):
+        response = client.post("/api/transmissions/", headers=auth_headers, json={
+            "transmission_id": f"DT-{index}", "patient_id": patient_id, "device_type": "icd",
+            "device_serial": serial, "battery_level": battery, "impedance": impedance,
+        })
+        assert response.status_code == 200
+
+    db = SessionLocal()
+    try:
+        query = select(DeviceStats).where(DeviceStats.device_serial.in_(serials)).order_by(DeviceStats.device_serial)
+        running = {state.device_serial: state for state in db.scalars(query)}
+        db.expunge_all()
+        rebuild_device_stats(db, batch_size=7)
+        rebuilt = [
+            {column: getattr(state, column) for column in _STATE_COLUMNS} for state in db.scalars(query)
+        ]
+    finally:
+        db.close()
+
+    assert [state["device_serial"] for state in rebuilt] == list(serials)
+    for state in rebuilt:
+        assert_same_state(state, running[state["device_serial"]])
@@ -0,0 +1,97 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.transmission import TransmissionArchive
+from app.services.export import EXPORT_FIELDS, export_queries, stream_export
+
+LIVE = 7
+ARCHIVED = 3
+
+
+@pytest.fixture(scope="module")
+def export_patient(client, auth_headers):
+    """A patient of its own with archived and live transmissions, oldest archived."""
+    response = client.post("/api/patients/", headers=auth_headers, json={
+        "patient_id": "P-EXPORT", "first_name": "Ex", "last_name": "Port",
+    })
+    patient_id = response.json()["id"]
+    db = SessionLocal()
+    try:
+        db.execute(insert(TransmissionArchive), [
+            {
+                "id": 30_000_000 + index, "transmission_id": f"EXP-archived-{index}", "patient_id": patient_id,
+                "device_type": "icd", "transmission_type": "scheduled", "arrhythmia_detected": False,
+                "alert_level": "normal", "processed": True, "idempotency_key": f"exp-{index}",
+                "created_at": datetime.now(timezone.utc) - timedelta(days=900 - index),
+            }
+            for index in range(ARCHIVED)
+        ])
+        db.commit()
+    finally:
+        db.close()
+    for index in range(LIVE):
+        headers = {**auth_headers, "Idempotency-Key": f"exp-live-{index}"}
+        response = client.post("/api/transmissions/", headers=headers, json={
+            "transmission_id": f"EXP-live-{index}", "patient_id": patient_id, "device_type": "icd",
+            "heart_rate_avg": 170 if index == 3 else 70, "raw_data": {"index": index, "note": "a,b\n\"c\""},
+        })
+        assert response.status_code == 200
+    return patient_id
+
+
+def expected_order():
+    return [f"EXP-archived-{index}" for index in range(ARCHIVED)] + [f"EXP-live-{index}" for index in range(LIVE)]
+
+
+def test_ndjson_export_merges_tiers_in_time_order(client, auth_headers, export_patient):
+    response = client.get(f"/api/transmissions/export?format=ndjson&patient_id={export_patient}", headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["transmission_id"] for row in rows] == expected_order()
+    # Only the public fields: no lease or idempotency columns
+    assert all(list(row) == EXPORT_FIELDS for row in rows)
+    assert rows[-1]["raw_data"] == {"index": LIVE - 1, "note": "a,b\n\"c\""}
+
+
+def test_csv_export_round_trips(client, auth_headers, export_patient):
+    response = client.get(f"/api/transmissions/export?format=csv&patient_id={export_patient}", headers=auth_headers)
+    assert response.status_code == 200
+    reader = csv.DictReader(io.StringIO(response.text))
+    assert reader.fieldnames == EXPORT_FIELDS
+    rows = list(reader)
+    assert [row["transmission_id"] for row in rows] == expected_order()
+    assert json.loads(rows[-1]["raw_data"]) == {"index": LIVE - 1, "note": "a,b\n\"c\""}
+
+
+def test_export_filters(client, auth_headers, export_patient):
+    base = f"/api/transmissions/export?format=ndjson&patient_id={export_patient}"
+    critical = client.get(f"{base}&alert_level=critical", headers=auth_headers).text.splitlines()
+    assert [json.loads(line)["transmission_id"] for line in critical] == ["EXP-live-3"]
+
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=30)).replace(tzinfo=None).isoformat()
+    recent = client.get(f"{base}&start={cutoff}", headers=auth_headers).text.splitlines()
+    old = client.get(f"{base}&end={cutoff}", headers=auth_headers).text.splitlines()
+    assert len(recent) == LIVE
+    assert len(old) == ARCHIVED
+
+
+def test_export_streams_in_batches(export_patient, monkeypatch):
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 3)
+    chunks = stream_export(export_queries(patient_id=export_patient), "ndjson")
+    first = next(chunks)
+    # The first batch is out before the rest of the export is read
+    assert len(first.splitlines()) == 3
+    sizes = [len(first.splitlines())] + [len(chunk.splitlines()) for chunk in chunks]
+    assert sizes == [3, 3, 3, 1]
+
+    csv_chunks = list(stream_export(export_queries(patient_id=export_patient), "csv"))
+    assert len(csv_chunks) == 4
+    assert csv_chunks[0].startswith(",".join(EXPORT_FIELDS).encode())
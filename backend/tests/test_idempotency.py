@@ -0,0 +1,76 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.db.session import SessionLocal
+from app.models.transmission import TransmissionArchive
+from app.services.idempotency import ingest_dedup
+
+
+def post(client, auth_headers, patient_id, transmission_id, key=None):
+    headers = {**auth_headers, "Idempotency-Key": key} if key else auth_headers
+    return client.post("/api/transmissions/", headers=headers, json={
+        "transmission_id": transmission_id, "patient_id": patient_id, "device_type": "icd",
+    })
+
+
+def forget(*names):
+    for name in names:
+        ingest_dedup.records.delete(name)
+
+
+def test_new_create_does_not_look_up_originals(client, auth_headers, patient_id, statements):
+    response = post(client, auth_headers, patient_id, "IDEM-new", key="idem-new")
+    assert response.status_code == 200
+    reads = [
+        statement for statement, _ in statements
+        if "transmissions_archive" in statement and not statement.lstrip().upper().startswith("INSERT")
+    ]
+    assert reads == []
+
+
+def test_live_retry_returns_original(client, auth_headers, patient_id):
+    original = post(client, auth_headers, patient_id, "IDEM-live").json()
+    # Without the cached record the retry is caught by the unique index
+    forget("transmission_id:IDEM-live")
+    replays = ingest_dedup.stats()["database_replays"]
+    retry = post(client, auth_headers, patient_id, "IDEM-live")
+    assert retry.status_code == 200
+    assert retry.json()["id"] == original["id"]
+    assert ingest_dedup.stats()["database_replays"] == replays + 1
+
+
+@pytest.mark.parametrize("key", [None, "idem-archived"])
+def test_archived_retry_returns_original(client, auth_headers, patient_id, key):
+    transmission_id = f"IDEM-archived-{key}"
+    db = SessionLocal()
+    try:
+        archived_id = db.execute(insert(TransmissionArchive).returning(TransmissionArchive.id), [{
+            "id": 20_000_000 + len(transmission_id), "transmission_id": transmission_id,
+            "patient_id": patient_id, "device_type": "icd", "transmission_type": "scheduled",
+            "arrhythmia_detected": False, "alert_level": "normal", "processed": True,
+            "idempotency_key": key, "created_at": datetime.now(timezone.utc) - timedelta(days=800),
+        }]).scalar_one()
+        db.commit()
+    finally:
+        db.close()
+
+    retry = post(client, auth_headers, patient_id, transmission_id, key=key)
+    assert retry.status_code == 200
+    assert retry.json()["id"] == archived_id
+
+
+def test_reused_key_conflicts(client, auth_headers, patient_id):
+    assert post(client, auth_headers, patient_id, "IDEM-first", key="idem-reused").status_code == 200
+    forget("key:idem-reused", "transmission_id:IDEM-first")
+    response = post(client, auth_headers, patient_id, "IDEM-second", key="idem-reused")
+    assert response.status_code == 409
+
+
+def test_bulk_rejects_idempotency_key(client, auth_headers, patient_id):
+    response = client.post(
+        "/api/transmissions/bulk", headers={**auth_headers, "Idempotency-Key": "idem-bulk"},
+        json=[{"transmission_id": "IDEM-bulk", "patient_id": patient_id, "device_type": "icd"}],
+    )
+    assert response.status_code == 400
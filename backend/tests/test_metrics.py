@@ -0,0 +1,46 @@
+import pytest
+
+from app.core.config import settings
+from app.core.security import get_password_hash
+from app.db.session import SessionLocal
+from app.models.user import User
+from app.services.processing import backlog_monitor
+
+
+@pytest.fixture(scope="module")
+def doctor_headers(client, patient_id):
+    db = SessionLocal()
+    try:
+        db.add(User(
+            username="metrics-doctor", email="metrics-doctor@example.com", full_name="Metrics Doctor",
+            role="doctor", hashed_password=get_password_hash("secret"),
+        ))
+        db.commit()
+    finally:
+        db.close()
+    response = client.post("/api/auth/login", json={"username": "metrics-doctor", "password": "secret"})
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+def test_metrics_require_an_admin_or_the_metrics_token(client, auth_headers, doctor_headers, monkeypatch):
+    assert client.get("/metrics").status_code in (401, 403)
+    assert client.get("/metrics", headers=doctor_headers).status_code == 403
+    assert client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"}).status_code == 401
+    assert client.get("/metrics", headers=auth_headers).status_code == 200
+
+    monkeypatch.setattr(settings, "METRICS_TOKEN", "scrape-secret")
+    response = client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+    assert response.status_code == 200
+    assert "unprocessed" in response.json()["processing"]
+
+
+def test_backlog_is_queried_once_per_interval(client, auth_headers, statements, monkeypatch):
+    monkeypatch.setattr(backlog_monitor, "_backlog", None)
+    for _ in range(5):
+        assert client.get("/metrics", headers=auth_headers).status_code == 200
+    backlog_queries = [statement for statement, _ in statements if "min(transmissions.created_at)" in statement]
+    assert len(backlog_queries) == 1
+
+    monkeypatch.setattr(backlog_monitor, "ttl", 0)
+    client.get("/metrics", headers=auth_headers)
+    assert sum("min(transmissions.created_at)" in statement for statement, _ in statements) == 2
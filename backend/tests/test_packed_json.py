@@ -0,0 +1,74 @@
+import orjson
+import pytest
+from sqlalchemy import LargeBinary, select, type_coerce, update
+
+from app.db.session import SessionLocal
+from app.db.types import MAX_INT, MIN_INT, is_packed, pack_json, unpack_json
+from app.models.transmission import Transmission
+from app.services.raw_data import convert_raw_data
+
+VALUES = [
+    {},
+    {"text": "ü ✓", "flag": True, "nothing": None, "nested": {"list": [1, 2.5, None, "x"]}},
+    {"ints": list(range(-5, 20)), "floats": [index / 7 for index in range(16)]},
+    # Mixed, boolean and short lists stay plain msgpack
+    {"mixed": [1, 2.0] * 8, "bools": [True, False] * 8, "short": [1, 2, 3]},
+    {"edges": [MIN_INT, MAX_INT, 0] * 4, "big": MAX_INT, "small": MIN_INT},
+    {"egm": {"sample_rate": 128, "samples": [[0.1, -0.2] * 64, [3] * 100]}},
+]
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_pack_json_round_trips(value):
+    packed = pack_json(value)
+    assert is_packed(packed)
+    assert unpack_json(packed) == value
+    assert unpack_json(memoryview(packed)) == value
+
+
+@pytest.mark.parametrize("value", VALUES)
+def test_legacy_json_text_still_reads(value):
+    assert unpack_json(orjson.dumps(value)) == value
+
+
+def stored_raw_data(db, row_id):
+    return db.scalar(select(type_coerce(Transmission.raw_data, LargeBinary)).where(Transmission.id == row_id))
+
+
+def test_json_rows_read_and_convert_in_place(client, auth_headers, patient_id):
+    raw_data = VALUES[2]
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": "PACK-legacy", "patient_id": patient_id, "device_type": "icd", "raw_data": raw_data,
+    })
+    assert response.status_code == 200
+    row_id = response.json()["id"]
+
+    db = SessionLocal()
+    try:
+        assert is_packed(stored_raw_data(db, row_id))
+        # Rewrite it the way rows were stored before packing
+        db.execute(update(Transmission).where(Transmission.id == row_id).values(
+            raw_data=type_coerce(orjson.dumps(raw_data), LargeBinary)
+        ))
+        db.commit()
+        assert client.get(f"/api/transmissions/{row_id}", headers=auth_headers).json()["raw_data"] == raw_data
+
+        assert convert_raw_data(db) >= 1
+        assert is_packed(stored_raw_data(db, row_id))
+        db.expire_all()
+        assert db.get(Transmission, row_id).raw_data == raw_data
+    finally:
+        db.close()
+
+
+@pytest.mark.parametrize("big", [MAX_INT + 1, MIN_INT - 1])
+def test_integers_beyond_64_bits_are_rejected(client, auth_headers, patient_id, big):
+    payload = {
+        "transmission_id": f"PACK-big-{big}", "patient_id": patient_id, "device_type": "icd",
+        "raw_data": {"counts": [1, 2, {"total": big}]},
+    }
+    assert client.post("/api/transmissions/", headers=auth_headers, json=payload).status_code == 422
+
+    response = client.post("/api/transmissions/bulk", headers=auth_headers, json=[payload])
+    assert response.status_code == 200
+    assert response.json()["results"][0]["status"] == "rejected"
@@ -0,0 +1,80 @@
+import pytest
+from sqlalchemy import insert, text
+
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.session import SessionLocal, engine
+from app.models.transmission import TransmissionArchive
+
+# Server-default timestamps are stored to the second on SQLite
+SAME_SECOND = "2026-01-01 10:00:00"
+
+
+@pytest.fixture(scope="module")
+def same_second(client, auth_headers):
+    """Live and archived transmissions of one patient, all created in the same second."""
+    patient = client.post("/api/patients/", headers=auth_headers, json={
+        "patient_id": "P-PAGES", "first_name": "Page", "last_name": "Turner",
+    })
+    assert patient.status_code == 200
+    patient_id = patient.json()["id"]
+    for index in range(4):
+        response = client.post("/api/transmissions/", headers=auth_headers, json={
+            "transmission_id": f"PAGE-{index}", "patient_id": patient_id, "device_type": "icd",
+        })
+        assert response.status_code == 200
+    db = SessionLocal()
+    try:
+        db.execute(insert(TransmissionArchive), [{
+            "id": 50_000_000 + index, "transmission_id": f"PAGE-A{index}", "patient_id": patient_id,
+            "device_type": "icd", "transmission_type": "scheduled", "arrhythmia_detected": False,
+            "alert_level": "normal", "processed": True,
+        } for index in range(3)])
+        db.commit()
+    finally:
+        db.close()
+    with engine.begin() as conn:
+        for table in ("transmissions", "transmissions_archive"):
+            conn.execute(text(f"UPDATE {table} SET created_at = :at WHERE patient_id = :patient"),
+                         {"at": SAME_SECOND, "patient": patient_id})
+    return patient_id
+
+
+def pages(client, auth_headers, url, before_next=None):
+    ids, cursor = [], None
+    while True:
+        response = client.get(url + (f"&cursor={cursor}" if cursor else ""), headers=auth_headers)
+        assert response.status_code == 200, response.text
+        ids.extend(item["id"] for item in response.json())
+        assert len(ids) <= 20, "cursor is not moving forward"
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if not cursor:
+            return ids
+        if before_next:
+            before_next(ids[-1])
+
+
+def test_pages_cover_both_tiers_once(client, auth_headers, same_second, statements):
+    url = f"/api/transmissions/?limit=2&patient_id={same_second}&include_archived=true"
+    ids = pages(client, auth_headers, url)
+    assert len(ids) == 7
+    assert ids == sorted(ids, reverse=True)
+    # Archived anchors resolve too, in one lookup per page rather than one per tier
+    lookups = [statement for statement, _ in statements if "UNION ALL" in statement and "LIMIT" not in statement]
+    assert len(lookups) == 3
+
+
+def test_deleted_anchor_skips_no_rows(client, auth_headers, same_second):
+    url = f"/api/transmissions/?limit=2&patient_id={same_second}"
+    before = pages(client, auth_headers, url)
+    deleted = []
+
+    def delete(anchor_id):
+        deleted.append(anchor_id)
+        with engine.begin() as conn:
+            conn.execute(text("DELETE FROM transmissions WHERE id = :id"), {"id": anchor_id})
+
+    # The cursor's own timestamp stands in for the anchor; rows of the same
+    # second may come round again, but none are lost
+    ids = pages(client, auth_headers, url, before_next=delete)
+    assert set(ids) == set(before)
+    assert deleted
@@ -0,0 +1,23 @@
+def test_overview_runs_a_fixed_number_of_queries(client, auth_headers, patient_id, statements):
+    for index in range(30):
+        response = client.post("/api/transmissions/", headers=auth_headers, json={
+            "transmission_id": f"OV-{index}",
+            "patient_id": patient_id,
+            "device_type": "icd",
+            "device_serial": f"DEV-{index % 3}",
+            "heart_rate_avg": 60 + index,
+        })
+        assert response.status_code == 200
+
+    url = f"/api/patients/{patient_id}/overview"
+    # Warm the caches that sit in front of the endpoint (e.g. the current user)
+    assert client.get(url, headers=auth_headers).status_code == 200
+
+    statements.clear()
+    response = client.get(url, headers=auth_headers)
+
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["recent_transmissions"]) == 10
+    assert [device["device_serial"] for device in body["devices"]] == ["DEV-0", "DEV-1", "DEV-2"]
+    assert len(statements) == 2, statements
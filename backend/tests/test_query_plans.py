@@ -0,0 +1,151 @@
+import re
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import insert
+
+from app.api.transmissions import transmissions_query
+from app.core.pagination import NEXT_CURSOR_HEADER
+from app.db.session import SessionLocal, engine
+from app.models.clinic import Clinic
+from app.models.patient import Patient
+from app.models.transmission import Transmission, TransmissionArchive
+
+SEED_PATIENTS = 400
+SEED_TRANSMISSIONS = 20000
+SEED_ARCHIVED = 5000
+
+# Tables that grow with the data; a plain SCAN of any of them is a full scan
+LARGE_TABLES = {"patients", "transmissions", "transmissions_archive"}
+
+_SCAN = re.compile(r"^SCAN (\w+)")
+
+
+def query_plan(statement: str, parameters=()) -> str:
+    with engine.connect() as conn:
+        rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return "\n".join(row.detail for row in rows)
+
+
+def full_scans(statement: str, plan: str):
+    """Plan lines reading a large table row by row instead of through an index.
+
+    A primary-key page (rowid order, no sort, stopped by a LIMIT) reads only
+    the rows it returns, so it is not counted.
+    """
+    paged = " LIMIT " in statement and "TEMP B-TREE" not in plan
+    scans = []
+    for line in plan.splitlines():
+        match = _SCAN.match(line.strip())
+        if not match or match.group(1) not in LARGE_TABLES or "USING" in line:
+            continue
+        if paged and f"ORDER BY {match.group(1)}.id" in statement:
+            continue
+        scans.append(line.strip())
+    return scans
+
+
+@pytest.fixture(scope="module")
+def seeded(client, patient_id):
+    """Clinics, patients and live and archived transmissions at a size where plans matter."""
+    db = SessionLocal()
+    try:
+        clinic_ids = []
+        for index in range(3):
+            clinic = Clinic(name=f"Plan Clinic {index}")
+            db.add(clinic)
+            db.flush()
+            clinic_ids.append(clinic.id)
+        first_patient = db.execute(insert(Patient).returning(Patient.id), [
+            {
+                "patient_id": f"PLAN-{index:05d}", "first_name": f"Plan{index}", "last_name": "Smith",
+                "clinic_id": clinic_ids[index % 3], "is_active": True,
+            }
+            for index in range(SEED_PATIENTS)
+        ]).scalars().first()
+        patient_ids = list(range(first_patient, first_patient + SEED_PATIENTS))
+
+        start = datetime.now(timezone.utc) - timedelta(days=800)
+        levels = ["normal"] * 8 + ["warning", "critical"]
+
+        def row(index):
+            return {
+                "transmission_id": f"PLAN-T{index:06d}", "patient_id": patient_ids[index % SEED_PATIENTS],
+                "device_type": "icd", "device_serial": f"PLAN-D{index % SEED_PATIENTS:05d}",
+                "heart_rate_avg": 60 + index % 40, "battery_level": 90 - index % 50,
+                "alert_level": levels[index % len(levels)], "processed": True,
+                "created_at": start + timedelta(minutes=index * 30),
+            }
+
+        db.execute(insert(TransmissionArchive), [
+            {**row(index), "id": 10_000_000 + index} for index in range(SEED_ARCHIVED)
+        ])
+        db.execute(insert(Transmission), [row(index) for index in range(SEED_ARCHIVED, SEED_TRANSMISSIONS)])
+        db.commit()
+    finally:
+        db.close()
+    with engine.begin() as conn:
+        conn.exec_driver_sql("ANALYZE")
+    return patient_ids, clinic_ids
+
+
+def api_reads(patient_id: int, clinic_id: int):
+    base = "/api/transmissions"
+    return [
+        f"{base}/?limit=50",
+        f"{base}/?limit=50&patient_id={patient_id}",
+        f"{base}/?limit=50&alert_level=critical",
+        f"{base}/?limit=50&include_archived=true",
+        f"{base}/?limit=50&patient_id={patient_id}&include_archived=true",
+        f"{base}/stats/dashboard",
+        f"{base}/export?format=ndjson&patient_id={patient_id}",
+        f"{base}/export?format=csv&clinic_id={clinic_id}&start=2025-01-01T00:00:00",
+        f"{base}/export?format=ndjson&alert_level=critical",
+        "/api/patients/?limit=50",
+        f"/api/patients/?limit=50&clinic_id={clinic_id}",
+        "/api/patients/search?q=smith",
+        "/api/patients/search?q=plan12",
+        f"/api/patients/{patient_id}",
+        f"/api/patients/{patient_id}/overview",
+        "/api/clinics/",
+    ]
+
+
+def test_api_reads_use_indexes(client, auth_headers, seeded, statements):
+    patient_ids, clinic_ids = seeded
+    urls = api_reads(patient_ids[7], clinic_ids[1])
+    for url in urls:
+        response = client.get(url, headers=auth_headers)
+        assert response.status_code == 200, (url, response.text)
+        # Follow one page of any keyset cursor as well
+        cursor = response.headers.get(NEXT_CURSOR_HEADER)
+        if cursor:
+            separator = "&" if "?" in url else "?"
+            assert client.get(f"{url}{separator}cursor={cursor}", headers=auth_headers).status_code == 200
+
+    reads = [
+        (statement, parameters) for statement, parameters in statements
+        if statement.lstrip().upper().startswith(("SELECT", "WITH"))
+    ]
+    assert len(reads) >= len(urls)
+    failures = []
+    for statement, parameters in reads:
+        plan = query_plan(statement, parameters)
+        if full_scans(statement, plan):
+            failures.append(f"{statement}\n{plan}")
+    assert not failures, "\n\n".join(failures)
+
+
+@pytest.mark.parametrize("filters, index", [
+    ({}, "ix_transmissions_created_at_id"),
+    ({"after": (datetime(2026, 1, 1), 500)}, "ix_transmissions_created_at_id"),
+    ({"patient_id": 1}, "ix_transmissions_patient_created_at"),
+    ({"patient_id": 1, "after": (datetime(2026, 1, 1), 500)}, "ix_transmissions_patient_created_at"),
+    ({"alert_level": "high"}, "ix_transmissions_alert_level_created_at"),
+])
+def test_transmission_listing_uses_its_index(seeded, filters, index):
+    sql = transmissions_query(limit=50, **filters).compile(engine, compile_kwargs={"literal_binds": True})
+    plan = query_plan(str(sql))
+    assert index in plan, plan
+    # The index already yields rows in listing order
+    assert "TEMP B-TREE" not in plan, plan
@@ -0,0 +1,42 @@
+import json
+from typing import List
+
+from fastapi import Response
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.serialization import rows_response, schema_columns
+from app.db.session import SessionLocal
+from app.models.transmission import Transmission as TransmissionModel
+from app.schemas.transmission import Transmission
+
+
+def test_rows_response_matches_pydantic_serialization(client, auth_headers, patient_id):
+    payloads = [
+        {
+            "transmission_id": "SER-full", "patient_id": patient_id, "device_type": "icd",
+            "device_serial": "SER-1", "transmission_type": "scheduled",
+            "heart_rate_avg": 72.5, "heart_rate_min": 48, "heart_rate_max": 131.25,
+            "battery_level": 87.3, "impedance": 512.0, "arrhythmia_detected": True,
+            "alert_level": "high", "notes": "unicode: ü ✓",
+            "raw_data": {"nested": {"list": [1, 2.5, None, "x"]}, "flag": False},
+        },
+        {"transmission_id": "SER-sparse", "patient_id": patient_id, "device_type": "pacemaker"},
+    ]
+    for payload in payloads:
+        assert client.post("/api/transmissions/", headers=auth_headers, json=payload).status_code == 200
+
+    db = SessionLocal()
+    try:
+        ids = TransmissionModel.transmission_id.in_([payload["transmission_id"] for payload in payloads])
+        order = (TransmissionModel.id,)
+        rows = db.execute(select(*schema_columns(TransmissionModel, Transmission)).where(ids).order_by(*order)).all()
+        models = db.scalars(select(TransmissionModel).where(ids).order_by(*order)).all()
+        adapter = TypeAdapter(List[Transmission])
+        expected = adapter.dump_json(adapter.validate_python(models, from_attributes=True))
+    finally:
+        db.close()
+
+    body = rows_response(rows, Response()).body
+    assert len(rows) == len(payloads)
+    assert json.loads(body) == json.loads(expected)
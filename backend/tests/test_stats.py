@@ -0,0 +1,86 @@
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert, select
+
+from app.db.session import SessionLocal
+from app.models.clinic import Clinic
+from app.models.stats import TransmissionDailyStat
+from app.models.transmission import TransmissionArchive
+from app.services import stats as stats_service
+
+
+def clinic_rollups(clinic_ids):
+    db = SessionLocal()
+    try:
+        return sorted(
+            (row.clinic_id, row.day, row.alert_level, row.device_type, row.transmission_count)
+            for row in db.scalars(
+                select(TransmissionDailyStat).where(
+                    TransmissionDailyStat.clinic_id.in_(clinic_ids), TransmissionDailyStat.transmission_count != 0
+                )
+            )
+        )
+    finally:
+        db.close()
+
+
+def test_clinic_change_moves_the_patients_rollups(client, auth_headers):
+    db = SessionLocal()
+    try:
+        clinics = [Clinic(name="Stats Clinic A"), Clinic(name="Stats Clinic B")]
+        db.add_all(clinics)
+        db.commit()
+        clinic_a, clinic_b = (clinic.id for clinic in clinics)
+    finally:
+        db.close()
+    moving = client.post("/api/patients/", headers=auth_headers, json={
+        "patient_id": "P-STATS-1", "first_name": "Mo", "last_name": "Ving", "clinic_id": clinic_a,
+    }).json()["id"]
+    staying = client.post("/api/patients/", headers=auth_headers, json={
+        "patient_id": "P-STATS-2", "first_name": "Stay", "last_name": "Put", "clinic_id": clinic_a,
+    }).json()["id"]
+    for index, patient_id in enumerate([moving, moving, moving, staying]):
+        response = client.post("/api/transmissions/", headers=auth_headers, json={
+            "transmission_id": f"STATS-{index}", "patient_id": patient_id,
+            "device_type": "pacemaker" if index else "icd", "heart_rate_avg": 130 if index == 2 else 70,
+        })
+        assert response.status_code == 200
+    # Archived history counts as well
+    db = SessionLocal()
+    try:
+        archived_at = datetime.now(timezone.utc) - timedelta(days=400)
+        db.execute(insert(TransmissionArchive).values(
+            id=40_000_000, transmission_id="STATS-archived", patient_id=moving, device_type="icd",
+            alert_level="normal", processed=True, created_at=archived_at,
+        ))
+        stats_service.record_transmissions(db, [stats_service.StatsFields(moving, archived_at, "normal", "icd", None)])
+        db.commit()
+    finally:
+        db.close()
+
+    response = client.put(f"/api/patients/{moving}", headers=auth_headers, json={"clinic_id": clinic_b})
+    assert response.status_code == 200
+    moved = clinic_rollups([clinic_a, clinic_b])
+    assert sum(count for clinic_id, *_, count in moved if clinic_id == clinic_b) == 4
+    assert sum(count for clinic_id, *_, count in moved if clinic_id == clinic_a) == 1
+
+    db = SessionLocal()
+    try:
+        stats_service.rebuild_stats(db)
+    finally:
+        db.close()
+    assert moved == clinic_rollups([clinic_a, clinic_b])
+
+
+def test_removing_from_a_missing_bucket_is_logged(caplog):
+    db = SessionLocal()
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.services.stats"):
+            stats_service.record_transmissions(db, [
+                stats_service.StatsFields(1, datetime(2001, 1, 1), "normal", "no-such-device", None)
+            ], delta=-1)
+        db.rollback()
+    finally:
+        db.close()
+    assert any("rebuild_stats.py" in record.getMessage() for record in caplog.records)
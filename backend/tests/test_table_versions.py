@@ -0,0 +1,29 @@
+from app.db.session import SessionLocal
+from app.db.versions import versions_query
+from app.services.processing import TransmissionWorker
+
+
+def transmissions_version() -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(versions_query("transmissions")) or 0
+    finally:
+        db.close()
+
+
+def test_idle_worker_poll_leaves_the_version_unchanged(client, auth_headers, patient_id):
+    worker = TransmissionWorker()
+    worker.drain()
+    version = transmissions_version()
+    for _ in range(3):
+        assert worker.run_once() == 0
+    assert transmissions_version() == version
+
+    response = client.post("/api/transmissions/", headers=auth_headers, json={
+        "transmission_id": "VER-1", "patient_id": patient_id, "device_type": "icd",
+    })
+    assert response.status_code == 200
+    created = transmissions_version()
+    assert created > version
+    assert worker.run_once() == 1
+    assert transmissions_version() > created
@@ -0,0 +1,60 @@
+import multiprocessing
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.vitals_store import VITAL_FIELDS, VitalsStore
+
+
+def transmission(device_serial, created_at, **vitals):
+    return SimpleNamespace(
+        device_serial=device_serial, created_at=created_at,
+        **{field: vitals.get(field) for field in VITAL_FIELDS},
+    )
+
+
+@pytest.mark.parametrize("device_serial", [".", "..", "...", "../escape", "a/../../b", "%2E%2E"])
+def test_device_serials_stay_inside_the_store(tmp_path, device_serial):
+    root = tmp_path / "vitals"
+    store = VitalsStore(str(root))
+    created_at = datetime(2026, 3, 1, tzinfo=timezone.utc)
+    store.append([transmission(device_serial, created_at, heart_rate_avg=70.0)])
+
+    written = [path for path in tmp_path.rglob("*.vitals")]
+    assert len(written) == 1
+    assert written[0].resolve().is_relative_to(root.resolve())
+    records = store.read(device_serial, created_at, created_at)
+    assert records["heart_rate_avg"].tolist() == [70.0]
+
+
+def _append_many(root, offset, count):
+    store = VitalsStore(root)
+    base = datetime(2026, 3, 1, tzinfo=timezone.utc).timestamp()
+    for index in range(count):
+        created_at = datetime.fromtimestamp(base + offset + index, tz=timezone.utc)
+        store.append([transmission("DEV", created_at, heart_rate_avg=float(index))])
+
+
+def test_replace_does_not_lose_concurrent_appends(tmp_path):
+    root = str(tmp_path / "vitals")
+    store = VitalsStore(root)
+    edited = transmission("DEV", datetime(2026, 3, 15, tzinfo=timezone.utc), heart_rate_avg=0.0)
+    store.append([edited])
+
+    context = multiprocessing.get_context("fork")
+    writers = [context.Process(target=_append_many, args=(root, offset, 300)) for offset in (0, 1000)]
+    for writer in writers:
+        writer.start()
+    for value in range(1, 101):
+        old = store.record(edited)
+        edited.heart_rate_avg = float(value)
+        store.replace(old, edited)
+    for writer in writers:
+        writer.join()
+        assert writer.exitcode == 0
+
+    records = store.read("DEV", datetime(2026, 3, 1, tzinfo=timezone.utc), datetime(2026, 3, 31, tzinfo=timezone.utc))
+    assert len(records) == 601
+    assert records["heart_rate_avg"][records["ts"] == int(edited.created_at.timestamp())].tolist() == [100.0]
+    assert not list(tmp_path.rglob("*.tmp"))